@@ -0,0 +1,105 @@
+"""
+Micro-benchmark of the signal parsers over the recorded message corpus.
+
+    python -m benchmarks.bench_parsing [--repeat 2000]
+
+The legacy parsers below are the per-call `re.search` implementations the single-pass engine replaced,
+kept here only as a baseline. The dispatch rows compare the bot's old per-message decision, which ran
+every `$` message through the parsers, with the channel router and its keyword pre-filter.
+"""
+import argparse
+import json
+import re
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from core_parsing.router import SignalRouter
+from core_parsing.signal_parser import parse_future_signal, parse_spot_signal
+
+CORPUS_PATH = Path(__file__).parent / 'corpus' / 'signals.jsonl'
+
+
+def load_corpus(path: Path = CORPUS_PATH) -> list[dict]:
+    with path.open() as corpus:
+        return [json.loads(line) for line in corpus if line.strip()]
+
+
+def legacy_parse_future(message: str):
+    try:
+        symbol_match = re.search(r'\$(\w+)', message)
+        side_match = re.search(r'(LONG|SHORT)', message)
+        entry_matches = re.findall(r'Entry\s\d\s=\s\$([\d.]+)', message)
+        stoploss_match = re.search(r'Stoploss:\s4H\sClose\s(Above|Below)\s\$([\d.]+)', message)
+        target_match = re.search(r'Target:\s\$([\d.]+)', message)
+        close_order_match = re.search(r'Close\sOrder', message)
+        change_stoploss_match = re.search(r'Change\sStoploss\s=\s\$([\d.]+)', message)
+        if close_order_match:
+            return 'CLOSE_ORDER'
+        if change_stoploss_match:
+            return 'CHANGE_STOPLOSS', float(change_stoploss_match.group(1))
+        if not (symbol_match and side_match and entry_matches and stoploss_match and target_match):
+            raise ValueError("Message format is incorrect or missing information")
+        return ('TRADE_SIGNAL', symbol_match.group(1).upper() + 'USDT', side_match.group(1),
+                [float(price) for price in entry_matches], float(stoploss_match.group(2)),
+                float(target_match.group(1)))
+    except Exception as e:
+        return ValueError(f"Error parsing future message: {e}")
+
+
+def legacy_parse_spot(message: str):
+    match = re.search(r'\$(\w+)', message)
+    entries = re.findall(r'Entry \d+ = \$([\d.]+)', message)
+    stop_loss_match = re.search(r'Stoploss:.*Below \$([\d.]+)', message)
+    final_target_match = re.search(r'Final Target: \$([\d.]+)', message)
+    return {
+        'symbol': match.group(1) + 'USDT' if match else None,
+        'entries': [float(entry) for entry in entries],
+        'stop_loss_price': float(stop_loss_match.group(1)) if stop_loss_match else None,
+        'final_target_price': float(final_target_match.group(1)) if final_target_match else None,
+    }
+
+
+def legacy_dispatch(message: str):
+    if not message.startswith('$'):
+        return None
+    signal = parse_future_signal(message)
+    if signal is None and not ('LONG' in message or 'SHORT' in message):
+        signal = parse_spot_signal(message)
+    return signal
+
+
+def bench(name: str, parse: Callable[[str], object], messages: list[str], repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for message in messages:
+            parse(message)
+    elapsed = time.perf_counter() - started
+    per_message_us = elapsed / (repeat * len(messages)) * 1e6
+    print(f"{name:<16} {per_message_us:8.2f} us/message  {repeat * len(messages) / elapsed:12,.0f} messages/s")
+    return per_message_us
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=2000, help='passes over the corpus')
+    args = parser.parse_args()
+
+    messages = [record['content'] for record in load_corpus()]
+    print(f"{len(messages)} messages x {args.repeat} passes")
+    legacy_future = bench('legacy futures', legacy_parse_future, messages, args.repeat)
+    engine_future = bench('engine futures', parse_future_signal, messages, args.repeat)
+    legacy_spot = bench('legacy spot', legacy_parse_spot, messages, args.repeat)
+    engine_spot = bench('engine spot', parse_spot_signal, messages, args.repeat)
+    print(f"speedup: futures x{legacy_future / engine_future:.2f}, spot x{legacy_spot / engine_spot:.2f}")
+
+    router = SignalRouter()
+    chatter = [record['content'] for record in load_corpus() if record['kind'] == 'chatter']
+    for label, sample in (('all', messages), ('chatter', chatter)):
+        legacy = bench(f'legacy {label}', legacy_dispatch, sample, args.repeat)
+        routed = bench(f'router {label}', lambda message: router.route(0, message), sample, args.repeat)
+        print(f"dispatch speedup on {label} messages: x{legacy / routed:.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+"""
+Micro-benchmark of the CPU cost of sizing and formatting one order.
+
+    python -m benchmarks.bench_sizing [--repeat 20000]
+
+The legacy functions below are the per-call implementations the per-symbol Quantiser replaced, kept
+here only as a baseline: the futures path rebuilt a quantize string from the step size's digits on
+every call, and both clients re-derived each increment's exponent for every price and quantity.
+"""
+import argparse
+import time
+from collections.abc import Callable
+from decimal import ROUND_CEILING, ROUND_DOWN, ROUND_FLOOR, ROUND_HALF_UP, Decimal
+
+from core_exchange.quantiser import to_decimal
+from core_exchange.symbol_registry import SymbolFilters
+from core_future.future import RISK_PERCENTAGE
+from core_spot.ladder import size_leg
+from variables.constants import TradingConstants
+
+FUTURES_SYMBOL = {
+    'symbol': 'BTCUSDT',
+    'filters': [
+        {'filterType': 'PRICE_FILTER', 'minPrice': '556.80', 'maxPrice': '4529764', 'tickSize': '0.10'},
+        {'filterType': 'LOT_SIZE', 'minQty': '0.001', 'maxQty': '1000', 'stepSize': '0.001'},
+        {'filterType': 'MARKET_LOT_SIZE', 'minQty': '0.001', 'maxQty': '120', 'stepSize': '0.001'},
+        {'filterType': 'MIN_NOTIONAL', 'notional': '100'},
+    ],
+}
+
+SPOT_SYMBOL = {
+    'symbol': 'OAXUSDT',
+    'filters': [
+        {'filterType': 'PRICE_FILTER', 'minPrice': '0.00010000', 'maxPrice': '1000.00000000',
+         'tickSize': '0.00010000'},
+        {'filterType': 'LOT_SIZE', 'minQty': '0.10000000', 'maxQty': '92141578.00000000', 'stepSize': '0.10000000'},
+        {'filterType': 'NOTIONAL', 'minNotional': '5.00000000', 'maxNotional': '9000000.00000000'},
+    ],
+}
+
+
+def legacy_futures_order(filters: SymbolFilters, balance: float, entry: float, stop: float, target: float) -> tuple:
+    step_size = filters.step_size
+    max_precision = len(step_size.as_tuple()[1])
+    quantity = Decimal((balance * TradingConstants.RISK_PERCENTAGE.value * TradingConstants.LEVERAGE.value)
+                       / entry).quantize(Decimal('.' + '0' * max_precision), rounding=ROUND_DOWN)
+    quantity = (max(filters.min_qty, quantity) // step_size) * step_size
+    quantity = (Decimal(str(float(quantity))) // step_size) * step_size
+    stop_price = (Decimal(str(stop)) // filters.tick_size) * filters.tick_size
+    target_price = (Decimal(str(target)) // filters.tick_size) * filters.tick_size
+    return format(quantity.normalize(), 'f'), str(stop_price), str(target_price)
+
+
+def futures_order(filters: SymbolFilters, balance: float, entry: float, stop: float, target: float) -> tuple:
+    quantiser = filters.quantiser
+    quantity = quantiser.round_quantity(
+        to_decimal(balance) * RISK_PERCENTAGE * TradingConstants.LEVERAGE.value / to_decimal(entry))
+    quantity = quantiser.round_quantity(max(filters.min_qty, quantity))
+    return (quantiser.format_quantity(quantity), quantiser.format_price(quantiser.round_price(stop, ROUND_FLOOR)),
+            quantiser.format_price(quantiser.round_price(target, ROUND_FLOOR)))
+
+
+def legacy_to_step(value: Decimal, step: Decimal, rounding: str = ROUND_FLOOR) -> Decimal:
+    if not step:
+        return value
+    return (value / step).to_integral_value(rounding) * step
+
+
+def legacy_spot_leg(filters: SymbolFilters, budget: Decimal, price: float) -> tuple:
+    price = legacy_to_step(Decimal(str(price)), filters.tick_size, ROUND_HALF_UP)
+    quantity = legacy_to_step(budget / price, filters.step_size)
+    if quantity * price < filters.min_notional:
+        quantity = legacy_to_step(filters.min_notional / price, filters.step_size, ROUND_CEILING)
+    elif filters.max_notional is not None and quantity * price > filters.max_notional:
+        quantity = legacy_to_step(filters.max_notional / price, filters.step_size)
+    return format(quantity.normalize(), 'f'), format(price.normalize(), 'f')
+
+
+def spot_leg(filters: SymbolFilters, budget: Decimal, price: float) -> tuple:
+    leg = size_leg(filters, budget, to_decimal(price))
+    return filters.quantiser.format_quantity(leg.quantity), filters.quantiser.format_price(leg.price)
+
+
+def bench(name: str, order: Callable[[], tuple], repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        order()
+    per_order_us = (time.perf_counter() - started) / repeat * 1e6
+    print(f"{name:<16} {per_order_us:8.2f} us/order")
+    return per_order_us
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=20000, help='orders sized per implementation')
+    args = parser.parse_args()
+
+    futures = SymbolFilters.from_symbol_info(FUTURES_SYMBOL)
+    spot = SymbolFilters.from_symbol_info(SPOT_SYMBOL)
+    budget = Decimal('500')
+    futures_args = (futures, 10000.0, 64250.5, 62900.07, 67500.03)
+    print(f"{args.repeat} orders per implementation")
+    legacy_future = bench('legacy futures', lambda: legacy_futures_order(*futures_args), args.repeat)
+    quantised_future = bench('quantiser futures', lambda: futures_order(*futures_args), args.repeat)
+    legacy_spot = bench('legacy spot', lambda: legacy_spot_leg(spot, budget, 0.30017), args.repeat)
+    quantised_spot = bench('quantiser spot', lambda: spot_leg(spot, budget, 0.30017), args.repeat)
+    print(f"speedup: futures x{legacy_future / quantised_future:.2f}, spot x{legacy_spot / quantised_spot:.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,226 @@
+"""
+In-process stand-in for the Binance spot and USD-M futures REST APIs used by the bot.
+
+It implements just enough of each endpoint for the order paths to run, with configurable
+latency and error injection, and records every request so a replay can count REST calls
+and time order acknowledgements.
+"""
+import asyncio
+import itertools
+import json
+import random
+import time
+from collections import Counter, defaultdict
+from typing import Any
+from urllib.parse import unquote
+
+from aiohttp import web
+
+# Endpoints whose acknowledgement counts as "order placed" for latency reporting.
+ORDER_ENDPOINTS = frozenset({('POST', 'order'), ('POST', 'batchOrders')})
+
+
+def _symbol_info(symbol: str, futures: bool) -> dict[str, Any]:
+    notional = {'filterType': 'MIN_NOTIONAL', 'notional': '5'} if futures else \
+        {'filterType': 'NOTIONAL', 'minNotional': '5', 'maxNotional': '9000000'}
+    return {
+        'symbol': symbol,
+        'status': 'TRADING',
+        'pricePrecision': 8,
+        'quantityPrecision': 3,
+        'filters': [
+            {'filterType': 'PRICE_FILTER', 'tickSize': '0.00000001', 'minPrice': '0.00000001', 'maxPrice': '1000000'},
+            {'filterType': 'LOT_SIZE', 'stepSize': '0.001', 'minQty': '0.001', 'maxQty': '90000000000'},
+            {'filterType': 'MARKET_LOT_SIZE', 'stepSize': '0.001', 'minQty': '0.001', 'maxQty': '90000000000'},
+            notional,
+        ],
+    }
+
+
+class MockExchange:
+    """
+    Serves /api/v3/* (spot) and /fapi/v*/* (futures) on a local port.
+
+    Every request waits `latency_ms` plus up to `jitter_ms`, and a `error_rate` share of them
+    fails with a Binance-style 503 error. Open orders and futures positions are tracked so
+    cancel, close and stop-loss paths see realistic state.
+    """
+
+    def __init__(self, symbols: list[str], latency_ms: float = 0.0, jitter_ms: float = 0.0,
+                 error_rate: float = 0.0, balance: float = 10000.0, seed: int = 0):
+        self.symbols = sorted(set(symbols))
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.balance = balance
+        self.calls: Counter[tuple[str, str, str]] = Counter()
+        self.errors = 0
+        # Client ports seen, i.e. the TCP connections opened against the exchange.
+        self.connections: set[tuple[str, int]] = set()
+        self.order_acks: dict[str, list[float]] = defaultdict(list)
+        self.open_orders: dict[tuple[str, str], dict[int, dict[str, Any]]] = defaultdict(dict)
+        self.positions: dict[str, float] = defaultdict(float)
+        self._order_ids = itertools.count(1)
+        self._random = random.Random(seed)
+        self._runner: web.AppRunner | None = None
+        self.url = ''
+
+    @property
+    def total_calls(self) -> int:
+        return sum(self.calls.values())
+
+    def reset_counters(self) -> None:
+        self.calls.clear()
+        self.errors = 0
+        self.order_acks.clear()
+
+    async def start(self, host: str = '127.0.0.1', port: int = 0) -> str:
+        app = web.Application()
+        app.router.add_route('*', '/{path:.*}', self.handle)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        port = self._runner.addresses[0][1]
+        self.url = f'http://{host}:{port}'
+        return self.url
+
+    async def stop(self) -> None:
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def handle(self, request: web.Request) -> web.Response:
+        path = request.path
+        market = 'futures' if path.startswith('/fapi/') else 'spot'
+        endpoint = path.split('/', 3)[-1]
+        params = dict(request.query)
+        if request.can_read_body:
+            params.update(await request.post())
+        self.calls[(market, request.method, endpoint)] += 1
+        self.connections.add(request.transport.get_extra_info('peername'))
+
+        delay = self.latency_ms + self._random.uniform(0, self.jitter_ms)
+        if delay:
+            await asyncio.sleep(delay / 1000)
+        if self.error_rate and self._random.random() < self.error_rate:
+            self.errors += 1
+            return self._error(503, -1001, 'Internal error; unable to process your request. Please try again.')
+
+        handler = getattr(self, f'_{market}_{request.method.lower()}_{endpoint.replace("/", "_")}', None)
+        if handler is None:
+            return self._error(404, -1000, f'Mock exchange does not implement {request.method} {path}')
+        response = handler(params)
+        if isinstance(response, web.Response):
+            return response
+        if (request.method, endpoint) in ORDER_ENDPOINTS:
+            self.order_acks[self._order_symbol(endpoint, params)].append(time.perf_counter())
+        return web.json_response(response)
+
+    @staticmethod
+    def _error(status: int, code: int, message: str) -> web.Response:
+        return web.json_response({'code': code, 'msg': message}, status=status)
+
+    @staticmethod
+    def _batch(params: dict[str, Any]) -> list[dict[str, Any]]:
+        raw = params['batchOrders']
+        # python-binance url-encodes batchOrders before the request encodes it again.
+        return json.loads(unquote(raw) if raw.startswith('%') else raw)
+
+    def _order_symbol(self, endpoint: str, params: dict[str, Any]) -> str:
+        return self._batch(params)[0]['symbol'] if endpoint == 'batchOrders' else params['symbol']
+
+    def _new_order(self, market: str, params: dict[str, Any]) -> dict[str, Any]:
+        order_id = next(self._order_ids)
+        symbol = params['symbol']
+        quantity = float(params.get('quantity', 0))
+        order = {
+            'symbol': symbol, 'orderId': order_id, 'clientOrderId': params.get('newClientOrderId', f'mock{order_id}'),
+            'side': params['side'], 'type': params['type'], 'origQty': str(quantity),
+            'price': str(params.get('price', '0')), 'stopPrice': str(params.get('stopPrice', '0')),
+            'status': 'NEW', 'updateTime': int(time.time() * 1000),
+        }
+        if params['type'] == 'MARKET':
+            order['status'] = 'FILLED'
+            if market == 'futures':
+                self.positions[symbol] += quantity if params['side'] == 'BUY' else -quantity
+        else:
+            self.open_orders[(market, symbol)][order_id] = order
+        return order
+
+    def _cancel(self, market: str, symbol: str, order_id: int) -> dict[str, Any]:
+        order = self.open_orders[(market, symbol)].pop(order_id, None)
+        if order is None:
+            return {'code': -2011, 'msg': 'Unknown order sent.'}
+        return {**order, 'status': 'CANCELED'}
+
+    # Spot
+
+    def _spot_get_ping(self, params: dict[str, Any]) -> dict[str, Any]:
+        return {}
+
+    def _spot_get_exchangeInfo(self, params: dict[str, Any]) -> dict[str, Any]:
+        return {'symbols': [_symbol_info(symbol, futures=False) for symbol in self.symbols]}
+
+    def _spot_get_account(self, params: dict[str, Any]) -> dict[str, Any]:
+        return {'balances': [{'asset': 'USDT', 'free': str(self.balance), 'locked': '0'}]}
+
+    def _spot_post_order(self, params: dict[str, Any]) -> dict[str, Any]:
+        return self._new_order('spot', params)
+
+    def _spot_get_openOrders(self, params: dict[str, Any]) -> list[dict[str, Any]]:
+        return list(self.open_orders[('spot', params['symbol'])].values())
+
+    def _spot_delete_openOrders(self, params: dict[str, Any]) -> list[dict[str, Any]] | web.Response:
+        orders = self.open_orders.pop(('spot', params['symbol']), {})
+        if not orders:
+            return self._error(400, -2011, 'Unknown order sent.')
+        return [{**order, 'status': 'CANCELED'} for order in orders.values()]
+
+    def _spot_delete_order(self, params: dict[str, Any]) -> dict[str, Any] | web.Response:
+        response = self._cancel('spot', params['symbol'], int(params['orderId']))
+        return self._error(400, -2011, response['msg']) if 'code' in response else response
+
+    # Futures
+
+    def _futures_get_ping(self, params: dict[str, Any]) -> dict[str, Any]:
+        return {}
+
+    def _futures_get_exchangeInfo(self, params: dict[str, Any]) -> dict[str, Any]:
+        return {'symbols': [_symbol_info(symbol, futures=True) for symbol in self.symbols]}
+
+    def _futures_get_balance(self, params: dict[str, Any]) -> list[dict[str, Any]]:
+        return [{'asset': 'USDT', 'balance': str(self.balance), 'availableBalance': str(self.balance)}]
+
+    def _futures_get_account(self, params: dict[str, Any]) -> dict[str, Any]:
+        return {
+            'availableBalance': str(self.balance),
+            'assets': [{'asset': 'USDT', 'walletBalance': str(self.balance), 'availableBalance': str(self.balance)}],
+            'positions': [{'symbol': symbol, 'positionAmt': str(amount), 'entryPrice': '0', 'positionSide': 'BOTH'}
+                          for symbol, amount in self.positions.items()],
+        }
+
+    def _futures_get_positionRisk(self, params: dict[str, Any]) -> list[dict[str, Any]]:
+        symbol = params.get('symbol')
+        return [{'symbol': position_symbol, 'positionAmt': str(amount), 'entryPrice': '0', 'positionSide': 'BOTH'}
+                for position_symbol, amount in self.positions.items() if symbol in (None, position_symbol)]
+
+    def _futures_post_leverage(self, params: dict[str, Any]) -> dict[str, Any]:
+        return {'symbol': params['symbol'], 'leverage': int(params['leverage'])}
+
+    def _futures_post_order(self, params: dict[str, Any]) -> dict[str, Any]:
+        return self._new_order('futures', params)
+
+    def _futures_post_batchOrders(self, params: dict[str, Any]) -> list[dict[str, Any]]:
+        return [self._new_order('futures', order) for order in self._batch(params)]
+
+    def _futures_get_openOrders(self, params: dict[str, Any]) -> list[dict[str, Any]]:
+        return list(self.open_orders[('futures', params['symbol'])].values())
+
+    def _futures_delete_order(self, params: dict[str, Any]) -> dict[str, Any] | web.Response:
+        response = self._cancel('futures', params['symbol'], int(params['orderId']))
+        return self._error(400, -2011, response['msg']) if 'code' in response else response
+
+    def _futures_delete_batchOrders(self, params: dict[str, Any]) -> list[dict[str, Any]]:
+        order_ids = json.loads(params['orderIdList'])
+        return [self._cancel('futures', params['symbol'], order_id) for order_id in order_ids]
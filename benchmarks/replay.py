@@ -0,0 +1,254 @@
+"""
+Replay the recorded Discord corpus through MyBot against a local mock exchange.
+
+    python -m benchmarks.replay [--repeat 5] [--latency-ms 20] [--jitter-ms 10] [--error-rate 0.01] [--accounts 3]
+
+Every message goes through `MyBot.on_message`, the signal parsers, the dispatcher and the
+FutureClient / SpotClient order paths over real HTTP, so the numbers include the executor,
+connection pool and rate limiter. The report gives throughput, p50/p99 latency from message
+receipt to the last order acknowledgement, and REST calls per signal. With `--accounts N` every
+signal is copied to N accounts sharing one connection pool, and the report shows how many TCP
+connections the exchange saw.
+"""
+import argparse
+import asyncio
+import itertools
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+import discord
+from requests.adapters import HTTPAdapter
+
+from benchmarks.bench_parsing import load_corpus
+from benchmarks.mock_exchange import MockExchange
+from core_accounts.accounts import AccountPool
+from core_exchange.executor import run_blocking
+from core_exchange.rate_limiter import RateLimitGovernor
+from core_exchange.transport import PooledClient, build_adapter, get_pool_size
+from core_journal.journal import SignalJournal
+from core_logging.logs import configure_logging
+from core_parsing.signal_parser import parse_future_signal, parse_spot_signal
+from demo.discord_bot import MyBot
+
+
+class ReplayClient(PooledClient):
+    """
+    PooledClient pointed at a mock exchange instead of api.binance.com / fapi.binance.com.
+    """
+
+    def __init__(self, base_url: str, governor: RateLimitGovernor | None = None, adapter: HTTPAdapter | None = None):
+        # BaseClient formats these with the TLD; a URL without placeholders passes through unchanged.
+        self.API_URL = f'{base_url}/api'
+        self.FUTURES_URL = f'{base_url}/fapi'
+        super().__init__('replay-key', 'replay-secret', governor=governor or RateLimitGovernor(), adapter=adapter)
+
+
+@dataclass
+class FakeAuthor:
+    id: int = 1
+    name: str = 'signals'
+    # Signal feeds post as bots, which also keeps discord.py's command processing out of the replay.
+    bot: bool = True
+
+
+@dataclass
+class FakeChannel:
+    id: int
+    sent: list[str] = field(default_factory=list)
+    edits: int = 0
+
+    async def send(self, content: str | None = None, **kwargs: Any) -> 'FakeMessage':
+        self.sent.append(content or '')
+        return FakeMessage(len(self.sent), content or '', self)
+
+
+@dataclass
+class FakeMessage:
+    id: int
+    content: str
+    channel: FakeChannel
+    author: FakeAuthor = field(default_factory=FakeAuthor)
+    created_at: Any = field(default_factory=discord.utils.utcnow)
+
+    async def edit(self, content: str | None = None, **kwargs: Any) -> 'FakeMessage':
+        self.content = content or ''
+        self.channel.edits += 1
+        return self
+
+
+@dataclass(slots=True)
+class SignalTiming:
+    symbol: str
+    received_at: float
+    started_at: float = 0.0
+    finished_at: float = 0.0
+    order_acked_at: float | None = None
+
+    @property
+    def handler_ms(self) -> float:
+        return (self.finished_at - self.received_at) * 1000
+
+    @property
+    def order_ms(self) -> float | None:
+        return (self.order_acked_at - self.received_at) * 1000 if self.order_acked_at else None
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Nearest-rank percentile, `q` between 0 and 100."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(0, min(len(ordered) - 1, round(q / 100 * len(ordered)) - 1))]
+
+
+@dataclass
+class ReplayReport:
+    messages: int
+    timings: list[SignalTiming]
+    elapsed_s: float
+    calls: dict[tuple[str, str, str], int]
+    errors_injected: int
+    throttled_s: float
+    replies: int
+    reply_edits: int
+    accounts: int = 1
+    connections: int = 0
+
+    @property
+    def signals(self) -> int:
+        return len(self.timings)
+
+    @property
+    def rest_calls(self) -> int:
+        return sum(self.calls.values())
+
+    @property
+    def calls_per_signal(self) -> float:
+        return self.rest_calls / self.signals if self.signals else 0.0
+
+    @property
+    def throughput(self) -> float:
+        return self.signals / self.elapsed_s if self.elapsed_s else 0.0
+
+    def format(self) -> str:
+        handler = [timing.handler_ms for timing in self.timings]
+        orders = [timing.order_ms for timing in self.timings if timing.order_ms is not None]
+        lines = [
+            f"messages {self.messages}, signals {self.signals}, with orders {len(orders)}",
+            f"elapsed {self.elapsed_s:.3f}s, throughput {self.throughput:.1f} signals/s",
+            f"receive -> last order ack  p50 {percentile(orders, 50):8.1f} ms  p99 {percentile(orders, 99):8.1f} ms",
+            f"receive -> handler done    p50 {percentile(handler, 50):8.1f} ms  p99 {percentile(handler, 99):8.1f} ms",
+            f"REST calls {self.rest_calls} ({self.calls_per_signal:.2f} per signal), "
+            f"injected errors {self.errors_injected}, throttled {self.throttled_s:.2f}s, replies {self.replies} "
+            f"(+{self.reply_edits} edits)",
+            f"accounts {self.accounts}, exchange connections {self.connections}",
+        ]
+        for (market, method, endpoint), count in sorted(self.calls.items(), key=lambda item: -item[1]):
+            lines.append(f"  {market:8} {method:6} {endpoint:14} {count:6}")
+        return '\n'.join(lines)
+
+
+def corpus_symbols(records: list[dict]) -> list[str]:
+    symbols = set()
+    for record in records:
+        signal = parse_future_signal(record['content']) or parse_spot_signal(record['content'])
+        if signal and signal.symbol:
+            symbols.add(signal.symbol)
+    return sorted(symbols)
+
+
+async def replay(records: list[dict], repeat: int = 1, latency_ms: float = 0.0, jitter_ms: float = 0.0,
+                 error_rate: float = 0.0, rate: float = 0.0, seed: int = 0, accounts: int = 1) -> ReplayReport:
+    """
+    Replay `records` `repeat` times, `rate` messages per second (0 sends them back to back).
+    """
+    exchange = MockExchange(corpus_symbols(records), latency_ms, jitter_ms, error_rate, seed=seed)
+    await exchange.start()
+    governor = RateLimitGovernor()
+    adapter = build_adapter(get_pool_size())
+    governors = [governor] + [governor.for_account() for _ in range(accounts - 1)]
+    # The clients ping on construction, which needs this loop free to serve the mock exchange.
+    clients = {f'account{index}': await run_blocking(ReplayClient, exchange.url, account_governor, adapter)
+               for index, account_governor in enumerate(governors, 1)}
+    bot = MyBot(accounts=AccountPool.from_clients(clients), journal=SignalJournal(':memory:'), processes=0,
+                command_prefix='$', intents=discord.Intents.default())
+    await run_blocking(bot.future_client.symbols.refresh)
+    await run_blocking(bot.spot_client.symbols.refresh)
+    bot.exchange_ready.set()
+    exchange.reset_counters()
+
+    timings: list[SignalTiming] = []
+    submit = bot.dispatcher.submit
+    received_at = 0.0
+
+    def timed_submit(symbol, priority, handler):
+        timing = SignalTiming(symbol or '', received_at)
+        timings.append(timing)
+
+        async def run():
+            timing.started_at = time.perf_counter()
+            try:
+                await handler()
+            finally:
+                timing.finished_at = time.perf_counter()
+                # A lane runs one signal at a time, so acks for its symbol in this window are this signal's.
+                acks = [ack for ack in exchange.order_acks.get(timing.symbol, ())
+                        if timing.started_at <= ack <= timing.finished_at]
+                timing.order_acked_at = max(acks) if acks else None
+
+        return submit(symbol, priority, run)
+
+    bot.dispatcher.submit = timed_submit
+    channels: dict[int, FakeChannel] = {}
+    bot.dispatcher.start()
+    message_ids = itertools.count(1)
+    messages = 0
+    started = time.perf_counter()
+    try:
+        for _ in range(repeat):
+            for record in records:
+                channel = channels.setdefault(record['channel_id'], FakeChannel(record['channel_id']))
+                received_at = time.perf_counter()
+                await bot.on_message(FakeMessage(next(message_ids), record['content'], channel))
+                messages += 1
+                if rate:
+                    await asyncio.sleep(1 / rate)
+        await bot.dispatcher.join()
+        elapsed = time.perf_counter() - started
+        await bot.replies.drain()
+    finally:
+        await bot.dispatcher.stop()
+        await bot.replies.stop()
+        await exchange.stop()
+
+    return ReplayReport(
+        messages=messages, timings=timings, elapsed_s=elapsed, calls=dict(exchange.calls),
+        errors_injected=exchange.errors,
+        throttled_s=sum(account_governor.throttled_seconds for account_governor in governors),
+        replies=sum(len(channel.sent) for channel in channels.values()),
+        reply_edits=sum(channel.edits for channel in channels.values()),
+        accounts=accounts, connections=len(exchange.connections),
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=1, help='times to replay the corpus')
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='mock exchange latency per request')
+    parser.add_argument('--jitter-ms', type=float, default=0.0, help='extra random latency per request')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='share of requests answered with a 503')
+    parser.add_argument('--rate', type=float, default=0.0, help='messages per second, 0 for back to back')
+    parser.add_argument('--accounts', type=int, default=1, help='accounts every signal is copied to')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--log-level', default='WARNING')
+    args = parser.parse_args()
+
+    configure_logging(args.log_level, json_format=False)
+    report = asyncio.run(replay(load_corpus(), args.repeat, args.latency_ms, args.jitter_ms, args.error_rate,
+                                args.rate, args.seed, args.accounts))
+    print(report.format())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,159 @@
+import asyncio
+import logging
+import os
+import time
+from collections.abc import Awaitable, Callable, Iterator
+from dataclasses import dataclass
+from typing import Any
+
+from binance.client import Client
+
+from core_exchange.account_state import AccountState, UserDataStream
+from core_exchange.rate_limiter import RateLimitGovernor, get_governor
+from core_exchange.symbol_registry import SymbolRegistry
+from core_exchange.transport import PooledClient, build_adapter, get_pool_size
+from core_future.async_future import AsyncFutureClient
+from core_future.future import FutureClient
+from core_logging.logs import log_context
+from core_metrics.metrics import ACCOUNT_SIGNAL_SECONDS
+from core_spot.async_spot import AsyncSpotClient
+from core_spot.spot import SpotClient
+from variables.constants import AccountConstants, EnvVariables
+from variables.environment import load_environment
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class AccountConfig:
+    name: str
+    api_key: str | None
+    api_secret: str | None
+
+
+def load_accounts() -> list[AccountConfig]:
+    """
+    The accounts named in BINANCE_ACCOUNTS, each with its BINANCE_API_KEY_<NAME> / BINANCE_API_SECRET_<NAME>.
+    Without BINANCE_ACCOUNTS, the single account of BINANCE_API_KEY / BINANCE_API_SECRET.
+    """
+    load_environment()
+    names = [name.strip() for name in (os.getenv(EnvVariables.BINANCE_ACCOUNTS.value) or '').split(',')
+             if name.strip()]
+    if not names:
+        return [AccountConfig(AccountConstants.DEFAULT_NAME.value, os.getenv(EnvVariables.BINANCE_API_KEY.value),
+                              os.getenv(EnvVariables.BINANCE_API_SECRET.value))]
+    return [AccountConfig(name, os.getenv(f'{EnvVariables.BINANCE_API_KEY.value}_{name.upper()}'),
+                          os.getenv(f'{EnvVariables.BINANCE_API_SECRET.value}_{name.upper()}'))
+            for name in names]
+
+
+class Account:
+    """
+    One Binance account signals are copied to, with its own client, rate budget and account state.
+    """
+
+    def __init__(self, name: str, client: Client, governor: RateLimitGovernor | None = None,
+                 future_symbols: SymbolRegistry | None = None, spot_symbols: SymbolRegistry | None = None):
+        self.name = name
+        self.client = client
+        self.governor = governor or get_governor()
+        self.account_state = AccountState()
+        self.future_client = AsyncFutureClient(FutureClient(client, future_symbols, self.account_state))
+        self.spot_client = AsyncSpotClient(SpotClient(client, spot_symbols))
+        self.user_data_stream = UserDataStream(client, self.account_state)
+
+
+@dataclass(slots=True)
+class AccountOutcome:
+    account: Account
+    result: Any = None
+    error: Exception | None = None
+    latency_ms: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class AccountPool:
+    """
+    The accounts one signal is executed on.
+
+    Every account has its own API key, order-count budget and user-data stream, but they share the
+    HTTP connection pool, the IP-wide request-weight budget and the exchange-info caches, so adding
+    an account costs a listen key and a few objects rather than another set of connections and
+    exchange-info downloads.
+    """
+
+    def __init__(self, accounts: list[Account]):
+        if not accounts:
+            raise ValueError("At least one account is required")
+        self.accounts = accounts
+
+    @classmethod
+    def single(cls, client: Client) -> 'AccountPool':
+        return cls.from_clients({AccountConstants.DEFAULT_NAME.value: client})
+
+    @classmethod
+    def from_clients(cls, clients: dict[str, Client]) -> 'AccountPool':
+        """
+        Accounts for clients built by the caller, in order; the first one is the primary account.
+        """
+        primary = next(iter(clients.values()))
+        # Exchange info is public and identical for every account, so one registry per market is enough.
+        future_symbols = SymbolRegistry(primary.futures_exchange_info)
+        spot_symbols = SymbolRegistry(primary.get_exchange_info)
+        return cls([Account(name, client, getattr(client, 'governor', None), future_symbols, spot_symbols)
+                    for name, client in clients.items()])
+
+    @classmethod
+    def from_configs(cls, configs: list[AccountConfig], pool_size: int | None = None) -> 'AccountPool':
+        """
+        Build the clients of `configs` without touching the network; warm the shared pool with `warm_up`.
+        """
+        adapter = build_adapter(pool_size or get_pool_size())
+        ip_governor = get_governor()
+        governors = [ip_governor] + [ip_governor.for_account() for _ in configs[1:]]
+        return cls.from_clients({
+            config.name: PooledClient(config.api_key, config.api_secret, pool_size=pool_size, governor=governor,
+                                      adapter=adapter, ping=False)
+            for config, governor in zip(configs, governors)})
+
+    def __iter__(self) -> Iterator[Account]:
+        return iter(self.accounts)
+
+    def __len__(self) -> int:
+        return len(self.accounts)
+
+    @property
+    def primary(self) -> Account:
+        return self.accounts[0]
+
+    @property
+    def symbol_registries(self) -> list[SymbolRegistry]:
+        registries = {id(registry): registry for account in self.accounts
+                      for registry in (account.future_client.symbols, account.spot_client.symbols)}
+        return list(registries.values())
+
+    async def fan_out(self, action: Callable[[Account], Awaitable[Any]], market: str = '') -> list[AccountOutcome]:
+        """
+        Run `action` for every account concurrently. A failing account does not stop the others.
+        """
+        async def run(account: Account) -> AccountOutcome:
+            started = time.perf_counter()
+            outcome = AccountOutcome(account)
+            try:
+                with log_context(account=account.name):
+                    outcome.result = await action(account)
+            except Exception as e:
+                outcome.error = e
+            outcome.latency_ms = (time.perf_counter() - started) * 1000
+            ACCOUNT_SIGNAL_SECONDS.observe(outcome.latency_ms / 1000, account=account.name, market=market)
+            return outcome
+
+        outcomes = await asyncio.gather(*(run(account) for account in self.accounts))
+        if len(outcomes) > 1 and logger.isEnabledFor(logging.INFO):
+            logger.info("Account latency %s", ', '.join(
+                f"{outcome.account.name}={outcome.latency_ms:.0f}ms{'' if outcome.ok else ' (failed)'}"
+                for outcome in outcomes))
+        return outcomes
@@ -0,0 +1,139 @@
+import asyncio
+import itertools
+import logging
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from enum import IntEnum
+
+from core_metrics.metrics import SIGNAL_STAGE_SECONDS
+from core_parsing.signal_parser import Signal
+from variables.constants import DispatcherConstants, SignalCommand
+
+logger = logging.getLogger(__name__)
+
+
+class SignalPriority(IntEnum):
+    PROTECTIVE = 0
+    ENTRY = 1
+
+
+def signal_priority(signal: Signal) -> SignalPriority:
+    """
+    Closing a position or moving its stop outranks opening a new one.
+    """
+    if signal.command in (SignalCommand.CLOSE_ORDER, SignalCommand.CHANGE_STOPLOSS):
+        return SignalPriority.PROTECTIVE
+    return SignalPriority.ENTRY
+
+
+@dataclass(slots=True)
+class Job:
+    symbol: str
+    priority: SignalPriority
+    sequence: int
+    handler: Callable[[], Awaitable[None]]
+    enqueued_at: float = field(default_factory=time.perf_counter)
+
+
+class SignalDispatcher:
+    """
+    Runs signal handlers on a pool of worker tasks.
+
+    Jobs for the same symbol form a lane and run strictly in submission order, one at a time.
+    Different lanes run in parallel, and a lane holding a protective job is picked before lanes
+    holding only new entries.
+    """
+
+    def __init__(self, workers: int = DispatcherConstants.WORKERS.value):
+        self.worker_count = workers
+        self._lanes: dict[str, deque[Job]] = {}
+        self._busy: set[str] = set()
+        self._ready: asyncio.PriorityQueue[tuple[int, int, str]] = asyncio.PriorityQueue()
+        self._sequence = itertools.count()
+        self._workers: list[asyncio.Task] = []
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.wait_total_ms = 0.0
+        self.wait_max_ms = 0.0
+        self.wait_last_ms = 0.0
+
+    @property
+    def depth(self) -> int:
+        """Jobs submitted but not yet started."""
+        return sum(len(lane) for lane in self._lanes.values())
+
+    def start(self) -> None:
+        if not self._workers:
+            self._workers = [asyncio.create_task(self._work(), name=f'signal-worker-{i}')
+                             for i in range(self.worker_count)]
+
+    async def stop(self) -> None:
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    async def join(self) -> None:
+        """Wait until every submitted job has finished."""
+        await self._idle.wait()
+
+    def submit(self, symbol: str | None, priority: SignalPriority, handler: Callable[[], Awaitable[None]]) -> Job:
+        symbol = symbol or ''
+        job = Job(symbol, priority, next(self._sequence), handler)
+        lane = self._lanes.setdefault(symbol, deque())
+        lane.append(job)
+        self.submitted += 1
+        self._idle.clear()
+        if symbol not in self._busy:
+            # A waiting lane is (re)announced at the best priority it now holds; stale entries are skipped.
+            self._ready.put_nowait((min(queued.priority for queued in lane), job.sequence, symbol))
+        return job
+
+    async def _work(self) -> None:
+        while True:
+            _, _, symbol = await self._ready.get()
+            lane = self._lanes.get(symbol)
+            if symbol in self._busy or not lane:
+                continue
+            job = lane.popleft()
+            self._busy.add(symbol)
+            self._record_wait((time.perf_counter() - job.enqueued_at) * 1000)
+            try:
+                await job.handler()
+                self.completed += 1
+            except Exception as e:
+                self.failed += 1
+                logger.error("Signal handler for %s failed: %s", symbol or 'unknown symbol', e)
+            finally:
+                self._busy.discard(symbol)
+                if lane:
+                    self._ready.put_nowait((min(queued.priority for queued in lane), lane[0].sequence, symbol))
+                else:
+                    del self._lanes[symbol]
+                if not self._lanes:
+                    self._idle.set()
+
+    def _record_wait(self, wait_ms: float) -> None:
+        self.wait_last_ms = wait_ms
+        self.wait_max_ms = max(self.wait_max_ms, wait_ms)
+        self.wait_total_ms += wait_ms
+        SIGNAL_STAGE_SECONDS.observe(wait_ms / 1000, stage='queue_wait')
+
+    def metrics(self) -> dict[str, float]:
+        started = self.completed + self.failed + len(self._busy)
+        return {
+            'depth': self.depth,
+            'lanes': len(self._lanes),
+            'in_flight': len(self._busy),
+            'submitted': self.submitted,
+            'completed': self.completed,
+            'failed': self.failed,
+            'wait_last_ms': self.wait_last_ms,
+            'wait_max_ms': self.wait_max_ms,
+            'wait_avg_ms': self.wait_total_ms / started if started else 0.0,
+        }
@@ -0,0 +1,345 @@
+import asyncio
+import functools
+import logging
+from collections.abc import Awaitable, Callable, Iterable
+from typing import TYPE_CHECKING, Any, Protocol
+
+from core_dispatch.replies import Reply, ReplyBuffer
+from core_exchange.executor import run_blocking
+from core_exchange.price_cache import PriceCache, PriceStream, bracket_violation
+from core_future.orders import OrderLeg
+from core_journal.journal import SignalJournal
+from core_logging.logs import log_context
+from core_metrics.metrics import ORDER_LEGS_TOTAL, RATE_LIMIT_UTILISATION, SIGNAL_STAGE_SECONDS, SIGNALS_TOTAL, span
+from core_metrics.startup import StartupReport
+from core_parsing.signal_parser import Signal
+from variables.constants import Market, PriceCacheConstants, SignalCommand, TradingConstants
+
+if TYPE_CHECKING:
+    from binance.client import Client
+
+    from core_accounts.accounts import Account, AccountPool
+
+
+logger = logging.getLogger(__name__)
+
+
+class SignalMessage(Protocol):
+    """
+    What execution needs of the message a signal came from: a Discord message, or its ID and
+    channel relayed to a worker process.
+    """
+    id: int
+    channel: Any
+
+
+class SignalExecutor:
+    """
+    Executes parsed signals on the configured Binance accounts and reports back through a reply buffer.
+
+    Exchange clients are built lazily: python-binance and the accounts are loaded on the executor
+    by `start`, in parallel with the exchange-info downloads and connection warm-up. Signals that
+    arrive before the exchange side is ready wait for it.
+
+    Without `user_data_streams` the accounts' state is not streamed but fed through
+    `replay_account_update`, from an executor whose `on_account_update` publishes its changes.
+    """
+
+    def __init__(self, journal: SignalJournal, replies: ReplyBuffer, exchange_client: 'Client | None' = None,
+                 accounts: 'AccountPool | None' = None, startup: StartupReport | None = None,
+                 on_ready: Callable[[], None] | None = None, user_data_streams: bool = True,
+                 on_account_update: Callable[[str, tuple], None] | None = None):
+        self.journal = journal
+        self.replies = replies
+        self.accounts = accounts
+        self._exchange_client = exchange_client
+        self.startup = startup or StartupReport()
+        self.on_ready = on_ready
+        self.user_data_streams = user_data_streams
+        self.on_account_update = on_account_update
+        self.exchange_ready = asyncio.Event()
+        self.price_cache = PriceCache()
+        self.price_stream = PriceStream(self.price_cache)
+        self.warm_up_task: asyncio.Task | None = None
+        self.keep_warm_task: asyncio.Task | None = None
+        self.unpin_task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        """
+        Start the price stream and warm up the exchange side in the background.
+        """
+        for symbol in self.journal.symbols_with_open_orders(Market.FUTURES.value):
+            self.price_stream.track(symbol, pin=True)
+        self.price_stream.start()
+        self.warm_up_task = asyncio.create_task(self.warm_up_exchange(), name='exchange-warm-up')
+
+    async def close(self) -> None:
+        if self.warm_up_task:
+            self.warm_up_task.cancel()
+        for account in self.accounts or ():
+            await account.user_data_stream.stop()
+        await self.price_stream.stop()
+        if self.keep_warm_task:
+            self.keep_warm_task.cancel()
+        if self.unpin_task:
+            self.unpin_task.cancel()
+
+    def track(self, signal: Signal) -> None:
+        """
+        Subscribe to prices of a futures signal's symbol, pinned while a trade on it may be open.
+        """
+        if signal.market is Market.FUTURES:
+            self.price_stream.track(signal.symbol, pin=signal.command is SignalCommand.TRADE_SIGNAL)
+
+    def release_if_idle(self, symbol: str) -> None:
+        """
+        Unpin a futures symbol once no account holds a position or an open order on it. Nothing is
+        released while any account state is out of sync.
+        """
+        states = [account.account_state for account in self.accounts or ()]
+        if states and all(state.synced and not state.get_positions(symbol) and not state.get_open_orders(symbol)
+                          for state in states):
+            self.price_stream.release(symbol)
+
+    async def sweep_pins(self, interval: float = PriceCacheConstants.UNPIN_SWEEP_SECONDS.value) -> None:
+        """
+        Periodically unpin idle symbols; catches positions closed without a final order event and
+        symbols pinned from journal rows that were already stale.
+        """
+        while True:
+            await asyncio.sleep(interval)
+            for symbol in self.price_stream.pinned:
+                self.release_if_idle(symbol)
+
+    async def handle(self, message: SignalMessage, signal: Signal) -> None:
+        action = self.execute_future_signal if signal.market is Market.FUTURES else self.execute_spot_signal
+        with log_context(signal_id=message.id, symbol=signal.symbol):
+            await self.execute(message, signal, functools.partial(action, message, signal))
+
+    def rate_limits(self) -> dict[str, dict[str, dict[str, float]]]:
+        return {account.name: account.governor.utilisation() for account in self.accounts or ()}
+
+    def collect_gauges(self) -> None:
+        for name, markets in self.rate_limits().items():
+            for market, budgets in markets.items():
+                for budget, value in budgets.items():
+                    RATE_LIMIT_UTILISATION.set(value, account=name, market=market, budget=budget)
+
+    def build_accounts(self) -> 'AccountPool':
+        """
+        Build the account clients. Runs on the executor: importing python-binance alone takes a few
+        hundred milliseconds, and the gateway connection should not wait for it.
+        """
+        from core_accounts.accounts import AccountPool, load_accounts
+
+        if self._exchange_client is not None:
+            return AccountPool.single(self._exchange_client)
+        return AccountPool.from_configs(load_accounts())
+
+    async def warm_up_exchange(self):
+        """
+        Load exchange info for both markets and open the pooled connections in parallel.
+        """
+        from core_exchange.transport import keep_warm, warm_up
+
+        try:
+            if self.accounts is None:
+                self.accounts = await self.startup.measure('exchange_clients', run_blocking(self.build_accounts))
+            primary = self.accounts.primary
+            # Accounts share one connection pool, so warming it through the primary client warms it for all.
+            await asyncio.gather(
+                self.startup.measure('futures_exchange_info', run_blocking(primary.future_client.symbols.refresh)),
+                self.startup.measure('spot_exchange_info', run_blocking(primary.spot_client.symbols.refresh)),
+                self.startup.measure('connections', run_blocking(warm_up, primary.client)),
+            )
+            self.restore_orders()
+            for registry in self.accounts.symbol_registries:
+                registry.start()
+            self.keep_warm_task = asyncio.create_task(keep_warm(primary.client))
+            for account in self.accounts:
+                if self.on_account_update:
+                    account.account_state.on_update(functools.partial(self.on_account_update, account.name))
+                if self.user_data_streams:
+                    account.user_data_stream.start()
+            self.unpin_task = asyncio.create_task(self.sweep_pins(), name='price-unpin')
+        except Exception as e:
+            logger.error("Exchange warm-up failed: %s", e)
+        finally:
+            self.startup.mark('exchange_ready')
+            self.exchange_ready.set()
+            if self.on_ready:
+                self.on_ready()
+
+    def restore_orders(self) -> None:
+        """
+        Reconnect each account to the futures orders the journal holds open: its stop manager is
+        seeded with their stops, and orders its user-data stream reports filled, cancelled or expired
+        are closed in the journal, unpinning their symbol once it is idle.
+        """
+        market = Market.FUTURES.value
+        symbols = self.journal.symbols_with_open_orders(market)
+        for account in self.accounts:
+            account.account_state.on_order_closed(functools.partial(self.order_closed, account.name))
+            for symbol in symbols:
+                stops = self.journal.open_orders(market, symbol, leg='stop_loss', account=account.name)
+                if stops:
+                    account.future_client.sync_client.stops.seed(symbol, stops)
+
+    def replay_account_update(self, account: str, update: tuple) -> None:
+        """
+        Apply an account state update published by the executor that streams it. Updates arriving
+        before the accounts are built are dropped; the sender follows up with a full snapshot.
+        """
+        for candidate in self.accounts or ():
+            if candidate.name == account:
+                candidate.account_state.replay(update)
+
+    def order_closed(self, account: str, symbol: str, order_id: int) -> None:
+        self.journal.close_orders(Market.FUTURES.value, symbol, [order_id], account)
+        self.release_if_idle(symbol)
+
+    @staticmethod
+    def record_legs(legs: Iterable[OrderLeg]) -> None:
+        for leg in legs:
+            if leg.completed_at is not None:
+                SIGNAL_STAGE_SECONDS.observe(leg.latency_ms / 1000, stage=f'order_{leg.name}')
+            ORDER_LEGS_TOTAL.inc(leg=leg.name, outcome='ok' if leg.ok else 'error')
+
+    def account_reply(self, reply: Reply, account: 'Account') -> Callable[[str], None]:
+        """
+        Add lines to a reply, prefixed with the account name when signals are copied to several accounts.
+        """
+        if len(self.accounts) == 1:
+            return reply.add
+        return lambda line: reply.add(f"[{account.name}] {line}")
+
+    async def execute(self, message: SignalMessage, signal: Signal,
+                      action: Callable[['Account', Callable[[str], None]], Awaitable[None]]) -> None:
+        """
+        Run a parsed signal on every account concurrently and report the outcome once.
+        """
+        reply = self.replies.open(message.channel)
+        try:
+            if not self.exchange_ready.is_set():
+                with span('exchange_ready'):
+                    await self.exchange_ready.wait()
+            if self.accounts is None:
+                SIGNALS_TOTAL.inc(market=signal.market.value, command=signal.command.value, outcome='error')
+                self.journal.finish(message.id, ok=False)
+                reply.add("Error processing message: exchange clients are not available")
+                return
+            outcomes = await self.accounts.fan_out(
+                lambda account: action(account, self.account_reply(reply, account)), market=signal.market.value)
+            failed = [outcome for outcome in outcomes if not outcome.ok]
+            for outcome in failed:
+                logger.error("Error processing %s message on account %s: %s", signal.market.value.lower(),
+                             outcome.account.name, outcome.error)
+                self.account_reply(reply, outcome.account)(f"Error processing message: {str(outcome.error)}")
+            SIGNALS_TOTAL.inc(market=signal.market.value, command=signal.command.value,
+                              outcome='error' if failed else 'ok')
+            self.journal.finish(message.id, ok=not failed)
+        finally:
+            self.replies.flush(reply)
+
+    async def execute_future_signal(self, message: SignalMessage, signal: Signal, account: 'Account',
+                                    say: Callable[[str], None]):
+        symbol = signal.symbol
+        future_client = account.future_client
+
+        if signal.command is SignalCommand.CLOSE_ORDER:
+            say(f"Closing all open positions for {symbol}")
+            await future_client.close_order_in_profit(symbol)
+            self.price_stream.release(symbol)
+            say(f"Closed all open positions for {symbol}")
+
+        elif signal.command is SignalCommand.CHANGE_STOPLOSS:
+            say(f"Changing stop loss for {symbol} to {signal.stop_loss}")
+            with span('change_stop_loss'):
+                change = await future_client.change_stop_loss(symbol, signal.stop_loss)
+            self.record_legs(change.legs)
+            if not change.ok:
+                raise ValueError(f"Failed to change stop loss for {symbol}: "
+                                 f"{change.error or next(leg.error for leg in change.legs if not leg.ok)}")
+            if change.unchanged:
+                say(f"Stop loss for {symbol} is already at {change.stop_price}")
+            else:
+                self.journal.record_orders(message.id, signal.market.value, symbol, change.legs, account.name)
+                self.journal.close_orders(signal.market.value, symbol, change.replaced)
+                say(f"Changed stop loss for {symbol} to {change.stop_price}")
+
+        elif signal.command is SignalCommand.TRADE_SIGNAL:
+            entry_price, stop_loss_price, target_price = signal.entry_price, signal.stop_loss, signal.target
+
+            # The entry is a market order, so size it off the live price when the stream has one.
+            live_price = self.price_cache.price(symbol)
+            if live_price is not None:
+                violation = bracket_violation(signal.side, live_price, stop_loss_price, target_price)
+                if violation:
+                    raise ValueError(f"Not entering {symbol}: {violation}")
+                entry_price = live_price
+
+            say(f"Canceling open futures orders for {symbol}")
+            with span('cancel'):
+                cancelled = await future_client.cancel_open_futures_orders(symbol)
+            self.journal.close_orders(signal.market.value, symbol, cancelled.cancelled)
+
+            leverage = TradingConstants.LEVERAGE.value
+            portfolio_percentage = TradingConstants.RISK_PERCENTAGE.value
+
+            with span('balance'):
+                total_balance = await future_client.get_account_balance()
+            logger.debug("Total balance of %s: %s", account.name, total_balance)
+            logger.debug("Trade amount: %s", total_balance * portfolio_percentage)
+
+            with span('quantity'):
+                quantity = await future_client.calculate_quantity(total_balance, entry_price, leverage, symbol)
+            logger.debug("Calculated quantity: %s", quantity)
+            logger.debug("Entry price: %s, Stop loss price: %s, Target price: %s",
+                         entry_price, stop_loss_price, target_price)
+
+            with span('set_leverage'):
+                await future_client.set_leverage(symbol, leverage)
+            with span('place_order'):
+                result = await future_client.place_order(
+                    symbol, signal.side, quantity, entry_price, stop_loss_price, target_price, leverage=leverage)
+            self.record_legs(result.legs.values())
+            self.journal.record_orders(message.id, signal.market.value, symbol, result.legs.values(), account.name)
+            if result.entry is None or not result.entry.ok:
+                raise ValueError(f"Futures order for {symbol} not placed: "
+                                 f"{result.entry.error if result.entry else 'no entry order was sent'}")
+
+            if result.is_protected:
+                say(f"Placed futures order for {symbol}, protected in {result.protected_ms:.0f} ms")
+            else:
+                say(f"Futures order for {symbol} is not protected by a stop loss")
+
+    async def execute_spot_signal(self, message: SignalMessage, signal: Signal, account: 'Account',
+                                  say: Callable[[str], None]):
+        symbol = signal.symbol
+        spot_client = account.spot_client
+
+        say(f"Canceling open orders for {symbol}")
+        with span('cancel'):
+            cancelled = await spot_client.cancel_open_orders(symbol)
+        self.journal.close_orders(signal.market.value, symbol, cancelled.cancelled)
+
+        with span('quantity'):
+            plan = await spot_client.size_ladder(symbol, signal.entries, signal.target)
+        if plan is None:
+            raise ValueError(f"Symbol info not found for {symbol}")
+
+        if plan.take_profit:
+            say(f"Intention to sell {plan.take_profit.quantity} {symbol} at {plan.take_profit.price}")
+        with span('place_order'):
+            result = await spot_client.place_ladder(plan)
+        self.record_legs(result.legs.values())
+        self.journal.record_orders(message.id, signal.market.value, symbol, result.legs.values(), account.name)
+
+        for leg in result.legs.values():
+            if not leg.ok:
+                say(f"Order {leg.name} for {symbol} failed: {leg.error}")
+            elif leg.name == 'take_profit':
+                say(f"Placed sell order: {leg.order}")
+            else:
+                say(f"Placed order: {leg.order}")
+
@@ -0,0 +1,118 @@
+import asyncio
+import logging
+from typing import Any
+
+from core_metrics.metrics import span
+from variables.constants import ReplyConstants
+
+logger = logging.getLogger(__name__)
+
+
+class Reply:
+    """
+    Progress lines about one signal, shown in Discord as a single message that is edited as lines arrive.
+    """
+
+    __slots__ = ('channel', 'lines', 'message', 'sent_text')
+
+    def __init__(self, channel: Any):
+        self.channel = channel
+        self.lines: list[str] = []
+        self.message: Any = None
+        self.sent_text = ''
+
+    def add(self, text: str) -> None:
+        self.lines.append(text)
+
+    @property
+    def text(self) -> str:
+        text = '\n'.join(self.lines)
+        limit = ReplyConstants.MAX_MESSAGE_LENGTH.value
+        # Keep the latest lines when the message outgrows Discord's limit.
+        return text if len(text) <= limit else '…' + text[-(limit - 1):]
+
+
+class ReplyBuffer:
+    """
+    Per-channel outbound buffer for signal replies.
+
+    Handlers add lines to a Reply without awaiting anything and call `flush` when there is news.
+    Each channel has one sender task that posts a Reply on its first flush and edits that message
+    on later ones, so lines added while a send is in flight are coalesced into the next edit and
+    Discord round trips never sit between two exchange calls.
+    """
+
+    def __init__(self):
+        self._pending: dict[int, dict[int, Reply]] = {}
+        self._wakeups: dict[int, asyncio.Event] = {}
+        self._senders: dict[int, asyncio.Task] = {}
+        self._delivering = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
+
+    def open(self, channel: Any) -> Reply:
+        return Reply(channel)
+
+    def send(self, channel: Any, text: str) -> Reply:
+        """Queue a one-line reply."""
+        reply = self.open(channel)
+        reply.add(text)
+        self.flush(reply)
+        return reply
+
+    def flush(self, reply: Reply) -> None:
+        """Schedule `reply` to be posted or edited. Returns immediately."""
+        if not reply.lines:
+            return
+        channel_id = reply.channel.id
+        self._pending.setdefault(channel_id, {})[id(reply)] = reply
+        self._idle.clear()
+        if channel_id not in self._senders:
+            self._wakeups[channel_id] = asyncio.Event()
+            self._senders[channel_id] = asyncio.create_task(self._send_loop(channel_id),
+                                                            name=f'replies-{channel_id}')
+        self._wakeups[channel_id].set()
+
+    async def drain(self) -> None:
+        """Wait until every flushed reply has been delivered."""
+        await self._idle.wait()
+
+    async def stop(self) -> None:
+        for sender in self._senders.values():
+            sender.cancel()
+        await asyncio.gather(*self._senders.values(), return_exceptions=True)
+        self._senders.clear()
+        self._wakeups.clear()
+
+    async def _send_loop(self, channel_id: int) -> None:
+        wakeup = self._wakeups[channel_id]
+        while True:
+            await wakeup.wait()
+            wakeup.clear()
+            pending = self._pending.get(channel_id)
+            while pending:
+                replies = list(pending.values())
+                pending.clear()
+                self._delivering += 1
+                try:
+                    for reply in replies:
+                        await self._deliver(reply)
+                finally:
+                    self._delivering -= 1
+            if not self._delivering and not any(self._pending.values()):
+                self._idle.set()
+
+    @staticmethod
+    async def _deliver(reply: Reply) -> None:
+        text = reply.text
+        if text == reply.sent_text:
+            return
+        try:
+            with span('reply'):
+                if reply.message is None:
+                    reply.message = await reply.channel.send(text)
+                else:
+                    await reply.message.edit(content=text)
+            reply.sent_text = text
+        except Exception as e:
+            logger.error("Failed to send reply to channel %s: %s", reply.channel.id, e)
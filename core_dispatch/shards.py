@@ -0,0 +1,386 @@
+import asyncio
+import bisect
+import functools
+import hashlib
+import logging
+import multiprocessing
+import os
+import queue
+import threading
+from collections.abc import Callable, Hashable, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from core_dispatch.dispatcher import SignalDispatcher, signal_priority
+from core_dispatch.execution import SignalExecutor
+from core_dispatch.replies import Reply, ReplyBuffer
+from core_exchange.account_state import AccountState
+from core_exchange.executor import shutdown_executor
+from core_exchange.rate_limiter import configure_governor
+from core_journal.journal import SignalJournal
+from core_logging.logs import configure_logging
+from core_parsing.signal_parser import Signal
+from variables.constants import EnvVariables, ShardConstants
+from variables.environment import load_environment
+
+logger = logging.getLogger(__name__)
+
+
+def get_shard_count() -> int:
+    """
+    Number of signal executor processes from SIGNAL_EXECUTOR_PROCESSES; 0 executes signals in the bot's own process.
+    """
+    load_environment()
+    return int(os.getenv(EnvVariables.SIGNAL_EXECUTOR_PROCESSES.value) or 0)
+
+
+class HashRing:
+    """
+    Consistent hash ring mapping keys to nodes through `replicas` virtual points per node.
+
+    A key belongs to the first point clockwise of its hash, so adding or removing a node only moves
+    the keys of the ring segments that node gains or loses.
+    """
+
+    def __init__(self, nodes: Sequence[Hashable], replicas: int = ShardConstants.VIRTUAL_NODES.value):
+        if not nodes:
+            raise ValueError("A hash ring needs at least one node")
+        points = sorted((self.hash(f'{node}#{replica}'), node) for node in nodes for replica in range(replicas))
+        self._hashes = [point for point, _ in points]
+        self._nodes = [node for _, node in points]
+
+    @staticmethod
+    def hash(key: str) -> int:
+        # Python's hash() is salted per process; the ring must place a key identically everywhere.
+        return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), 'big')
+
+    def node_for(self, key: str) -> Hashable:
+        return self._nodes[bisect.bisect(self._hashes, self.hash(key)) % len(self._hashes)]
+
+
+@dataclass(slots=True)
+class ShardJob:
+    message_id: int
+    channel_id: int
+    signal: Signal
+
+
+@dataclass(slots=True)
+class AccountUpdate:
+    """
+    An account state change of the worker running the user-data streams, relayed to the others.
+    """
+    account: str
+    update: tuple
+
+
+@dataclass(slots=True)
+class RelayedChannel:
+    id: int
+    message_id: int
+
+
+@dataclass(slots=True)
+class RelayedMessage:
+    """
+    The part of a Discord message a worker process needs to execute its signal.
+    """
+    id: int
+    channel: RelayedChannel
+
+
+class RelayReplies:
+    """
+    Reply buffer of a worker process: every flush sends the reply's text to the gateway, which posts
+    or edits the Discord message.
+    """
+
+    def __init__(self, shard: int, outbox: Any):
+        self.shard = shard
+        self._outbox = outbox
+
+    def open(self, channel: RelayedChannel) -> Reply:
+        return Reply(channel)
+
+    def flush(self, reply: Reply) -> None:
+        if reply.lines:
+            self._outbox.put(('reply', self.shard, reply.channel.message_id, reply.text))
+
+
+class ShardWorker:
+    """
+    One signal executor process: its own accounts, exchange clients and journal connection, fed
+    the signals of the symbols the hash ring assigns to it.
+
+    Only the USER_DATA_SHARD worker runs the accounts' user-data streams, publishing every state
+    change to the gateway; the others mirror its account state from the updates the gateway relays.
+    """
+
+    def __init__(self, shard: int, inbox: Any, outbox: Any, journal_path: str):
+        self.shard = shard
+        self.inbox = inbox
+        self.outbox = outbox
+        self.journal_path = journal_path
+
+    async def run(self) -> None:
+        # The gateway claims signals; this process only records their orders and outcomes.
+        journal = SignalJournal(self.journal_path, recover_interrupted=False)
+        streams = self.shard == ShardConstants.USER_DATA_SHARD.value
+        executor = SignalExecutor(journal, RelayReplies(self.shard, self.outbox),
+                                  on_ready=lambda: self.outbox.put(('ready', self.shard)),
+                                  user_data_streams=streams, on_account_update=self.publish if streams else None)
+        dispatcher = SignalDispatcher()
+        dispatcher.start()
+        executor.start()
+        loop = asyncio.get_running_loop()
+        try:
+            while (job := await loop.run_in_executor(None, self.inbox.get)) is not None:
+                if isinstance(job, AccountUpdate):
+                    executor.replay_account_update(job.account, job.update)
+                    continue
+                message = RelayedMessage(job.message_id, RelayedChannel(job.channel_id, job.message_id))
+                executor.track(job.signal)
+                dispatcher.submit(job.signal.symbol, signal_priority(job.signal),
+                                  functools.partial(self.execute, executor, message, job.signal))
+            await dispatcher.join()
+        finally:
+            await dispatcher.stop()
+            await executor.close()
+            shutdown_executor()
+            journal.close()
+
+    def publish(self, account: str, update: tuple) -> None:
+        self.outbox.put(('account', self.shard, account, update))
+
+    async def execute(self, executor: SignalExecutor, message: RelayedMessage, signal: Signal) -> None:
+        try:
+            await executor.handle(message, signal)
+        finally:
+            self.outbox.put(('done', self.shard, message.id))
+
+
+def run_shard(shard: int, inbox: Any, outbox: Any, journal_path: str, processes: int = 1) -> None:
+    """
+    Entry point of a signal executor process. All `processes` workers trade from the same IP and
+    accounts, so each is held to an even share of the rate limits.
+    """
+    configure_logging()
+    configure_governor(1 / processes)
+    asyncio.run(ShardWorker(shard, inbox, outbox, journal_path).run())
+
+
+class ShardPool:
+    """
+    Gateway side of sharded signal execution.
+
+    Signals are sent to `processes` worker processes over multiprocessing queues, each to the worker
+    the hash ring assigns its symbol to. One symbol therefore always lands on the same worker, which
+    keeps its signals in order and holds its open orders, while different symbols execute on
+    different cores. Workers send reply text and completions back on a shared queue, read by a
+    thread that hands them to the event loop; replies are posted through the bot's ReplyBuffer.
+
+    The same thread watches the workers. A worker that exits unexpectedly is restarted; the signals
+    it was sent and had not finished are failed, with a reply and, given the `journal`, a journal entry,
+    rather than retried, since it may have placed some of their orders.
+
+    Account state updates from the USER_DATA_SHARD worker are relayed to the other workers. The
+    gateway mirrors them too, to send a worker that (re)starts a snapshot, and marks the workers'
+    account state out of sync while the streaming worker is being restarted.
+    """
+
+    def __init__(self, processes: int, replies: ReplyBuffer, journal_path: str,
+                 on_ready: Callable[[], None] | None = None, target: Callable[..., None] = run_shard,
+                 context: Any = None, journal: SignalJournal | None = None):
+        if journal_path == ':memory:':
+            raise ValueError("Sharded execution needs a journal file the worker processes can open")
+        self.replies = replies
+        self.on_ready = on_ready
+        self.journal = journal
+        self.journal_path = journal_path
+        self.ring = HashRing(range(processes))
+        self.ready = asyncio.Event()
+        self._context = context or multiprocessing.get_context('spawn')
+        self._target = target
+        self._outbox = self._context.Queue()
+        self._inboxes: list[Any] = [None] * processes
+        self._processes: list[Any] = [None] * processes
+        for shard in range(processes):
+            self.__spawn(shard)
+        self._ready_shards: set[int] = set()
+        self._channels: dict[int, Any] = {}
+        self._replies: dict[int, Reply] = {}
+        self._pending: list[dict[int, ShardJob]] = [{} for _ in range(processes)]
+        self._account_states: dict[str, AccountState] = {}
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._reader: threading.Thread | None = None
+        self._stopping = False
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.restarts = 0
+
+    def __spawn(self, shard: int) -> Any:
+        # A fresh inbox: jobs left in a dead worker's queue have already been failed.
+        inbox = self._inboxes[shard] = self._context.Queue()
+        process = self._processes[shard] = self._context.Process(
+            target=self._target, args=(shard, inbox, self._outbox, self.journal_path, len(self._processes)),
+            name=f'signal-shard-{shard}', daemon=True)
+        return process
+
+    def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        for process in self._processes:
+            process.start()
+        self._reader = threading.Thread(target=self.__read, name='shard-events', daemon=True)
+        self._reader.start()
+
+    def shard_for(self, symbol: str | None) -> int:
+        return self.ring.node_for(symbol or '')
+
+    def submit(self, message: Any, signal: Signal) -> int:
+        """
+        Send `signal` to the worker owning its symbol; replies about it go to the message's channel.
+        """
+        shard = self.shard_for(signal.symbol)
+        job = ShardJob(message.id, message.channel.id, signal)
+        self._channels[message.id] = message.channel
+        self._pending[shard][message.id] = job
+        self.submitted += 1
+        self._idle.clear()
+        self._inboxes[shard].put(job)
+        return shard
+
+    async def join(self) -> None:
+        """Wait until every submitted signal has been executed."""
+        await self._idle.wait()
+
+    async def stop(self, timeout: float = ShardConstants.STOP_TIMEOUT_SECONDS.value) -> None:
+        """
+        Let the workers finish the signals they were sent and exit; workers still running after `timeout` are killed.
+        """
+        if self._reader is None:
+            return
+        self._stopping = True
+        for inbox in self._inboxes:
+            inbox.put(None)
+        await asyncio.get_running_loop().run_in_executor(None, self.__join_processes, timeout)
+        self._outbox.put(None)
+        self._reader.join()
+        self._reader = None
+
+    def __join_processes(self, timeout: float) -> None:
+        for process in self._processes:
+            process.join(timeout)
+            if process.is_alive():
+                logger.error("%s did not stop within %ss, terminating it", process.name, timeout)
+                process.terminate()
+                process.join()
+
+    def __read(self) -> None:
+        while True:
+            try:
+                event = self._outbox.get(timeout=ShardConstants.LIVENESS_CHECK_SECONDS.value)
+            except queue.Empty:
+                event = ()
+            if event is None:
+                return
+            if event:
+                self._loop.call_soon_threadsafe(self.__deliver, event)
+            if self._stopping:
+                continue
+            for shard, process in enumerate(self._processes):
+                if process.exitcode is not None:
+                    # Hand over what the worker sent before it died first, so finished signals are not failed.
+                    while True:
+                        try:
+                            event = self._outbox.get_nowait()
+                        except queue.Empty:
+                            break
+                        if event is None:
+                            return
+                        self._loop.call_soon_threadsafe(self.__deliver, event)
+                    self._loop.call_soon_threadsafe(self.__restart, shard, process)
+
+    def __restart(self, shard: int, process: Any) -> None:
+        if self._stopping or self._processes[shard] is not process:
+            return
+        jobs, self._pending[shard] = self._pending[shard], {}
+        logger.error("%s exited with code %s, failing %s unfinished signals and restarting it",
+                     process.name, process.exitcode, len(jobs))
+        for job in jobs.values():
+            self.__fail(job, process)
+        self._ready_shards.discard(shard)
+        if shard == ShardConstants.USER_DATA_SHARD.value:
+            for account in self._account_states:
+                self.__relay_account_update(shard, account, ('invalidate',))
+        self.restarts += 1
+        self.__spawn(shard).start()
+        self.__update_idle()
+
+    def __fail(self, job: ShardJob, process: Any) -> None:
+        if self.journal:
+            self.journal.finish(job.message_id, ok=False)
+        reply = self._replies.pop(job.message_id, None) or self.replies.open(self._channels[job.message_id])
+        reply.add(f"Signal for {job.signal.symbol} failed: {process.name} exited with code {process.exitcode}. "
+                  f"Orders it placed before that are not tracked; check the exchange.")
+        self.replies.flush(reply)
+        self._channels.pop(job.message_id, None)
+        self.failed += 1
+
+    def __relay_account_update(self, source: int, account: str, update: tuple) -> None:
+        self._account_states.setdefault(account, AccountState()).replay(update)
+        for shard, inbox in enumerate(self._inboxes):
+            if shard != source:
+                inbox.put(AccountUpdate(account, update))
+
+    def __update_idle(self) -> None:
+        if not any(self._pending):
+            self._idle.set()
+
+    def __deliver(self, event: tuple) -> None:
+        kind, shard, *payload = event
+        if kind == 'ready':
+            self._ready_shards.add(shard)
+            if shard != ShardConstants.USER_DATA_SHARD.value:
+                for account, state in self._account_states.items():
+                    if state.synced:
+                        self._inboxes[shard].put(AccountUpdate(account, ('load', *state.snapshot())))
+            if len(self._ready_shards) == len(self._processes) and not self.ready.is_set():
+                self.ready.set()
+                if self.on_ready:
+                    self.on_ready()
+        elif kind == 'reply':
+            message_id, text = payload
+            if message_id not in self._pending[shard]:
+                return
+            reply = self._replies.get(message_id)
+            if reply is None:
+                reply = self._replies[message_id] = self.replies.open(self._channels[message_id])
+            # The worker sends the whole text every time; the buffer edits the message to match.
+            reply.lines = [text]
+            self.replies.flush(reply)
+        elif kind == 'account':
+            account, update = payload
+            self.__relay_account_update(shard, account, update)
+        elif kind == 'done':
+            message_id, = payload
+            if self._pending[shard].pop(message_id, None) is None:
+                return
+            self._replies.pop(message_id, None)
+            self._channels.pop(message_id, None)
+            self.completed += 1
+            self.__update_idle()
+
+    def metrics(self) -> dict[str, float]:
+        return {
+            'processes': len(self._processes),
+            'ready': len(self._ready_shards),
+            'alive': sum(process.is_alive() for process in self._processes),
+            'submitted': self.submitted,
+            'completed': self.completed,
+            'failed': self.failed,
+            'restarts': self.restarts,
+            'in_flight': sum(len(jobs) for jobs in self._pending),
+        }
@@ -0,0 +1,342 @@
+import asyncio
+import json
+import logging
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+import websockets
+
+from core_exchange.executor import run_blocking
+from variables.constants import StreamConstants
+
+if TYPE_CHECKING:
+    from binance.client import Client
+
+logger = logging.getLogger(__name__)
+OPEN_ORDER_STATUSES = frozenset({'NEW', 'PARTIALLY_FILLED'})
+
+
+@dataclass(slots=True)
+class Position:
+    symbol: str
+    amount: float
+    entry_price: float
+    position_side: str = 'BOTH'
+
+
+@dataclass(slots=True)
+class Balance:
+    """
+    `available` is None while unknown: the stream only carries wallet balances, and any order or
+    position change moves the margin available for new orders.
+    """
+    asset: str
+    wallet: float
+    available: float | None
+
+
+class AccountState:
+    """
+    Local copy of futures balances, positions and open orders.
+
+    It is seeded from REST by `resync` and then kept current by `apply`, which consumes the
+    ACCOUNT_UPDATE and ORDER_TRADE_UPDATE events of the user-data stream. Readers should only trust
+    it while `synced` is set; otherwise they fall back to REST.
+
+    The events do not carry the available balance, so every event clears it until `refresh_available`
+    reads it again from REST. Readers fall back to REST while it is unknown. Only a newly placed order
+    makes `margin_wanted` ask for a refresh; fills, cancels and balance updates alone leave it unknown.
+
+    Listeners added with `on_order_closed` are called with the symbol and order ID of every order
+    that fills, is cancelled or expires, e.g. to close it in the signal journal.
+
+    A state can mirror one in another process without reading REST itself: every change is passed
+    as a picklable update tuple to the listeners added with `on_update`, and `replay` applies one.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._balances: dict[str, Balance] = {}
+        self._positions: dict[tuple[str, str], Position] = {}
+        self._open_orders: dict[int, dict[str, Any]] = {}
+        self._order_listeners: list[Callable[[str, int], None]] = []
+        self._update_listeners: list[Callable[[tuple], None]] = []
+        # Bumped whenever the available balance goes stale, so an older REST read is not applied over it.
+        self._margin_version = 0
+        self._order_placed = False
+        self.synced = False
+        self.last_event_at = 0.0
+
+    def resync(self, client: 'Client') -> None:
+        """
+        Rebuild the whole state from REST snapshots.
+        """
+        self.load(client.futures_account(), client.futures_get_open_orders())
+
+    def load(self, account: dict[str, Any], open_orders: list[dict[str, Any]]) -> None:
+        """
+        Replace the whole state with a futures account and its open orders, shaped as REST returns them.
+        """
+        with self._lock:
+            self._margin_version += 1
+            self._order_placed = False
+            self._balances = self.__balances(account)
+            self._positions = {}
+            for position in account['positions']:
+                amount = float(position['positionAmt'])
+                if amount:
+                    side = position.get('positionSide', 'BOTH')
+                    self._positions[(position['symbol'], side)] = Position(
+                        position['symbol'], amount, float(position['entryPrice']), side)
+            self._open_orders = {
+                order['orderId']: {
+                    'symbol': order['symbol'], 'orderId': order['orderId'], 'clientOrderId': order['clientOrderId'],
+                    'side': order['side'], 'type': order['type'], 'status': order['status'],
+                    'price': float(order['price']), 'stopPrice': float(order['stopPrice']),
+                    'origQty': float(order['origQty']),
+                }
+                for order in open_orders
+            }
+            self.synced = True
+            self.last_event_at = time.monotonic()
+            self.__publish(('load', account, open_orders))
+        logger.info("Account state resynced: %s positions, %s orders", len(self._positions), len(self._open_orders))
+
+    def snapshot(self) -> tuple[dict[str, Any], list[dict[str, Any]]]:
+        """The state as the account and open orders `load` takes."""
+        with self._lock:
+            account = {
+                'assets': [{'asset': balance.asset, 'walletBalance': balance.wallet,
+                            'availableBalance': balance.available} for balance in self._balances.values()],
+                'positions': [{'symbol': position.symbol, 'positionAmt': position.amount,
+                               'entryPrice': position.entry_price, 'positionSide': position.position_side}
+                              for position in self._positions.values()],
+            }
+            return account, [dict(order) for order in self._open_orders.values()]
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self.synced = False
+            self.__publish(('invalidate',))
+
+    def on_order_closed(self, listener: Callable[[str, int], None]) -> None:
+        self._order_listeners.append(listener)
+
+    def on_update(self, listener: Callable[[tuple], None]) -> None:
+        """
+        Add a listener for every change. It is called under the state's lock, so it must be quick
+        and must not read the state.
+        """
+        self._update_listeners.append(listener)
+
+    def replay(self, update: tuple) -> None:
+        """Apply an update published by another state's `on_update` listeners."""
+        kind, *args = update
+        if kind == 'load':
+            self.load(*args)
+        elif kind == 'apply':
+            self.apply(*args)
+        elif kind == 'available':
+            with self._lock:
+                self._balances = self.__balances(*args)
+                self.__publish(update)
+        elif kind == 'invalidate':
+            self.invalidate()
+
+    def __publish(self, update: tuple) -> None:
+        for listener in self._update_listeners:
+            try:
+                listener(update)
+            except Exception as e:
+                logger.error("Account update listener failed: %s", e)
+
+    @staticmethod
+    def __balances(account: dict[str, Any]) -> dict[str, Balance]:
+        return {
+            asset['asset']: Balance(asset['asset'], float(asset['walletBalance']),
+                                    None if asset['availableBalance'] is None else float(asset['availableBalance']))
+            for asset in account['assets']
+        }
+
+    @property
+    def margin_stale(self) -> bool:
+        with self._lock:
+            return any(balance.available is None for balance in self._balances.values())
+
+    @property
+    def margin_wanted(self) -> bool:
+        """Whether the available balance is stale and an order was placed since it was last read."""
+        with self._lock:
+            return self._order_placed and any(balance.available is None for balance in self._balances.values())
+
+    def refresh_available(self, client: 'Client') -> bool:
+        """
+        Re-read the available balances from REST. Returns False, applying nothing, if an event made
+        them stale again while the request was in flight.
+        """
+        with self._lock:
+            version = self._margin_version
+            self._order_placed = False
+        account = client.futures_account()
+        with self._lock:
+            if version != self._margin_version:
+                return False
+            self._balances = self.__balances(account)
+            self.__publish(('available', account))
+        return True
+
+    def __invalidate_available(self) -> None:
+        self._margin_version += 1
+        for balance in self._balances.values():
+            balance.available = None
+
+    def apply(self, event: dict[str, Any]) -> None:
+        """
+        Apply one user-data stream event.
+        """
+        event_type = event.get('e')
+        closed = False
+        with self._lock:
+            if event_type == 'ACCOUNT_UPDATE':
+                self.__apply_account_update(event['a'])
+            elif event_type == 'ORDER_TRADE_UPDATE':
+                closed = self.__apply_order_update(event['o'])
+            elif event_type == 'listenKeyExpired':
+                self.synced = False
+            self.last_event_at = time.monotonic()
+            self.__publish(('apply', event))
+        if closed:
+            for listener in self._order_listeners:
+                try:
+                    listener(event['o']['s'], event['o']['i'])
+                except Exception as e:
+                    logger.error("Order listener failed for order %s: %s", event['o']['i'], e)
+
+    def __apply_account_update(self, update: dict[str, Any]) -> None:
+        self.__invalidate_available()
+        for balance in update.get('B', []):
+            self._balances[balance['a']] = Balance(balance['a'], float(balance['wb']), None)
+        for position in update.get('P', []):
+            key = (position['s'], position.get('ps', 'BOTH'))
+            amount = float(position['pa'])
+            if amount:
+                self._positions[key] = Position(position['s'], amount, float(position['ep']), key[1])
+            else:
+                self._positions.pop(key, None)
+
+    def __apply_order_update(self, order: dict[str, Any]) -> bool:
+        """Apply an order update; returns whether the order left the book."""
+        # New, cancelled and filled orders all change the margin held for orders and positions.
+        self.__invalidate_available()
+        if order['X'] == 'NEW':
+            self._order_placed = True
+        if order['X'] in OPEN_ORDER_STATUSES:
+            self._open_orders[order['i']] = {
+                'symbol': order['s'], 'orderId': order['i'], 'clientOrderId': order['c'], 'side': order['S'],
+                'type': order['o'], 'status': order['X'], 'price': float(order['p']),
+                'stopPrice': float(order['sp']), 'origQty': float(order['q']),
+            }
+            return False
+        self._open_orders.pop(order['i'], None)
+        return True
+
+    def get_balance(self, asset: str = 'USDT') -> Balance | None:
+        return self._balances.get(asset)
+
+    def get_positions(self, symbol: str) -> list[Position]:
+        with self._lock:
+            return [position for (position_symbol, _), position in self._positions.items()
+                    if position_symbol == symbol]
+
+    def get_open_orders(self, symbol: str | None = None) -> list[dict[str, Any]]:
+        with self._lock:
+            return [dict(order) for order in self._open_orders.values() if symbol is None or order['symbol'] == symbol]
+
+
+class UserDataStream:
+    """
+    Keeps an AccountState current from the futures user-data websocket.
+
+    On every (re)connect the listen key is refreshed and the state is resynced from REST, so events
+    missed while disconnected are never lost. When an order is placed the available balance is
+    re-read from REST in the background. Refreshes are coalesced: one is in flight at a time, and
+    another only follows it if a further order was placed meanwhile.
+    """
+
+    def __init__(self, client: 'Client', state: AccountState, url: str = StreamConstants.FUTURES_WS_URL.value,
+                 keepalive_interval: float = StreamConstants.LISTEN_KEY_KEEPALIVE_SECONDS.value,
+                 reconnect_delay: float = StreamConstants.RECONNECT_DELAY_SECONDS.value):
+        self.client = client
+        self.state = state
+        self.url = url
+        self.keepalive_interval = keepalive_interval
+        self.reconnect_delay = reconnect_delay
+        self.connected = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self._refresh: asyncio.Task | None = None
+
+    def start(self) -> asyncio.Task:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run(), name='user-data-stream')
+        return self._task
+
+    async def stop(self) -> None:
+        if self._refresh:
+            self._refresh.cancel()
+            self._refresh = None
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.state.invalidate()
+
+    async def run(self) -> None:
+        while True:
+            try:
+                await self._run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("User data stream disconnected: %s", e)
+            self.connected.clear()
+            self.state.invalidate()
+            await asyncio.sleep(self.reconnect_delay)
+
+    async def _run_once(self) -> None:
+        listen_key = await run_blocking(self.client.futures_stream_get_listen_key)
+        async with websockets.connect(f"{self.url}/{listen_key}") as websocket:
+            # Resync only once connected, so no event can fall between the snapshot and the stream.
+            await run_blocking(self.state.resync, self.client)
+            self.connected.set()
+            keepalive = asyncio.create_task(self._keepalive(listen_key))
+            try:
+                async for raw in websocket:
+                    event = json.loads(raw)
+                    self.state.apply(event)
+                    if event.get('e') == 'listenKeyExpired':
+                        return
+                    if self.state.margin_wanted and (self._refresh is None or self._refresh.done()):
+                        self._refresh = asyncio.create_task(self._refresh_available(), name='available-refresh')
+            finally:
+                keepalive.cancel()
+
+    async def _refresh_available(self) -> None:
+        try:
+            while self.state.synced and self.state.margin_wanted:
+                await run_blocking(self.state.refresh_available, self.client)
+        except Exception as e:
+            logger.error("Failed to refresh the available balance: %s", e)
+
+    async def _keepalive(self, listen_key: str) -> None:
+        while True:
+            await asyncio.sleep(self.keepalive_interval)
+            try:
+                await run_blocking(self.client.futures_stream_keepalive, listen_key)
+            except Exception as e:
+                logger.error("Failed to keep listen key alive: %s", e)
@@ -0,0 +1,65 @@
+import logging
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any
+
+from variables.constants import CancelConstants
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class CancelResult:
+    """
+    What a cancel-all for one symbol actually cancelled.
+    """
+    symbol: str
+    cancelled: list[int] = field(default_factory=list)
+    failed: dict[int, str] = field(default_factory=dict)
+    error: str | None = None
+    requests: int = 0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and not self.failed
+
+    def record(self, response: dict[str, Any], order_id: int | None = None) -> None:
+        """
+        Record one entry of a cancel response, which is either an order or a `{'code', 'msg'}` error.
+        """
+        if 'orderReports' in response:
+            # Spot cancel-all reports OCO lists as one entry carrying its member orders.
+            for report in response['orderReports']:
+                self.record(report)
+        elif 'orderId' in response:
+            self.cancelled.append(response['orderId'])
+        else:
+            self.failed[order_id if order_id is not None else -1] = response.get('msg', str(response))
+
+
+def chunked(items: list[Any], size: int) -> list[list[Any]]:
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def cancel_concurrently(cancel: Callable[[int], dict[str, Any]], order_ids: list[int], result: CancelResult,
+                        max_workers: int = CancelConstants.MAX_CONCURRENT_CANCELS.value) -> CancelResult:
+    """
+    Cancel orders one request each, with at most `max_workers` requests in flight.
+    """
+    if not order_ids:
+        return result
+
+    def cancel_one(order_id: int) -> tuple[int, dict[str, Any]]:
+        try:
+            return order_id, cancel(order_id)
+        except Exception as e:
+            return order_id, {'msg': str(e)}
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(order_ids)), thread_name_prefix='cancel') as executor:
+        for order_id, response in executor.map(cancel_one, order_ids):
+            result.requests += 1
+            result.record(response, order_id)
+    if result.failed:
+        logger.error("Failed to cancel %s orders for %s: %s", len(result.failed), result.symbol, result.failed)
+    return result
@@ -0,0 +1,46 @@
+import asyncio
+import contextvars
+import functools
+import os
+import threading
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, TypeVar
+
+from variables.constants import EnvVariables, ExecutorConstants
+
+T = TypeVar('T')
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """
+    Return the bounded thread pool that runs blocking exchange calls.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            max_workers = int(os.getenv(EnvVariables.EXCHANGE_MAX_WORKERS.value) or ExecutorConstants.MAX_WORKERS.value)
+            _executor = ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix=ExecutorConstants.THREAD_NAME_PREFIX.value)
+        return _executor
+
+
+def shutdown_executor() -> None:
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+
+async def run_blocking(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Run a blocking call on the exchange executor without blocking the event loop. The call sees the
+    caller's context variables, so its log records carry the signal they belong to.
+    """
+    loop = asyncio.get_running_loop()
+    call = functools.partial(contextvars.copy_context().run, func, *args, **kwargs)
+    return await loop.run_in_executor(get_executor(), call)
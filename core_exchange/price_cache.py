@@ -0,0 +1,246 @@
+import asyncio
+import itertools
+import json
+import logging
+import math
+import time
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import websockets
+
+from variables.constants import PriceCacheConstants, StreamConstants
+
+logger = logging.getLogger(__name__)
+NAN = float('nan')
+
+
+@dataclass(slots=True)
+class Quote:
+    symbol: str
+    bid: float
+    ask: float
+    mark: float
+    updated_at: float
+
+    @property
+    def mid(self) -> float:
+        return (self.bid + self.ask) / 2
+
+
+class PriceCache:
+    """
+    Best bid/ask and mark price per symbol, stored in flat `array('d')` columns indexed by a slot per symbol.
+
+    There is a single writer, the price stream on the event loop. Readers on executor threads only do a
+    dict lookup and a few array reads, so no lock is taken. A value that has never been received reads as NaN.
+    """
+
+    def __init__(self, capacity: int = PriceCacheConstants.CAPACITY.value, clock=time.monotonic):
+        self.capacity = capacity
+        self._clock = clock
+        self._slots: dict[str, int] = {}
+        self._free = list(range(capacity - 1, -1, -1))
+        self._bid = array('d', [NAN]) * capacity
+        self._ask = array('d', [NAN]) * capacity
+        self._mark = array('d', [NAN]) * capacity
+        self._updated = array('d', [0.0]) * capacity
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._slots
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __slot(self, symbol: str) -> int | None:
+        slot = self._slots.get(symbol)
+        if slot is None and self._free:
+            slot = self._free.pop()
+            self._bid[slot] = self._ask[slot] = self._mark[slot] = NAN
+            self._updated[slot] = 0.0
+            self._slots[symbol] = slot
+        return slot
+
+    def remove(self, symbol: str) -> None:
+        slot = self._slots.pop(symbol, None)
+        if slot is not None:
+            self._free.append(slot)
+
+    def update_book(self, symbol: str, bid: float, ask: float) -> None:
+        slot = self.__slot(symbol)
+        if slot is not None:
+            self._bid[slot] = bid
+            self._ask[slot] = ask
+            self._updated[slot] = self._clock()
+
+    def update_mark(self, symbol: str, mark: float) -> None:
+        slot = self.__slot(symbol)
+        if slot is not None:
+            self._mark[slot] = mark
+            self._updated[slot] = self._clock()
+
+    def quote(self, symbol: str) -> Quote | None:
+        slot = self._slots.get(symbol)
+        if slot is None or not self._updated[slot]:
+            return None
+        return Quote(symbol, self._bid[slot], self._ask[slot], self._mark[slot], self._updated[slot])
+
+    def price(self, symbol: str, max_age: float = PriceCacheConstants.MAX_AGE_SECONDS.value) -> float | None:
+        """
+        The mark price, or the book mid when no mark is known, if it is at most `max_age` seconds old.
+        """
+        slot = self._slots.get(symbol)
+        if slot is None or self._clock() - self._updated[slot] > max_age:
+            return None
+        mark = self._mark[slot]
+        if not math.isnan(mark):
+            return mark
+        mid = (self._bid[slot] + self._ask[slot]) / 2
+        return None if math.isnan(mid) else mid
+
+
+def bracket_violation(side: str, price: float, stop_loss: float | None, target: float | None) -> str | None:
+    """
+    Explain why a bracket no longer makes sense at `price`, or return None if it still does.
+    """
+    long = side in ('LONG', 'BUY')
+    if stop_loss is not None and (price <= stop_loss if long else price >= stop_loss):
+        return f"price {price} is already through the stop loss {stop_loss}"
+    if target is not None and (price >= target if long else price <= target):
+        return f"price {price} is already past the target {target}"
+    return None
+
+
+class PriceStream:
+    """
+    Keeps a PriceCache current from a Binance combined websocket stream.
+
+    Symbols are subscribed on demand with `track`. Pinned symbols, those with open signals, stay
+    subscribed until released; at most `max_pinned` of them, further ones are only tracked as recent.
+    The others form a most-recently-seen set of `max_recent` symbols, and the oldest is unsubscribed and
+    dropped from the cache when a new one arrives.
+    """
+
+    def __init__(self, cache: PriceCache, url: str = StreamConstants.FUTURES_COMBINED_WS_URL.value,
+                 channels: tuple[str, ...] = ('bookTicker', 'markPrice@1s'),
+                 max_recent: int = PriceCacheConstants.MAX_RECENT_SYMBOLS.value,
+                 max_pinned: int = PriceCacheConstants.MAX_PINNED_SYMBOLS.value,
+                 reconnect_delay: float = StreamConstants.RECONNECT_DELAY_SECONDS.value):
+        if max_pinned + max_recent > cache.capacity:
+            raise ValueError(f"{max_pinned} pinned and {max_recent} recent symbols do not fit in a cache "
+                             f"of {cache.capacity}")
+        self.cache = cache
+        self.url = url
+        self.channels = channels
+        self.max_recent = max_recent
+        self.max_pinned = max_pinned
+        self.reconnect_delay = reconnect_delay
+        self.connected = asyncio.Event()
+        self._pinned: set[str] = set()
+        self._recent: OrderedDict[str, None] = OrderedDict()
+        self._outbox: asyncio.Queue[dict] = asyncio.Queue()
+        self._ids = itertools.count(1)
+        self._task: asyncio.Task | None = None
+
+    @property
+    def symbols(self) -> set[str]:
+        return self._pinned | set(self._recent)
+
+    @property
+    def pinned(self) -> frozenset[str]:
+        return frozenset(self._pinned)
+
+    def streams(self, symbols) -> list[str]:
+        return [f'{symbol.lower()}@{channel}' for symbol in sorted(symbols) for channel in self.channels]
+
+    def track(self, symbol: str, pin: bool = False) -> None:
+        """
+        Make sure `symbol` is subscribed. Returns immediately; the subscription is sent by the stream task.
+        """
+        subscribed = symbol in self.symbols
+        if pin and symbol not in self._pinned and len(self._pinned) >= self.max_pinned:
+            logger.warning("Cannot pin %s, %s symbols are already pinned; tracking it as a recent one",
+                           symbol, len(self._pinned))
+            pin = False
+        if pin:
+            self._pinned.add(symbol)
+            self._recent.pop(symbol, None)
+        elif symbol not in self._pinned:
+            self._recent[symbol] = None
+            self._recent.move_to_end(symbol)
+        if not subscribed:
+            self.__request('SUBSCRIBE', [symbol])
+        while len(self._recent) > self.max_recent:
+            evicted, _ = self._recent.popitem(last=False)
+            self.__request('UNSUBSCRIBE', [evicted])
+            self.cache.remove(evicted)
+
+    def release(self, symbol: str) -> None:
+        """Unpin a symbol; it stays subscribed as a recently seen one."""
+        if symbol in self._pinned:
+            self._pinned.discard(symbol)
+            self.track(symbol)
+
+    def __request(self, method: str, symbols: list[str]) -> None:
+        if self.connected.is_set():
+            self._outbox.put_nowait({'method': method, 'params': self.streams(symbols), 'id': next(self._ids)})
+
+    def start(self) -> asyncio.Task:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run(), name='price-stream')
+        return self._task
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def run(self) -> None:
+        while True:
+            try:
+                await self._run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Price stream disconnected: %s", e)
+            self.connected.clear()
+            await asyncio.sleep(self.reconnect_delay)
+
+    async def _run_once(self) -> None:
+        async with websockets.connect(self.url) as websocket:
+            # Anything queued for the previous connection is superseded by a full resubscribe.
+            self._outbox = asyncio.Queue()
+            self.connected.set()
+            if self.symbols:
+                await websocket.send(json.dumps(
+                    {'method': 'SUBSCRIBE', 'params': self.streams(self.symbols), 'id': next(self._ids)}))
+            sender = asyncio.create_task(self._send_requests(websocket))
+            try:
+                async for raw in websocket:
+                    self.apply(json.loads(raw))
+            finally:
+                sender.cancel()
+
+    async def _send_requests(self, websocket) -> None:
+        while True:
+            await websocket.send(json.dumps(await self._outbox.get()))
+
+    def apply(self, message: dict) -> None:
+        """
+        Apply one combined-stream message; subscription acknowledgements are ignored.
+        """
+        data = message.get('data')
+        # Updates can still arrive for a symbol just unsubscribed; they must not re-occupy its slot.
+        if not data or (data.get('s') not in self._pinned and data.get('s') not in self._recent):
+            return
+        event = data.get('e')
+        if event == 'markPriceUpdate':
+            self.cache.update_mark(data['s'], float(data['p']))
+        elif event == 'bookTicker' or ('b' in data and 'a' in data):
+            # Spot bookTicker payloads carry no event type.
+            self.cache.update_book(data['s'], float(data['b']), float(data['a']))
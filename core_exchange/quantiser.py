@@ -0,0 +1,86 @@
+from dataclasses import dataclass
+from decimal import ROUND_FLOOR, ROUND_HALF_UP, Decimal
+
+ZERO = Decimal(0)
+ONE = Decimal(1)
+
+
+def to_decimal(value: Decimal | float | str) -> Decimal:
+    """
+    Exact Decimal of a price or quantity. Floats go through their shortest repr, so 0.1 becomes
+    Decimal('0.1') rather than the binary approximation Decimal(0.1) would give.
+    """
+    return value if isinstance(value, Decimal) else Decimal(str(value))
+
+
+def decimal_places(value: Decimal) -> int:
+    """
+    Number of decimal places needed to represent a filter increment such as '0.00100000'.
+    """
+    return max(0, -value.normalize().as_tuple().exponent) if value else 0
+
+
+@dataclass(frozen=True, slots=True)
+class Grid:
+    """
+    One increment of a symbol, e.g. its tick size, with what rounding onto it needs worked out up front.
+
+    Increments that are a power of ten, which is almost all of them, round with a single `quantize`;
+    others, such as a 0.5 tick, go through the quotient.
+    """
+    increment: Decimal
+    quantum: Decimal
+    precision: int
+    power_of_ten: bool
+
+    @classmethod
+    def of(cls, increment: Decimal) -> 'Grid':
+        increment = increment.normalize() if increment else ZERO
+        precision = decimal_places(increment)
+        quantum = ONE.scaleb(-precision)
+        return cls(increment, quantum, precision, increment == quantum)
+
+    def round(self, value: Decimal, rounding: str = ROUND_FLOOR) -> Decimal:
+        if not self.increment:
+            return value
+        if self.power_of_ten:
+            return value.quantize(self.quantum, rounding)
+        return ((value / self.increment).to_integral_value(rounding) * self.increment).quantize(self.quantum)
+
+    @staticmethod
+    def format(value: Decimal) -> str:
+        """The value as sent to the exchange: fixed point, without trailing zeros."""
+        text = str(value)
+        if 'E' in text:
+            # Very small or very large values print in scientific notation.
+            return format(value.normalize(), 'f')
+        return text.rstrip('0').rstrip('.') if '.' in text else text
+
+
+@dataclass(frozen=True, slots=True)
+class Quantiser:
+    """
+    Rounds and formats the prices and quantities of one symbol, built once from its exchange filters.
+    """
+    price: Grid
+    quantity: Grid
+    market_quantity: Grid
+
+    @classmethod
+    def from_increments(cls, tick_size: Decimal, step_size: Decimal, market_step_size: Decimal) -> 'Quantiser':
+        quantity = Grid.of(step_size)
+        return cls(Grid.of(tick_size), quantity,
+                   quantity if market_step_size == step_size else Grid.of(market_step_size))
+
+    def round_price(self, price: Decimal | float | str, rounding: str = ROUND_HALF_UP) -> Decimal:
+        return self.price.round(to_decimal(price), rounding)
+
+    def round_quantity(self, quantity: Decimal | float | str, rounding: str = ROUND_FLOOR,
+                       market: bool = False) -> Decimal:
+        return (self.market_quantity if market else self.quantity).round(to_decimal(quantity), rounding)
+
+    def format_price(self, price: Decimal) -> str:
+        return self.price.format(price)
+
+    def format_quantity(self, quantity: Decimal, market: bool = False) -> str:
+        return (self.market_quantity if market else self.quantity).format(quantity)
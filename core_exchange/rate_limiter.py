@@ -0,0 +1,240 @@
+import logging
+import threading
+import time
+from collections.abc import Callable
+from enum import IntEnum
+from typing import Any
+from urllib.parse import urlsplit
+
+import requests
+
+from variables.constants import RateLimitConstants
+
+logger = logging.getLogger(__name__)
+# Request weights of the endpoints the bot uses; anything else costs 1.
+FUTURES_WEIGHTS = {
+    'exchangeInfo': 1, 'account': 5, 'balance': 5, 'positionRisk': 5, 'batchOrders': 5,
+    'openOrders': 1, 'allOpenOrders': 1, 'order': 1, 'leverage': 1, 'listenKey': 1,
+}
+SPOT_WEIGHTS = {
+    'exchangeInfo': 20, 'account': 20, 'openOrders': 6, 'order': 1, 'ticker/price': 2,
+}
+# Weight of openOrders when no symbol is given.
+ALL_OPEN_ORDERS_WEIGHT = {'futures': 40, 'spot': 80}
+# Endpoints that place, amend or cancel orders. They get priority over informational calls.
+TRADING_PATHS = frozenset({
+    'order', 'batchOrders', 'openOrders', 'allOpenOrders', 'order/oco', 'orderList/oco', 'order/cancelReplace',
+})
+ORDER_COUNT_HEADERS = {'futures': 'x-mbx-order-count-1m', 'spot': 'x-mbx-order-count-10s'}
+
+
+class Priority(IntEnum):
+    ORDER = 0
+    INFO = 1
+
+
+class TokenBucket:
+    """
+    Bucket of `capacity` tokens refilled evenly over `period` seconds.
+    """
+
+    def __init__(self, capacity: float, period: float, clock: Callable[[], float] = time.monotonic):
+        self.capacity = capacity
+        self.rate = capacity / period
+        self.tokens = float(capacity)
+        self._clock = clock
+        self._updated = clock()
+
+    def refill(self) -> None:
+        now = self._clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    @property
+    def used(self) -> float:
+        self.refill()
+        return self.capacity - self.tokens
+
+    def sync_used(self, used: float) -> None:
+        """
+        Trust the exchange's count when it reports more usage than we accounted for.
+        """
+        self.refill()
+        self.tokens = min(self.tokens, self.capacity - used)
+
+    def wait_time(self, amount: float, reserve: float = 0.0) -> float:
+        """
+        Seconds until `amount` tokens can be taken while leaving `reserve` tokens in the bucket.
+        """
+        self.refill()
+        missing = amount + reserve - self.tokens
+        return max(0.0, missing / self.rate)
+
+    def take(self, amount: float) -> None:
+        self.refill()
+        self.tokens -= amount
+
+
+class RateLimitGovernor:
+    """
+    Client-side accounting of Binance request weight and order counts, shared by every client.
+
+    Informational calls may only use the bucket up to `info_headroom`, so order placement always
+    has budget left. Buckets are re-synced from the X-MBX-USED-WEIGHT / X-MBX-ORDER-COUNT headers and
+    a 429/418 response pauses all traffic for the Retry-After period.
+
+    Request weight is counted per IP but order counts per account, so the governor of each extra
+    account (see `for_account`) has its own order buckets and shares the weight buckets, lock and
+    pauses of the `ip` governor.
+
+    When several processes trade from the same IP and accounts, each gets a governor with a `share`
+    of every limit. The usage the headers report is the total of all processes, so it is scaled by
+    the same share: each process keeps its share of what is left.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic,
+                 info_headroom: float = RateLimitConstants.INFO_HEADROOM.value,
+                 ip: 'RateLimitGovernor | None' = None, share: float = 1.0):
+        self._clock = clock
+        self.info_headroom = info_headroom
+        self.share = share
+        self.ip = ip or self
+        self.weights = ip.weights if ip else {
+            'futures': TokenBucket(RateLimitConstants.FUTURES_WEIGHT_PER_MINUTE.value * share, 60, clock),
+            'spot': TokenBucket(RateLimitConstants.SPOT_WEIGHT_PER_MINUTE.value * share, 60, clock),
+        }
+        self.orders = {
+            'futures': TokenBucket(RateLimitConstants.FUTURES_ORDERS_PER_MINUTE.value * share, 60, clock),
+            'spot': TokenBucket(RateLimitConstants.SPOT_ORDERS_PER_10S.value * share, 10, clock),
+        }
+        self.banned_until = 0.0
+        self.throttled_seconds = 0.0
+        self._condition = ip._condition if ip else threading.Condition()
+
+    def for_account(self) -> 'RateLimitGovernor':
+        """
+        A governor for another account behind the same IP.
+        """
+        return RateLimitGovernor(self._clock, self.info_headroom, ip=self, share=self.share)
+
+    @staticmethod
+    def classify(method: str, url: str, params: Any = None) -> tuple[str, int, Priority, bool]:
+        """
+        Return (market, weight, priority, places_order) for a request.
+        """
+        method = method.upper()
+        path = urlsplit(url).path
+        market = 'futures' if path.startswith('/fapi/') else 'spot'
+        endpoint = path.split('/', 3)[-1]
+        weight = (FUTURES_WEIGHTS if market == 'futures' else SPOT_WEIGHTS).get(endpoint, 1)
+        if endpoint == 'openOrders' and method == 'GET' and 'symbol=' not in str(params or ''):
+            weight = ALL_OPEN_ORDERS_WEIGHT[market]
+        elif endpoint == 'openOrders' and method == 'DELETE':
+            weight = 1
+        trading = endpoint in TRADING_PATHS and method != 'GET'
+        places_order = trading and method == 'POST'
+        return market, weight, Priority.ORDER if trading else Priority.INFO, places_order
+
+    def wait_time(self, market: str, weight: int, priority: Priority, places_order: bool = False) -> float:
+        bucket = self.weights[market]
+        reserve = 0.0 if priority is Priority.ORDER else bucket.capacity * (1 - self.info_headroom)
+        wait = max(0.0, self.ip.banned_until - self._clock(), bucket.wait_time(weight, reserve))
+        if places_order:
+            wait = max(wait, self.orders[market].wait_time(1))
+        return wait
+
+    def acquire(self, market: str, weight: int, priority: Priority, places_order: bool = False) -> float:
+        """
+        Block until the request fits the budget, then charge it. Returns the seconds spent waiting.
+        """
+        started = self._clock()
+        throttled = False
+        with self._condition:
+            while True:
+                wait = self.wait_time(market, weight, priority, places_order)
+                if wait <= 0:
+                    break
+                throttled = True
+                self._condition.wait(wait)
+            self.weights[market].take(weight)
+            if places_order:
+                self.orders[market].take(1)
+            waited = self._clock() - started if throttled else 0.0
+            self.throttled_seconds += waited
+        if throttled:
+            logger.warning("Throttled %s request for %.2fs to stay under the rate limit", market, waited)
+        return waited
+
+    def observe(self, market: str, status_code: int, headers: Any) -> None:
+        """
+        Re-sync the buckets from the rate-limit headers of a response.
+        """
+        with self._condition:
+            used_weight = headers.get('x-mbx-used-weight-1m')
+            if used_weight is not None:
+                self.weights[market].sync_used(float(used_weight) * self.share)
+            order_count = headers.get(ORDER_COUNT_HEADERS[market])
+            if order_count is not None:
+                self.orders[market].sync_used(float(order_count) * self.share)
+            if status_code in (418, 429):
+                retry_after = float(headers.get('retry-after') or RateLimitConstants.DEFAULT_RETRY_AFTER_SECONDS.value)
+                self.ip.banned_until = max(self.ip.banned_until, self._clock() + retry_after)
+                logger.error("Binance returned %s, pausing %s requests for %ss", status_code, market, retry_after)
+            self._condition.notify_all()
+
+    def utilisation(self) -> dict[str, dict[str, float]]:
+        """
+        Current share of each budget in use, between 0 and 1.
+        """
+        with self._condition:
+            return {
+                market: {
+                    'weight': self.weights[market].used / self.weights[market].capacity,
+                    'orders': self.orders[market].used / self.orders[market].capacity,
+                    'banned_for': max(0.0, self.ip.banned_until - self._clock()),
+                }
+                for market in self.weights
+            }
+
+
+class GovernedSession(requests.Session):
+    """
+    requests session that charges every call against a RateLimitGovernor before sending it.
+    """
+
+    def __init__(self, governor: RateLimitGovernor):
+        super().__init__()
+        self.governor = governor
+
+    def request(self, method: str, url: str, *args: Any, **kwargs: Any) -> requests.Response:
+        market, weight, priority, places_order = self.governor.classify(method, url, kwargs.get('params'))
+        self.governor.acquire(market, weight, priority, places_order)
+        response = super().request(method, url, *args, **kwargs)
+        self.governor.observe(market, response.status_code, response.headers)
+        return response
+
+
+_governor: RateLimitGovernor | None = None
+_governor_lock = threading.Lock()
+
+
+def get_governor() -> RateLimitGovernor:
+    """
+    Return the process-wide governor. Binance weight limits are per IP, so every client shares it.
+    """
+    global _governor
+    with _governor_lock:
+        if _governor is None:
+            _governor = RateLimitGovernor()
+        return _governor
+
+
+def configure_governor(share: float) -> RateLimitGovernor:
+    """
+    Make the process-wide governor one allowed `share` of every limit, e.g. 1/N in each of N
+    signal executor processes. Call it before any client is built.
+    """
+    global _governor
+    with _governor_lock:
+        _governor = RateLimitGovernor(share=share)
+        return _governor
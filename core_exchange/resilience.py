@@ -0,0 +1,232 @@
+import logging
+import random
+import threading
+import time
+import uuid
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, Executor, wait
+from enum import Enum
+from typing import Any, TypeVar
+
+import requests
+
+from core_metrics.metrics import CIRCUIT_REJECTIONS_TOTAL, EXCHANGE_RETRIES_TOTAL, HEDGED_REQUESTS_TOTAL
+from variables.constants import ResilienceConstants
+
+logger = logging.getLogger(__name__)
+T = TypeVar('T')
+
+# Binance error codes after which the request is known not to have been executed and may be resent.
+TRANSIENT_CODES = frozenset({-1021})
+# Binance error codes whose execution status is unknown: the order may or may not exist.
+UNKNOWN_CODES = frozenset({-1001, -1006, -1007})
+RATE_LIMIT_CODES = frozenset({-1003, -1015})
+
+
+class ErrorKind(Enum):
+    TRANSIENT = 'transient'
+    UNKNOWN = 'unknown'
+    RATE_LIMITED = 'rate_limited'
+    PERMANENT = 'permanent'
+
+
+class CircuitOpenError(Exception):
+    """
+    Raised instead of calling an endpoint whose circuit breaker is open.
+    """
+
+    def __init__(self, endpoint: str, retry_in: float):
+        super().__init__(f"Circuit for {endpoint} is open, retry in {retry_in:.1f}s")
+        self.endpoint = endpoint
+        self.retry_in = retry_in
+
+
+def classify(error: BaseException) -> ErrorKind:
+    """
+    Classify a failed exchange call by whether it is safe, or at least sensible, to send it again.
+
+    TRANSIENT requests never took effect. UNKNOWN ones may have: the connection broke or the exchange
+    timed out after the request was sent, so they are only safe to resend because every request is
+    idempotent. PERMANENT errors are the exchange rejecting the request itself and are never retried.
+    """
+    # Imported here: binance.exceptions loads all of python-binance, which startup defers.
+    from binance.exceptions import BinanceAPIException, BinanceRequestException
+
+    if isinstance(error, BinanceAPIException):
+        if error.status_code in (418, 429) or error.code in RATE_LIMIT_CODES:
+            return ErrorKind.RATE_LIMITED
+        if error.code in TRANSIENT_CODES:
+            return ErrorKind.TRANSIENT
+        if error.status_code >= 500 or error.code in UNKNOWN_CODES:
+            return ErrorKind.UNKNOWN
+        return ErrorKind.PERMANENT
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return ErrorKind.TRANSIENT
+    if isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout,
+                          BinanceRequestException)):
+        return ErrorKind.UNKNOWN
+    return ErrorKind.PERMANENT
+
+
+def is_duplicate_order(error: BaseException | str) -> bool:
+    """
+    Whether the exchange refused an order because its client order ID was already used, i.e. an
+    earlier attempt of the same order went through.
+    """
+    from binance.exceptions import BinanceAPIException
+
+    message = error.message if isinstance(error, BinanceAPIException) else str(error)
+    return 'duplicate' in message.lower()
+
+
+def new_client_order_id() -> str:
+    """
+    A fresh newClientOrderId. Every attempt of the same order reuses it, so the exchange accepts it at most once.
+    """
+    return uuid.uuid4().hex
+
+
+class CircuitBreaker:
+    """
+    Fails calls to an endpoint fast after `threshold` consecutive failures, for `reset_seconds`.
+
+    Once the period is over a single trial call is let through: success closes the circuit again,
+    failure re-opens it for another period.
+    """
+
+    def __init__(self, endpoint: str, threshold: int = ResilienceConstants.BREAKER_THRESHOLD.value,
+                 reset_seconds: float = ResilienceConstants.BREAKER_RESET_SECONDS.value,
+                 clock: Callable[[], float] = time.monotonic):
+        self.endpoint = endpoint
+        self.threshold = threshold
+        self.reset_seconds = reset_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.failures = 0
+        self.opened_at: float | None = None
+        self._trial = False
+
+    @property
+    def is_open(self) -> bool:
+        return self.opened_at is not None
+
+    def allow(self) -> None:
+        """
+        Raise CircuitOpenError unless a call may go through now.
+        """
+        with self._lock:
+            if self.opened_at is None:
+                return
+            retry_in = self.opened_at + self.reset_seconds - self._clock()
+            if retry_in > 0 or self._trial:
+                CIRCUIT_REJECTIONS_TOTAL.inc(endpoint=self.endpoint)
+                raise CircuitOpenError(self.endpoint, max(0.0, retry_in))
+            self._trial = True
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self.opened_at is not None:
+                logger.info("Circuit for %s closed", self.endpoint)
+            self.failures = 0
+            self.opened_at = None
+            self._trial = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self._trial or (self.opened_at is None and self.failures >= self.threshold):
+                self.opened_at = self._clock()
+                logger.error("Circuit for %s opened after %s failures", self.endpoint, self.failures)
+            self._trial = False
+
+
+class ResilientCaller:
+    """
+    Calls exchange endpoints with jittered retries and a circuit breaker per endpoint.
+
+    Every attempt re-runs the client call, so signed requests get a fresh timestamp. Requests whose
+    outcome is unknown are retried too, so callers must only pass idempotent ones: every order carries
+    a newClientOrderId, and a resend of one that went through is rejected as a duplicate.
+    """
+
+    def __init__(self, attempts: int = ResilienceConstants.RETRY_ATTEMPTS.value,
+                 base_delay: float = ResilienceConstants.RETRY_BASE_DELAY_SECONDS.value,
+                 max_delay: float = ResilienceConstants.RETRY_MAX_DELAY_SECONDS.value,
+                 clock: Callable[[], float] = time.monotonic, sleep: Callable[[float], None] = time.sleep,
+                 rng: random.Random | None = None):
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._clock = clock
+        self._sleep = sleep
+        self._random = rng or random.Random()
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def breaker(self, endpoint: str) -> CircuitBreaker:
+        with self._lock:
+            if endpoint not in self._breakers:
+                self._breakers[endpoint] = CircuitBreaker(endpoint, clock=self._clock)
+            return self._breakers[endpoint]
+
+    def delay(self, attempt: int) -> float:
+        """Full-jitter exponential backoff before retry number `attempt`, starting at 1."""
+        return self._random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+    def call(self, endpoint: str, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Call `func`, retrying failures that are safe to retry. The last error is raised once attempts run out.
+        """
+        breaker = self.breaker(endpoint)
+        for attempt in range(1, self.attempts + 1):
+            breaker.allow()
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                kind = classify(e)
+                if kind is ErrorKind.PERMANENT:
+                    # The endpoint answered; the request itself was wrong.
+                    breaker.record_success()
+                    raise
+                if kind is not ErrorKind.RATE_LIMITED:
+                    # Rate limits are the governor's business; the endpoint itself is healthy.
+                    breaker.record_failure()
+                if attempt == self.attempts:
+                    raise
+                EXCHANGE_RETRIES_TOTAL.inc(endpoint=endpoint, kind=kind.value)
+                delay = self.delay(attempt)
+                logger.warning("%s failed (%s: %s), retry %s in %.0fms", endpoint, kind.value, e, attempt, delay * 1000)
+                self._sleep(delay)
+                continue
+            breaker.record_success()
+            return result
+        raise AssertionError('unreachable')
+
+    def hedged(self, endpoint: str, func: Callable[..., T], *args: Any, executor: Executor,
+               delay: float = ResilienceConstants.HEDGE_DELAY_SECONDS.value,
+               timeout: float = ResilienceConstants.HEDGE_TIMEOUT_SECONDS.value, **kwargs: Any) -> T:
+        """
+        Call `func`, and if it has not answered within `delay` seconds send it a second time; the first
+        successful answer wins. Only for idempotent requests, e.g. orders with a fixed newClientOrderId.
+
+        TimeoutError is raised if neither attempt has answered within `timeout` seconds; the attempts
+        are left to finish in the background.
+        """
+        deadline = time.monotonic() + timeout
+        primary = executor.submit(self.call, endpoint, func, *args, **kwargs)
+        done, _ = wait([primary], timeout=min(delay, timeout))
+        if done:
+            return primary.result()
+        hedge = executor.submit(self.call, endpoint, func, *args, **kwargs)
+        pending = {primary, hedge}
+        error: BaseException | None = None
+        while pending:
+            done, pending = wait(pending, timeout=max(0.0, deadline - time.monotonic()), return_when=FIRST_COMPLETED)
+            if not done:
+                raise error or TimeoutError(f"{endpoint} did not answer within {timeout}s")
+            for future in done:
+                if future.exception() is None:
+                    HEDGED_REQUESTS_TOTAL.inc(endpoint=endpoint, winner='primary' if future is primary else 'hedge')
+                    return future.result()
+                error = error or future.exception()
+        raise error
@@ -0,0 +1,195 @@
+import logging
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Any
+
+from core_exchange.quantiser import Quantiser, decimal_places
+from variables.constants import SymbolRegistryConstants
+
+logger = logging.getLogger(__name__)
+
+
+def _find_filter(filters: list[dict[str, Any]], *filter_types: str) -> dict[str, Any]:
+    return next((f for f in filters if f['filterType'] in filter_types), {})
+
+
+def _optional_decimal(values: dict[str, Any], *keys: str) -> Decimal | None:
+    value = next((values[key] for key in keys if key in values), None)
+    return Decimal(value) if value is not None else None
+
+
+@dataclass(frozen=True, slots=True)
+class SymbolFilters:
+    """
+    Exchange filters for a single symbol, parsed once from the exchange info payload.
+    """
+    symbol: str
+    tick_size: Decimal
+    min_price: Decimal
+    max_price: Decimal
+    step_size: Decimal
+    min_qty: Decimal
+    max_qty: Decimal
+    market_step_size: Decimal
+    market_min_qty: Decimal
+    market_max_qty: Decimal
+    min_notional: Decimal
+    max_notional: Decimal | None
+    bid_multiplier_up: Decimal | None
+    bid_multiplier_down: Decimal | None
+    ask_multiplier_up: Decimal | None
+    ask_multiplier_down: Decimal | None
+    price_precision: int
+    quantity_precision: int
+    quantiser: Quantiser = field(repr=False, compare=False)
+    raw: dict[str, Any] = field(repr=False, compare=False)
+
+    @classmethod
+    def from_symbol_info(cls, info: dict[str, Any]) -> 'SymbolFilters':
+        """
+        Build the filter object from a spot or futures `symbols[]` entry.
+        """
+        filters = info.get('filters', [])
+        price_filter = _find_filter(filters, 'PRICE_FILTER')
+        lot_size = _find_filter(filters, 'LOT_SIZE')
+        market_lot_size = _find_filter(filters, 'MARKET_LOT_SIZE') or lot_size
+        # Spot uses NOTIONAL/minNotional, futures uses MIN_NOTIONAL/notional.
+        notional = _find_filter(filters, 'NOTIONAL', 'MIN_NOTIONAL')
+        min_notional = notional.get('minNotional', notional.get('notional', '0'))
+        max_notional = notional.get('maxNotional')
+        # Futures and older spot symbols bound both sides alike; PERCENT_PRICE_BY_SIDE splits them.
+        percent_price = _find_filter(filters, 'PERCENT_PRICE', 'PERCENT_PRICE_BY_SIDE')
+
+        tick_size = Decimal(price_filter.get('tickSize', '0'))
+        step_size = Decimal(lot_size.get('stepSize', '0'))
+        market_step_size = Decimal(market_lot_size.get('stepSize', '0')) or step_size
+        return cls(
+            symbol=info['symbol'],
+            tick_size=tick_size,
+            min_price=Decimal(price_filter.get('minPrice', '0')),
+            max_price=Decimal(price_filter.get('maxPrice', '0')),
+            step_size=step_size,
+            min_qty=Decimal(lot_size.get('minQty', '0')),
+            max_qty=Decimal(lot_size.get('maxQty', '0')),
+            market_step_size=market_step_size,
+            market_min_qty=Decimal(market_lot_size.get('minQty', '0')),
+            market_max_qty=Decimal(market_lot_size.get('maxQty', '0')),
+            min_notional=Decimal(min_notional),
+            max_notional=Decimal(max_notional) if max_notional is not None else None,
+            bid_multiplier_up=_optional_decimal(percent_price, 'bidMultiplierUp', 'multiplierUp'),
+            bid_multiplier_down=_optional_decimal(percent_price, 'bidMultiplierDown', 'multiplierDown'),
+            ask_multiplier_up=_optional_decimal(percent_price, 'askMultiplierUp', 'multiplierUp'),
+            ask_multiplier_down=_optional_decimal(percent_price, 'askMultiplierDown', 'multiplierDown'),
+            price_precision=decimal_places(tick_size),
+            quantity_precision=decimal_places(step_size),
+            quantiser=Quantiser.from_increments(tick_size, step_size, market_step_size),
+            raw=info,
+        )
+
+
+class SymbolRegistry:
+    """
+    In-process cache of exchange info, indexed by symbol and refreshed on a TTL.
+
+    `loader` is the client call that returns the full exchange info payload, e.g.
+    `Client.futures_exchange_info` or `Client.get_exchange_info`.
+    """
+
+    def __init__(self, loader: Callable[[], dict[str, Any]],
+                 ttl: float = SymbolRegistryConstants.TTL_SECONDS.value):
+        self._loader = loader
+        self._ttl = ttl
+        self._symbols: dict[str, SymbolFilters] = {}
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+        self._refresh_thread: threading.Thread | None = None
+        self._stop_event = threading.Event()
+        self._background_thread: threading.Thread | None = None
+
+    @property
+    def age(self) -> float:
+        """Seconds since the last successful load."""
+        return time.monotonic() - self._loaded_at if self._loaded_at else float('inf')
+
+    @property
+    def is_stale(self) -> bool:
+        return self.age > self._ttl
+
+    def __len__(self) -> int:
+        return len(self._symbols)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._symbols
+
+    def refresh(self) -> bool:
+        """
+        Download exchange info and swap in a freshly built index. Keeps the old index on failure.
+        """
+        with self._lock:
+            try:
+                info = self._loader()
+                symbols = {}
+                for item in info['symbols']:
+                    symbols[item['symbol']] = SymbolFilters.from_symbol_info(item)
+            except Exception as e:
+                logger.error("Error refreshing exchange info: %s", e)
+                return False
+            self._symbols = symbols
+            self._loaded_at = time.monotonic()
+        logger.info("Loaded exchange info for %s symbols", len(symbols))
+        return True
+
+    def get(self, symbol: str) -> SymbolFilters | None:
+        """
+        Return the cached filters for `symbol`, loading or refreshing the index as needed.
+        """
+        if not self._symbols:
+            self.refresh()
+        elif self.is_stale:
+            self._refresh_in_background()
+
+        filters = self._symbols.get(symbol)
+        if filters is None and self.age > SymbolRegistryConstants.MISSING_SYMBOL_REFRESH_SECONDS.value:
+            # The symbol may have been listed after the last load.
+            self.refresh()
+            filters = self._symbols.get(symbol)
+        return filters
+
+    def get_symbol_info(self, symbol: str) -> dict[str, Any] | None:
+        """
+        Return the raw exchange info entry for `symbol`.
+        """
+        filters = self.get(symbol)
+        return filters.raw if filters else None
+
+    def start(self) -> None:
+        """
+        Start a daemon thread that reloads exchange info every TTL.
+        """
+        if self._background_thread and self._background_thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._background_thread = threading.Thread(
+            target=self._refresh_loop, name='symbol-registry', daemon=True)
+        self._background_thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        if self._background_thread:
+            self._background_thread.join(timeout=1)
+            self._background_thread = None
+
+    def _refresh_loop(self) -> None:
+        if self.is_stale:
+            self.refresh()
+        while not self._stop_event.wait(self._ttl):
+            self.refresh()
+
+    def _refresh_in_background(self) -> None:
+        if self._refresh_thread and self._refresh_thread.is_alive():
+            return
+        self._refresh_thread = threading.Thread(target=self.refresh, name='symbol-registry-refresh', daemon=True)
+        self._refresh_thread.start()
@@ -0,0 +1,123 @@
+import asyncio
+import logging
+import os
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+import requests
+from binance.client import BaseClient, Client
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+
+from core_exchange.executor import run_blocking
+from core_exchange.rate_limiter import GovernedSession, RateLimitGovernor, get_governor
+from variables.constants import EnvVariables, TransportConstants
+from variables.environment import load_environment
+
+logger = logging.getLogger(__name__)
+_shared_client: Client | None = None
+_shared_client_lock = threading.Lock()
+
+
+def get_pool_size() -> int:
+    load_environment()
+    return int(os.getenv(EnvVariables.BINANCE_HTTP_POOL_SIZE.value) or TransportConstants.POOL_SIZE.value)
+
+
+class KeepAliveAdapter(HTTPAdapter):
+    """
+    HTTPAdapter whose sockets have TCP keep-alive enabled, so idle pooled connections survive NAT timeouts.
+    """
+
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        kwargs['socket_options'] = HTTPConnection.default_socket_options + [
+            (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+        super().init_poolmanager(*args, **kwargs)
+
+
+def build_adapter(pool_size: int) -> KeepAliveAdapter:
+    return KeepAliveAdapter(pool_connections=TransportConstants.HOST_POOLS.value, pool_maxsize=pool_size,
+                            max_retries=0)
+
+
+def build_session(pool_size: int, headers: dict[str, str] | None = None,
+                  governor: RateLimitGovernor | None = None, adapter: HTTPAdapter | None = None) -> requests.Session:
+    """
+    Build a requests session with a pool of `pool_size` keep-alive connections per host.
+    With a `governor`, every request is charged against the shared rate-limit budget. Sessions given
+    the same `adapter` share its connection pool, e.g. the sessions of several accounts.
+    """
+    session = GovernedSession(governor) if governor else requests.Session()
+    adapter = adapter or build_adapter(pool_size)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update({'Connection': 'keep-alive'})
+    if headers:
+        session.headers.update(headers)
+    return session
+
+
+class PooledClient(Client):
+    """
+    python-binance Client using a tuned, pooled keep-alive session governed by the shared rate limiter.
+
+    Every request has a connect and a read timeout, so a stalled connection fails as a timeout the
+    resilient caller can retry instead of blocking its thread forever.
+    """
+
+    def __init__(self, api_key: str | None = None, api_secret: str | None = None, pool_size: int | None = None,
+                 governor: RateLimitGovernor | None = None, adapter: HTTPAdapter | None = None, ping: bool = True,
+                 **kwargs: Any):
+        kwargs['requests_params'] = {'timeout': (TransportConstants.CONNECT_TIMEOUT_SECONDS.value,
+                                                 TransportConstants.READ_TIMEOUT_SECONDS.value),
+                                     **(kwargs.get('requests_params') or {})}
+        self.pool_size = pool_size or get_pool_size()
+        self.governor = governor or get_governor()
+        self.adapter = adapter
+        if ping:
+            super().__init__(api_key, api_secret, **kwargs)
+        else:
+            # Client.__init__ only adds a blocking ping to BaseClient.__init__; skipping it makes
+            # construction network-free, and the connections are warmed up later by `warm_up`.
+            BaseClient.__init__(self, api_key, api_secret, **kwargs)
+
+    def _init_session(self) -> requests.Session:
+        return build_session(self.pool_size, self._get_headers(), self.governor, self.adapter)
+
+
+def get_shared_client() -> Client:
+    """
+    Return the process-wide Binance client shared by FutureClient and SpotClient.
+    """
+    global _shared_client
+    with _shared_client_lock:
+        if _shared_client is None:
+            load_environment()
+            _shared_client = PooledClient(os.getenv(EnvVariables.BINANCE_API_KEY.value),
+                                          os.getenv(EnvVariables.BINANCE_API_SECRET.value))
+        return _shared_client
+
+
+def warm_up(client: Client, connections: int = TransportConstants.WARM_CONNECTIONS.value) -> None:
+    """
+    Open `connections` TLS connections to both the spot and futures hosts so the first signals reuse them.
+    """
+    calls = [client.ping] * connections + [client.futures_ping] * connections
+    with ThreadPoolExecutor(max_workers=len(calls), thread_name_prefix='warm-up') as executor:
+        futures = [executor.submit(call) for call in calls]
+    failures = [future.exception() for future in futures if future.exception()]
+    if failures:
+        logger.error("Failed to warm %s of %s connections: %s", len(failures), len(calls), failures[0])
+    else:
+        logger.debug("Warmed %s exchange connections", len(calls))
+
+
+async def keep_warm(client: Client, interval: float = TransportConstants.KEEP_WARM_SECONDS.value) -> None:
+    """
+    Periodically ping both hosts so pooled connections are not closed as idle between signals.
+    """
+    while True:
+        await asyncio.sleep(interval)
+        await run_blocking(warm_up, client)
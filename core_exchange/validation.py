@@ -0,0 +1,123 @@
+from dataclasses import dataclass
+from decimal import Decimal
+
+from core_exchange.symbol_registry import SymbolFilters
+
+
+@dataclass(slots=True)
+class Violation:
+    """
+    Why the exchange would reject an order: the filter it breaks and the offending value.
+    """
+    filter: str
+    reason: str
+
+    def __str__(self) -> str:
+        return f"{self.reason} ({self.filter})"
+
+
+def on_step(value: Decimal, start: Decimal, step: Decimal) -> bool:
+    """
+    Whether `value` is `start` plus a whole number of `step` increments, as the exchange checks it.
+    """
+    return not step or (value - start) % step == 0
+
+
+def check_price(filters: SymbolFilters, price: Decimal, name: str = 'price') -> Violation | None:
+    """
+    PRICE_FILTER: the price lies within [minPrice, maxPrice] and on the tick grid. A zero bound is disabled.
+    """
+    if price <= 0 or (filters.min_price and price < filters.min_price) or \
+            (filters.max_price and price > filters.max_price):
+        return Violation('PRICE_FILTER', f"{name} {price} outside [{filters.min_price}, {filters.max_price}]")
+    if not on_step(price, filters.min_price, filters.tick_size):
+        return Violation('PRICE_FILTER', f"{name} {price} is not a multiple of the tick size {filters.tick_size}")
+    return None
+
+
+def check_quantity(filters: SymbolFilters, quantity: Decimal, market: bool = False) -> Violation | None:
+    """
+    LOT_SIZE, or MARKET_LOT_SIZE for market orders: the quantity lies within bounds and on the step grid.
+    """
+    if market:
+        name, min_qty, max_qty, step = ('MARKET_LOT_SIZE', filters.market_min_qty, filters.market_max_qty,
+                                        filters.market_step_size)
+    else:
+        name, min_qty, max_qty, step = 'LOT_SIZE', filters.min_qty, filters.max_qty, filters.step_size
+    if quantity <= 0 or quantity < min_qty or (max_qty and quantity > max_qty):
+        return Violation(name, f"quantity {quantity} outside [{min_qty}, {max_qty}]")
+    if not on_step(quantity, min_qty, step):
+        return Violation(name, f"quantity {quantity} is not a multiple of the step size {step}")
+    return None
+
+
+def check_notional(filters: SymbolFilters, notional: Decimal) -> Violation | None:
+    """
+    MIN_NOTIONAL / NOTIONAL: price times quantity lies within the notional bounds.
+    """
+    if notional < filters.min_notional:
+        return Violation('MIN_NOTIONAL', f"notional {notional} below {filters.min_notional}")
+    if filters.max_notional is not None and notional > filters.max_notional:
+        return Violation('MIN_NOTIONAL', f"notional {notional} above {filters.max_notional}")
+    return None
+
+
+def check_percent_price(filters: SymbolFilters, side: str, price: Decimal, reference: Decimal) -> Violation | None:
+    """
+    PERCENT_PRICE: a limit price lies within the multiplier band around the reference price.
+    """
+    if side == 'BUY':
+        up, down = filters.bid_multiplier_up, filters.bid_multiplier_down
+    else:
+        up, down = filters.ask_multiplier_up, filters.ask_multiplier_down
+    if up is not None and price > reference * up:
+        return Violation('PERCENT_PRICE', f"price {price} above {reference * up} ({up} x {reference})")
+    if down is not None and price < reference * down:
+        return Violation('PERCENT_PRICE', f"price {price} below {reference * down} ({down} x {reference})")
+    return None
+
+
+def required_margin(quantity: Decimal, price: Decimal, leverage: int) -> Decimal:
+    """
+    Initial margin of a position of `quantity` at `price` and `leverage`.
+    """
+    return quantity * price / leverage
+
+
+def check_margin(quantity: Decimal, price: Decimal, leverage: int, available: Decimal) -> Violation | None:
+    margin = required_margin(quantity, price, leverage)
+    if margin > available:
+        return Violation('MARGIN', f"required margin {margin} at {leverage}x exceeds available {available}")
+    return None
+
+
+def check_order(filters: SymbolFilters, side: str, quantity: Decimal, price: Decimal | None = None,
+                stop_price: Decimal | None = None, reference_price: Decimal | None = None,
+                market: bool = False, reduce_only: bool = False) -> Violation | None:
+    """
+    Check one order against every filter that applies to it, using exact Decimal arithmetic.
+
+    `price` is the limit price and `stop_price` the trigger of a stop order. `reference_price` is the
+    current market price: it values market orders for the notional check and anchors PERCENT_PRICE
+    for limit orders. Checks that need a price are skipped when none is known. Binance exempts
+    `reduce_only` orders, such as the exit legs of a bracket, from the notional filter.
+    """
+    if price is not None:
+        violation = check_price(filters, price)
+        if violation:
+            return violation
+        if reference_price is not None:
+            violation = check_percent_price(filters, side, price, reference_price)
+            if violation:
+                return violation
+    if stop_price is not None:
+        violation = check_price(filters, stop_price, 'stop price')
+        if violation:
+            return violation
+    violation = check_quantity(filters, quantity, market)
+    if violation:
+        return violation
+    if reduce_only:
+        return None
+    valued_at = next((value for value in (price, stop_price, reference_price) if value is not None), None)
+    return check_notional(filters, quantity * valued_at) if valued_at is not None else None
@@ -0,0 +1,86 @@
+import asyncio
+from decimal import Decimal
+from typing import Any
+
+from core_exchange.cancellation import CancelResult
+from core_exchange.executor import run_blocking
+from core_exchange.symbol_registry import SymbolFilters, SymbolRegistry
+from core_future.future import FutureClient
+from core_future.orders import BracketOrderResult
+from core_future.stops import StopChange
+from variables.constants import StopConstants, TradingConstants
+
+
+class AsyncFutureClient:
+    """
+    Awaitable facade over FutureClient. Every call runs on the bounded exchange executor,
+    so order placement never blocks the discord.py event loop.
+    """
+
+    def __init__(self, future_client: FutureClient | None = None):
+        self.sync_client = future_client or FutureClient()
+        self._pending_stops: dict[str, tuple[float, list[asyncio.Future]]] = {}
+        self._stop_flush: asyncio.Task | None = None
+
+    @property
+    def symbols(self) -> SymbolRegistry:
+        return self.sync_client.symbols
+
+    async def get_account_balance(self) -> float:
+        return await run_blocking(self.sync_client.get_account_balance)
+
+    async def set_leverage(self, symbol: str, leverage: int) -> None:
+        await run_blocking(self.sync_client.set_leverage, symbol, leverage)
+
+    async def get_symbol_info(self, symbol: str) -> dict[str, Any] | None:
+        return await run_blocking(self.sync_client.get_symbol_info, symbol)
+
+    async def get_symbol_filters(self, symbol: str) -> SymbolFilters | None:
+        return await run_blocking(self.sync_client.get_symbol_filters, symbol)
+
+    async def calculate_quantity(self, usdt_balance: float, entry_price: float, leverage: int, symbol: str) -> Decimal:
+        return await run_blocking(self.sync_client.calculate_quantity, usdt_balance, entry_price, leverage, symbol)
+
+    async def place_order(self, symbol: str, side: str, quantity: Decimal | float, entry_price: float, stop_loss: float,
+                          target: float, use_batch: bool = True,
+                          leverage: int = TradingConstants.LEVERAGE.value) -> BracketOrderResult:
+        return await run_blocking(
+            self.sync_client.place_order, symbol, side, quantity, entry_price, stop_loss, target, use_batch, leverage)
+
+    async def cancel_open_futures_orders(self, symbol: str) -> CancelResult:
+        return await run_blocking(self.sync_client.cancel_open_futures_orders, symbol)
+
+    async def close_order_in_profit(self, symbol: str) -> None:
+        await run_blocking(self.sync_client.close_order_in_profit, symbol)
+
+    async def change_stop_loss(self, symbol: str, new_stop_loss: float) -> StopChange:
+        """
+        Stop changes requested within the same batching window are sent to the exchange together.
+        """
+        waiter = asyncio.get_running_loop().create_future()
+        _, waiters = self._pending_stops.get(symbol, (None, []))
+        self._pending_stops[symbol] = (new_stop_loss, [*waiters, waiter])
+        if self._stop_flush is None:
+            self._stop_flush = asyncio.create_task(self.__flush_stops())
+        return await waiter
+
+    async def change_stop_losses(self, new_stops: dict[str, float]) -> dict[str, StopChange]:
+        return await run_blocking(self.sync_client.change_stop_losses, new_stops)
+
+    async def __flush_stops(self) -> None:
+        await asyncio.sleep(StopConstants.BATCH_WINDOW_SECONDS.value)
+        pending, self._pending_stops = self._pending_stops, {}
+        self._stop_flush = None
+        try:
+            changes = await self.change_stop_losses({symbol: price for symbol, (price, _) in pending.items()})
+        except Exception as e:
+            for _, waiters in pending.values():
+                for waiter in waiters:
+                    if not waiter.done():
+                        waiter.set_exception(e)
+            return
+        # A caller cancelled while the batch was in flight has a done waiter; setting it again would raise.
+        for symbol, (_, waiters) in pending.items():
+            for waiter in waiters:
+                if not waiter.done():
+                    waiter.set_result(changes[symbol])
@@ -1,209 +1,356 @@
 import logging
-import os
-from decimal import ROUND_DOWN, Decimal
+import time
+from concurrent.futures import ThreadPoolExecutor
+from decimal import ROUND_FLOOR, Decimal
 from typing import Any
 
 from binance.client import Client
-from dotenv import load_dotenv
 
-from variables.constants import TradingConstants
+from core_exchange.account_state import AccountState, Position
+from core_exchange.cancellation import CancelResult, cancel_concurrently, chunked
+from core_exchange.quantiser import to_decimal
+from core_exchange.resilience import ResilientCaller, is_duplicate_order, new_client_order_id
+from core_exchange.symbol_registry import SymbolFilters, SymbolRegistry
+from core_exchange.transport import get_shared_client
+from core_exchange.validation import check_margin, check_order, required_margin
+from core_future.orders import BracketOrderResult, OrderLeg
+from core_future.stops import StopChange, StopManager
+from core_metrics.metrics import PRE_TRADE_REJECTIONS_TOTAL
+from variables.constants import BracketOrderConstants, CancelConstants, ResilienceConstants, TradingConstants
 
-logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+RISK_PERCENTAGE = to_decimal(TradingConstants.RISK_PERCENTAGE.value)
 
 
 class FutureClient:
-    def __init__(self):
-        load_dotenv()
-        api_key = os.getenv('BINANCE_API_KEY')
-        api_secret = os.getenv('BINANCE_API_SECRET')
-        self.client = Client(api_key, api_secret)
+    def __init__(self, client: Client | None = None, symbol_registry: SymbolRegistry | None = None,
+                 account_state: AccountState | None = None):
+        self.client = client or get_shared_client()
+        # An empty registry is falsy, so test for None rather than relying on `or`.
+        self.symbols = symbol_registry if symbol_registry is not None else SymbolRegistry(
+            self.client.futures_exchange_info)
+        self.account_state = account_state
+        self.calls = ResilientCaller()
+        self._leg_executor = ThreadPoolExecutor(
+            max_workers=BracketOrderConstants.MAX_CONCURRENT_LEGS.value, thread_name_prefix='future-legs')
+        # Hedged attempts get their own pool: the stop batches that wait on them run on the leg pool.
+        self._hedge_executor = ThreadPoolExecutor(
+            max_workers=ResilienceConstants.HEDGE_MAX_WORKERS.value, thread_name_prefix='future-hedges')
+        self.stops = StopManager(self.client, self.symbols, self.get_open_positions, self._leg_executor,
+                                 account_state, self.calls, self.recover_leg, self._hedge_executor)
+        if account_state:
+            account_state.on_order_closed(self.stops.discard)
 
     def get_account_balance(self) -> float:
         """
         Retrieve the account balance in USDT.
+
+        A balance that cannot be fetched raises once retries are exhausted, rather than reading as 0.
         """
-        try:
-            balance = self.client.futures_account_balance()
-            for asset in balance:
-                if asset['asset'] == 'USDT':
-                    return float(asset['balance'])
-        except Exception as e:
-            logging.error(f"Error retrieving account balance: {e}")
+        if self.account_state and self.account_state.synced:
+            balance = self.account_state.get_balance('USDT')
+            if balance:
+                return balance.wallet
+        for asset in self.calls.call('balance', self.client.futures_account_balance):
+            if asset['asset'] == 'USDT':
+                return float(asset['balance'])
         return 0.0
 
+    def get_available_margin(self) -> float:
+        """
+        Retrieve the available USDT margin, from the local account state when it is in sync and known.
+        """
+        if self.account_state and self.account_state.synced:
+            balance = self.account_state.get_balance('USDT')
+            if balance and balance.available is not None:
+                return balance.available
+        return float(self.calls.call('account', self.client.futures_account)['availableBalance'])
+
+    def get_open_positions(self, symbol: str) -> list[Position]:
+        """
+        Retrieve the non-zero positions for a symbol, from the local account state when it is in sync.
+        """
+        if self.account_state and self.account_state.synced:
+            return self.account_state.get_positions(symbol)
+        return [Position(position['symbol'], float(position['positionAmt']), float(position['entryPrice']),
+                         position.get('positionSide', 'BOTH'))
+                for position in self.calls.call('positionRisk', self.client.futures_position_information, symbol=symbol)
+                if float(position['positionAmt']) != 0]
+
     def set_leverage(self, symbol: str, leverage: int) -> None:
         """
         Set the leverage for a given symbol.
+
+        Raises once retries are exhausted: orders are sized and margin-checked for this leverage, so
+        they must not be placed under the old one.
         """
-        try:
-            self.client.futures_change_leverage(symbol=symbol, leverage=leverage)
-        except Exception as e:
-            logging.error(f"Error setting leverage for {symbol}: {e}")
+        self.calls.call('leverage', self.client.futures_change_leverage, symbol=symbol, leverage=leverage)
 
     def get_symbol_info(self, symbol: str) -> dict[str, Any] | None:
         """
-        Retrieve symbol information from the exchange.
+        Retrieve symbol information from the cached exchange info.
         """
-        try:
-            info = self.client.futures_exchange_info()
-            for item in info['symbols']:
-                if item['symbol'] == symbol:
-                    return item
-        except Exception as e:
-            logging.error(f"Error retrieving symbol info for {symbol}: {e}")
-        return None
+        return self.symbols.get_symbol_info(symbol)
 
-    def __get_trimmed_quantity(self, quantity: Decimal, step_size: Decimal) -> Decimal:
+    def get_symbol_filters(self, symbol: str) -> SymbolFilters | None:
         """
-        Truncate the quantity to the correct precision based on step size.
+        Retrieve the parsed exchange filters for a symbol.
         """
-        return (quantity // step_size) * step_size
+        return self.symbols.get(symbol)
 
-    def __get_trimmed_price(self, price: Decimal, tick_size: Decimal) -> Decimal:
+    def calculate_quantity(self, usdt_balance: float, entry_price: float, leverage: int, symbol: str) -> Decimal:
         """
-        Truncate the price to the correct precision based on tick size.
+        Calculate the quantity to trade based on balance, entry price, and leverage, exactly on the step grid.
         """
-        return (price // tick_size) * tick_size
+        filters = self.get_symbol_filters(symbol)
+        if filters and filters.step_size:
+            quantity = filters.quantiser.round_quantity(
+                to_decimal(usdt_balance) * RISK_PERCENTAGE * leverage / to_decimal(entry_price))
+            # Ensure the quantity meets the minimum increment requirement
+            return max(filters.min_qty, quantity)
+        return Decimal(0)
 
-    def calculate_quantity(self, usdt_balance: float, entry_price: float, leverage: int, symbol: str) -> float:
+    def place_order(self, symbol: str, side: str, quantity: Decimal | float, entry_price: float, stop_loss: float,
+                    target: float, use_batch: bool = True,
+                    leverage: int = TradingConstants.LEVERAGE.value) -> BracketOrderResult:
         """
-        Calculate the quantity to trade based on balance, entry price, and leverage.
+        Place a futures market entry and protect it with a stop loss and take profit.
+
+        Margin and symbol filters are prefetched in parallel, and every leg is checked against the
+        filters and the leverage-adjusted margin before anything is sent: if the entry or the stop
+        loss would be rejected nothing is placed, and a take profit that would be rejected is left
+        out. Once the entry is acknowledged the stop loss and take profit are submitted together, in
+        one batchOrders request when `use_batch` is set or as two concurrent requests otherwise.
         """
-        symbol_info = self.get_symbol_info(symbol)
-        if symbol_info:
-            lot_size_filter = next((f for f in symbol_info['filters'] if f['filterType'] == 'LOT_SIZE'), None)
-            if lot_size_filter:
-                step_size = Decimal(lot_size_filter['stepSize'])
-                max_precision = len(step_size.as_tuple()[1])
+        result = BracketOrderResult(symbol)
+        try:
+            margin_future = self._leg_executor.submit(self.get_available_margin)
+            filters_future = self._leg_executor.submit(self.get_symbol_filters, symbol)
+            available_margin = to_decimal(margin_future.result())
+            filters = filters_future.result()
+            result.prefetch_ms = result.elapsed_ms()
 
-                quantity_decimal = Decimal(
-                    (usdt_balance * TradingConstants.RISK_PERCENTAGE.value * leverage) / entry_price).quantize(
-                    Decimal('.' + '0' * max_precision), rounding=ROUND_DOWN)
+            logger.debug("Available Margin: %s USDT", available_margin)
 
-                # Ensure the quantity meets the minimum increment requirement
-                min_qty = Decimal(lot_size_filter['minQty'])
-                adjusted_quantity = max(min_qty, quantity_decimal)
-                return float(self.__get_trimmed_quantity(adjusted_quantity, step_size))
-        return 0.0
+            if not filters:
+                result.fail(f"Symbol info not found for {symbol}")
+                logger.error("Symbol info not found for %s", symbol)
+                return result
+
+            if not filters.tick_size:
+                result.fail(f"Price filter not found for {symbol}")
+                logger.error("Price filter not found for %s", symbol)
+                return result
+
+            quantiser = filters.quantiser
+            quantity = quantiser.round_quantity(quantity)
+            reference_price = to_decimal(entry_price)
+            stop_loss = quantiser.round_price(stop_loss, ROUND_FLOOR)
+            target = quantiser.round_price(target, ROUND_FLOOR)
+            exit_side = 'SELL' if side == 'BUY' else 'BUY'
+            quantity_str = quantiser.format_quantity(quantity)
+
+            entry = OrderLeg('entry', {'symbol': symbol, 'side': side, 'type': 'MARKET', 'quantity': quantity_str})
+            # Exit legs only ever reduce the position: once one of them fills, the other must not reverse it.
+            stop_loss_leg = OrderLeg('stop_loss', {
+                'symbol': symbol, 'side': exit_side, 'type': 'STOP_MARKET',
+                'stopPrice': quantiser.format_price(stop_loss), 'quantity': quantity_str, 'reduceOnly': 'true'})
+            take_profit_leg = OrderLeg('take_profit', {
+                'symbol': symbol, 'side': exit_side, 'type': 'LIMIT', 'price': quantiser.format_price(target),
+                'quantity': quantity_str, 'timeInForce': 'GTC', 'reduceOnly': 'true'})
+
+            logger.debug("Required margin: %s USDT", required_margin(quantity, reference_price, leverage))
+            violation = (check_margin(quantity, reference_price, leverage, available_margin)
+                         or check_order(filters, side, quantity, reference_price=reference_price, market=True)
+                         or check_order(filters, exit_side, quantity, stop_price=stop_loss, reduce_only=True))
+            if violation:
+                # An entry without a valid stop would be unprotected, so neither is sent.
+                entry.error = str(violation)
+                result.legs[entry.name] = entry
+                PRE_TRADE_REJECTIONS_TOTAL.inc(market='FUTURES', filter=violation.filter)
+                logger.error("Order for %s not sent: %s", symbol, violation)
+                return result
+            violation = check_order(filters, exit_side, quantity, target, reference_price=reference_price,
+                                    reduce_only=True)
+            if violation:
+                take_profit_leg.error = str(violation)
+                PRE_TRADE_REJECTIONS_TOTAL.inc(market='FUTURES', filter=violation.filter)
+            exit_legs = [leg for leg in (stop_loss_leg, take_profit_leg) if not leg.error]
+
+            logger.debug("Placing market order: symbol=%s, side=%s, quantity=%s", symbol, side, quantity_str)
+            result.legs[entry.name] = self.__submit_leg(entry)
+            if not entry.ok:
+                logger.error("Entry order for %s failed: %s", symbol, entry.error)
+                return result
+            logger.debug("Order placed: %s", entry.order)
+
+            logger.debug("Placing stop loss at %s and take profit at %s for %s", stop_loss, target, symbol)
+            if use_batch:
+                self.__submit_batch(exit_legs)
+            else:
+                self.__submit_concurrently(exit_legs)
+            result.legs[stop_loss_leg.name] = stop_loss_leg
+            result.legs[take_profit_leg.name] = take_profit_leg
+
+            for leg in (stop_loss_leg, take_profit_leg):
+                if leg.ok:
+                    logger.debug("%s order placed: %s", leg.name, leg.order)
+                else:
+                    logger.error("%s order for %s failed: %s", leg.name, symbol, leg.error)
+            if stop_loss_leg.ok:
+                self.stops.track(symbol, stop_loss_leg.order)
+                result.protected_ms = (stop_loss_leg.completed_at - result.started_at) * 1000
+            logger.info("Bracket latency %s", result.latency_report())
 
-    def place_order(self, symbol: str, side: str,
-                    quantity: float, entry_price: float, stop_loss: float, target: float) -> None:
+        except Exception as e:
+            if not (result.entry and result.entry.ok):
+                result.fail(str(e))
+            logger.error("Failed to place order: %s", e)
+        return result
+
+    def recover_leg(self, leg: OrderLeg) -> None:
         """
-        Place a futures order with stop loss and take profit.
+        Look up a leg the exchange refused as a duplicate: an earlier attempt of it was placed.
         """
         try:
-            account_info = self.client.futures_account()
-            available_margin = float(account_info['availableBalance'])
-            logging.info(f"Available Margin: {available_margin} USDT")
-
-            estimated_cost = quantity * entry_price
-            required_margin = estimated_cost / TradingConstants.LEVERAGE.value
-            print(f"Required margin: {required_margin}")
-
-            if estimated_cost > available_margin:
-                logging.error("Insufficient margin to place order.")
-                return
-
-            symbol_info = self.get_symbol_info(symbol)
-            if not symbol_info:
-                logging.error(f"Symbol info not found for {symbol}")
-                return
-
-            price_filter = next((f for f in symbol_info['filters'] if f['filterType'] == 'PRICE_FILTER'), None)
-            if not price_filter:
-                logging.error(f"Price filter not found for {symbol}")
-                return
-
-            tick_size = Decimal(price_filter['tickSize'])
-            stop_loss = self.__get_trimmed_price(Decimal(stop_loss), tick_size)
-            target = self.__get_trimmed_price(Decimal(target), tick_size)
-
-            logging.debug(f"Placing market order: symbol={symbol}, side={side}, quantity={quantity}")
-            order = self.client.futures_create_order(
-                symbol=symbol,
-                side=side,
-                type='MARKET',
-                quantity=quantity
-            )
-            logging.info(f"Order placed: {order}")
-
-            logging.debug(
-                f"Placing stop loss order: symbol={symbol}, side={'SELL' if side == 'BUY' else 'BUY'}, "
-                f"stopPrice={stop_loss}, quantity={quantity}")
-            stop_loss_order = self.client.futures_create_order(
-                symbol=symbol,
-                side='SELL' if side == 'BUY' else 'BUY',
-                type='STOP_MARKET',
-                stopPrice=str(stop_loss),
-                quantity=quantity
-            )
-            logging.info(f"Stop loss order placed: {stop_loss_order}")
-
-            logging.debug(
-                f"Placing take profit order: symbol={symbol}, side={'SELL' if side == 'BUY' else 'BUY'}, "
-                f"price={target}, quantity={quantity}")
-            take_profit_order = self.client.futures_create_order(
-                symbol=symbol,
-                side='SELL' if side == 'BUY' else 'BUY',
-                type='LIMIT',
-                price=str(target),
-                quantity=quantity,
-                timeInForce='GTC'
-            )
-            logging.info(f"Take profit order placed: {take_profit_order}")
-
+            leg.order = self.calls.call('getOrder', self.client.futures_get_order, symbol=leg.params['symbol'],
+                                        origClientOrderId=leg.client_order_id)
+            leg.error = None
         except Exception as e:
-            logging.error(f"Failed to place order: {e}")
+            leg.error = f"{leg.error}; lookup of {leg.client_order_id} failed: {e}"
 
-    def cancel_open_futures_orders(self, symbol: str) -> None:
+    def __submit_leg(self, leg: OrderLeg) -> OrderLeg:
         """
-        Cancel all open futures orders for a given symbol.
+        Submit a single order leg, recording its latency and any error.
         """
+        started = time.perf_counter()
         try:
-            open_orders = self.client.futures_get_open_orders(symbol=symbol)
-            for order in open_orders:
-                self.client.futures_cancel_order(symbol=symbol, orderId=order['orderId'])
-            logging.info(f"Canceled all open orders for {symbol}")
+            leg.order = self.calls.call('order', self.client.futures_create_order, **leg.params)
         except Exception as e:
-            logging.error(f"Failed to cancel open orders: {e}")
+            leg.error = str(e)
+            if is_duplicate_order(e):
+                self.recover_leg(leg)
+        leg.completed_at = time.perf_counter()
+        leg.latency_ms = (leg.completed_at - started) * 1000
+        return leg
 
-    def close_order_in_profit(self, symbol: str) -> None:
+    def __submit_concurrently(self, legs: list[OrderLeg]) -> None:
+        """
+        Submit each leg as its own request, all in flight at the same time.
         """
-        Close all open positions for a given symbol.
+        for future in [self._leg_executor.submit(self.__submit_leg, leg) for leg in legs]:
+            future.result()
+
+    def __submit_batch(self, legs: list[OrderLeg]) -> None:
         """
+        Submit up to five legs in a single batchOrders request.
+
+        These are the protective legs, so the request is hedged: if it has not been answered within
+        the hedge delay it is sent again, and the client order IDs make sure only one copy is placed.
+        """
+        started = time.perf_counter()
         try:
-            positions = self.client.futures_position_information()
-            for position in positions:
-                if position['symbol'] == symbol and float(position['positionAmt']) != 0:
-                    side = 'SELL' if float(position['positionAmt']) > 0 else 'BUY'
-                    quantity = abs(float(position['positionAmt']))
-                    self.client.futures_create_order(
-                        symbol=symbol,
-                        side=side,
-                        type='MARKET',
-                        quantity=quantity
-                    )
-            logging.info(f"Closed all positions for {symbol}")
+            responses = self.calls.hedged('batchOrders', self.client.futures_place_batch_order,
+                                          batchOrders=[leg.params for leg in legs], executor=self._hedge_executor)
         except Exception as e:
-            logging.error(f"Failed to close positions: {e}")
+            # The whole batch failed in transport; fall back to individual requests.
+            logger.error("Batch order submission failed, retrying legs individually: %s", e)
+            self.__submit_concurrently(legs)
+            return
+        completed = time.perf_counter()
+        for leg, response in zip(legs, responses):
+            leg.completed_at = completed
+            leg.latency_ms = (completed - started) * 1000
+            if 'orderId' in response:
+                leg.order = response
+            else:
+                leg.error = response.get('msg', str(response))
+                if is_duplicate_order(leg.error):
+                    self.recover_leg(leg)
 
-    def change_stop_loss(self, symbol: str, new_stop_loss: float) -> None:
+    def cancel_open_futures_orders(self, symbol: str) -> CancelResult:
         """
-        Change the stop loss for an open position.
+        Cancel all open futures orders for a given symbol.
+
+        Open orders are cancelled through batchOrders, ten per request with the requests in flight
+        concurrently. A failed batch falls back to bounded concurrent single cancels.
         """
+        result = CancelResult(symbol)
         try:
-            positions = self.client.futures_position_information()
-            for position in positions:
-                if position['symbol'] == symbol and float(position['positionAmt']) != 0:
-                    side = 'SELL' if float(position['positionAmt']) > 0 else 'BUY'
-                    quantity = abs(float(position['positionAmt']))
-                    self.client.futures_create_order(
-                        symbol=symbol,
-                        side=side,
-                        type='STOP_MARKET',
-                        stopPrice=str(new_stop_loss),
-                        quantity=quantity
-                    )
-            logging.info(f"Changed stop loss for {symbol} to {new_stop_loss}")
+            open_orders = self.calls.call('openOrders', self.client.futures_get_open_orders, symbol=symbol)
+            result.requests += 1
         except Exception as e:
-            logging.error(f"Failed to change stop loss: {e}")
+            result.error = str(e)
+            logger.error("Failed to cancel open orders: %s", e)
+            return result
+
+        order_ids = [order['orderId'] for order in open_orders]
+        batches = [(chunk, self._leg_executor.submit(self.__cancel_batch, symbol, chunk))
+                   for chunk in chunked(order_ids, CancelConstants.FUTURES_BATCH_SIZE.value)]
+        for chunk, future in batches:
+            try:
+                responses = future.result()
+                result.requests += 1
+            except Exception as e:
+                logger.error("Batch cancel failed for %s, cancelling individually: %s", symbol, e)
+                cancel_concurrently(
+                    lambda order_id: self.client.futures_cancel_order(symbol=symbol, orderId=order_id), chunk, result)
+                continue
+            for order_id, response in zip(chunk, responses):
+                result.record(response, order_id)
+
+        if result.ok:
+            self.stops.forget(symbol)
+        logger.info("Canceled %s open orders for %s in %s requests", len(result.cancelled), symbol, result.requests)
+        return result
+
+    def __cancel_batch(self, symbol: str, order_ids: list[int]) -> list[dict[str, Any]]:
+        return self.calls.call(
+            'cancelBatchOrders', self.client.futures_cancel_orders, symbol=symbol,
+            orderIdList='[' + ','.join(str(order_id) for order_id in order_ids) + ']')
+
+    def close_order_in_profit(self, symbol: str) -> None:
+        """
+        Close all open positions for a given symbol with reduce-only market orders.
+
+        Raises if the positions cannot be read or a close order fails, so the signal is reported as failed.
+        """
+        filters = self.get_symbol_filters(symbol)
+        if not filters:
+            raise ValueError(f"Symbol info not found for {symbol}")
+        quantiser = filters.quantiser
+        for position in self.get_open_positions(symbol):
+            side = 'SELL' if position.amount > 0 else 'BUY'
+            quantity = quantiser.round_quantity(abs(position.amount), market=True)
+            if not quantity:
+                logger.warning("Position of %s %s is below the step size, not closing it", position.amount, symbol)
+                continue
+            params = {'symbol': symbol, 'side': side, 'type': 'MARKET',
+                      'quantity': quantiser.format_quantity(quantity, market=True)}
+            # As for stops: hedge mode closes by position side and refuses reduceOnly.
+            if position.position_side != 'BOTH':
+                params['positionSide'] = position.position_side
+            else:
+                params['reduceOnly'] = 'true'
+            self.calls.call('order', self.client.futures_create_order, **params,
+                            newClientOrderId=new_client_order_id())
+        logger.info("Closed all positions for %s", symbol)
+
+    def change_stop_loss(self, symbol: str, new_stop_loss: float) -> StopChange:
+        """
+        Move the stop loss of an open position, replacing the previous stop order.
+        """
+        return self.change_stop_losses({symbol: new_stop_loss})[symbol]
+
+    def change_stop_losses(self, new_stops: dict[str, float]) -> dict[str, StopChange]:
+        """
+        Move the stop losses of several symbols at once, sharing batchOrders requests.
+        """
+        changes = self.stops.replace(new_stops)
+        for symbol, change in changes.items():
+            if change.ok:
+                logger.info("Changed stop loss for %s to %s, replaced %s", symbol, change.stop_price, change.replaced)
+            else:
+                logger.error("Failed to change stop loss for %s: %s", symbol, change.error)
+        return changes
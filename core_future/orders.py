@@ -0,0 +1,77 @@
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+from core_exchange.resilience import new_client_order_id
+
+
+@dataclass(slots=True)
+class OrderLeg:
+    """
+    One order of a bracket and how long its submission took.
+
+    Every leg gets a newClientOrderId, so retried and hedged submissions of it are placed at most once.
+    """
+    name: str
+    params: dict[str, Any]
+    order: dict[str, Any] | None = None
+    error: str | None = None
+    latency_ms: float = 0.0
+    completed_at: float | None = None
+
+    def __post_init__(self) -> None:
+        self.params.setdefault('newClientOrderId', new_client_order_id())
+
+    @property
+    def client_order_id(self) -> str:
+        return self.params['newClientOrderId']
+
+    @property
+    def ok(self) -> bool:
+        return self.order is not None and self.error is None
+
+
+@dataclass(slots=True)
+class BracketOrderResult:
+    """
+    Outcome of an entry + stop loss + take profit submission.
+
+    `started_at` is a `time.perf_counter()` timestamp taken when the signal reached `place_order`;
+    `protected_ms` is the time from there until the stop loss was acknowledged.
+    """
+    symbol: str
+    started_at: float = field(default_factory=time.perf_counter)
+    prefetch_ms: float = 0.0
+    protected_ms: float | None = None
+    legs: dict[str, OrderLeg] = field(default_factory=dict)
+
+    @property
+    def entry(self) -> OrderLeg | None:
+        return self.legs.get('entry')
+
+    @property
+    def stop_loss(self) -> OrderLeg | None:
+        return self.legs.get('stop_loss')
+
+    @property
+    def take_profit(self) -> OrderLeg | None:
+        return self.legs.get('take_profit')
+
+    @property
+    def is_protected(self) -> bool:
+        return bool(self.stop_loss and self.stop_loss.ok)
+
+    def fail(self, error: str) -> None:
+        """
+        Record that the entry was not placed, e.g. because the symbol's filters or the margin could not be read.
+        """
+        entry = self.legs.setdefault('entry', OrderLeg('entry', {'symbol': self.symbol}))
+        entry.error = error
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.started_at) * 1000
+
+    def latency_report(self) -> str:
+        legs = ', '.join(f"{leg.name}={leg.latency_ms:.1f}ms" for leg in self.legs.values())
+        protected = f"{self.protected_ms:.1f}ms" if self.protected_ms is not None else 'never'
+        return f"{self.symbol}: prefetch={self.prefetch_ms:.1f}ms, {legs}, protected after {protected}"
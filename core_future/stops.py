@@ -0,0 +1,224 @@
+import logging
+import threading
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from decimal import ROUND_FLOOR, Decimal
+from typing import Any
+
+from binance.client import Client
+
+from core_exchange.account_state import AccountState, Position
+from core_exchange.cancellation import chunked
+from core_exchange.quantiser import to_decimal
+from core_exchange.resilience import ResilientCaller, is_duplicate_order
+from core_exchange.symbol_registry import SymbolRegistry
+from core_future.orders import OrderLeg
+from variables.constants import CancelConstants, ResilienceConstants, StopConstants
+
+logger = logging.getLogger(__name__)
+STOP_TYPES = frozenset({'STOP_MARKET', 'STOP'})
+
+
+# Binance's answer to cancelling an order that no longer exists, e.g. a stop that filled meanwhile.
+UNKNOWN_ORDER_CODE = -2011
+
+
+@dataclass(slots=True)
+class StopOrder:
+    symbol: str
+    order_id: int
+    # None for stops restored from a journal that predates recording their price.
+    stop_price: Decimal | None
+
+
+@dataclass(slots=True)
+class StopChange:
+    """
+    Outcome of moving the stop of one symbol.
+    """
+    symbol: str
+    stop_price: Decimal | None = None
+    legs: list[OrderLeg] = field(default_factory=list)
+    replaced: list[int] = field(default_factory=list)
+    unchanged: bool = False
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and all(leg.ok for leg in self.legs)
+
+
+class StopManager:
+    """
+    Tracks the active stop-loss order of every futures symbol and moves it by cancel-replace.
+
+    Binance cannot amend a STOP_MARKET in place, so the new stop is placed first and the old one is
+    cancelled only once the new one is acknowledged; a position is never left without a stop. New
+    stops for several symbols share batchOrders requests, and a stop already at the requested price
+    is left alone.
+    """
+
+    def __init__(self, client: Client, symbols: SymbolRegistry, positions: Callable[[str], list[Position]],
+                 executor: ThreadPoolExecutor, account_state: AccountState | None = None,
+                 calls: ResilientCaller | None = None, recover: Callable[[OrderLeg], None] | None = None,
+                 hedge_executor: ThreadPoolExecutor | None = None):
+        self.client = client
+        self.calls = calls or ResilientCaller()
+        self.recover = recover
+        self.symbols = symbols
+        self.positions = positions
+        self.account_state = account_state
+        self._executor = executor
+        # Batches run on `executor` and block on their hedged attempts, so those must not queue behind them.
+        self._hedge_executor = hedge_executor or ThreadPoolExecutor(
+            max_workers=ResilienceConstants.HEDGE_MAX_WORKERS.value, thread_name_prefix='stop-hedges')
+        self._lock = threading.Lock()
+        self._active: dict[str, list[StopOrder]] = {}
+
+    def track(self, symbol: str, order: dict[str, Any]) -> None:
+        """Record a stop order placed for `symbol`, e.g. the stop leg of a bracket."""
+        stop = StopOrder(symbol, order['orderId'], Decimal(str(order.get('stopPrice', '0'))))
+        with self._lock:
+            self._active.setdefault(symbol, []).append(stop)
+
+    def seed(self, symbol: str, orders: list[dict[str, Any]]) -> None:
+        """
+        Restore the stops of `symbol` from the journal after a restart, so the first move of its stop
+        needs no open-orders request. Symbols already known are left alone.
+        """
+        stops = [StopOrder(symbol, order['orderId'], to_decimal(order['stopPrice']) if order.get('stopPrice') else None)
+                 for order in orders]
+        with self._lock:
+            self._active.setdefault(symbol, stops)
+
+    def discard(self, symbol: str, order_id: int) -> None:
+        """Stop tracking an order that filled, was cancelled or expired."""
+        with self._lock:
+            if symbol in self._active:
+                self._active[symbol] = [stop for stop in self._active[symbol] if stop.order_id != order_id]
+
+    def forget(self, symbol: str) -> None:
+        with self._lock:
+            self._active.pop(symbol, None)
+
+    def active(self, symbol: str) -> list[StopOrder]:
+        """
+        The stops of `symbol`, discovered from the open orders the first time a symbol is asked for.
+        """
+        with self._lock:
+            if symbol in self._active:
+                return list(self._active[symbol])
+        if self.account_state and self.account_state.synced:
+            open_orders = self.account_state.get_open_orders(symbol)
+        else:
+            open_orders = self.calls.call('openOrders', self.client.futures_get_open_orders, symbol=symbol)
+        stops = [StopOrder(symbol, order['orderId'], Decimal(str(order['stopPrice'])))
+                 for order in open_orders if order['type'] in STOP_TYPES]
+        with self._lock:
+            self._active[symbol] = stops
+        return list(stops)
+
+    def replace(self, new_stops: dict[str, float]) -> dict[str, StopChange]:
+        """
+        Move the stop of every symbol in `new_stops` to its tick-trimmed price.
+        """
+        changes: dict[str, StopChange] = {}
+        old_stops: dict[str, list[StopOrder]] = {}
+        legs: list[tuple[str, OrderLeg]] = []
+        for symbol, price in new_stops.items():
+            change = changes[symbol] = StopChange(symbol)
+            try:
+                filters = self.symbols.get(symbol)
+                if not filters or not filters.tick_size:
+                    raise ValueError(f"Symbol info not found for {symbol}")
+                change.stop_price = filters.quantiser.round_price(price, ROUND_FLOOR)
+                old_stops[symbol] = self.active(symbol)
+                if old_stops[symbol] and all(stop.stop_price == change.stop_price for stop in old_stops[symbol]):
+                    change.unchanged = True
+                    continue
+                positions = self.positions(symbol)
+                if not positions:
+                    raise ValueError(f"No open position for {symbol}")
+                for position in positions:
+                    params = {
+                        'symbol': symbol, 'side': 'SELL' if position.amount > 0 else 'BUY', 'type': 'STOP_MARKET',
+                        'stopPrice': filters.quantiser.format_price(change.stop_price),
+                        'quantity': filters.quantiser.format_quantity(to_decimal(abs(position.amount))),
+                    }
+                    # The old and new stop overlap until the cancel; neither may open a reverse position.
+                    # In hedge mode the position side already makes it closing, and reduceOnly is refused.
+                    if position.position_side != 'BOTH':
+                        params['positionSide'] = position.position_side
+                    else:
+                        params['reduceOnly'] = 'true'
+                    legs.append((symbol, OrderLeg('stop_loss', params)))
+            except Exception as e:
+                change.error = str(e)
+                logger.error("Failed to prepare stop loss change for %s: %s", symbol, e)
+
+        for symbol, leg in legs:
+            changes[symbol].legs.append(leg)
+        batches = [self._executor.submit(self.__submit_batch, [leg for _, leg in chunk])
+                   for chunk in chunked(legs, StopConstants.BATCH_SIZE.value)]
+        for batch in batches:
+            batch.result()
+
+        cancels = []
+        for symbol, change in changes.items():
+            if change.unchanged or not change.legs:
+                continue
+            if not change.ok:
+                # Keep the old stop rather than leave the position unprotected.
+                logger.error("New stop loss for %s was rejected, keeping the old one: %s",
+                             symbol, next(leg.error for leg in change.legs if not leg.ok))
+                continue
+            with self._lock:
+                self._active[symbol] = [StopOrder(symbol, leg.order['orderId'], change.stop_price)
+                                        for leg in change.legs]
+            stale = old_stops.get(symbol, [])
+            if stale:
+                cancels.append((change, stale, self._executor.submit(self.__cancel, symbol, stale)))
+        for change, stale, cancel in cancels:
+            change.replaced = cancel.result()
+            leftover = [stop for stop in stale if stop.order_id not in change.replaced]
+            if leftover:
+                # Still open on the exchange; keep tracking them so the next change retries the cancel.
+                with self._lock:
+                    self._active[change.symbol].extend(leftover)
+        return changes
+
+    def __submit_batch(self, legs: list[OrderLeg]) -> None:
+        try:
+            # A position may be waiting on this stop, so the request is hedged like a bracket's exit legs.
+            responses = self.calls.hedged('batchOrders', self.client.futures_place_batch_order,
+                                          batchOrders=[leg.params for leg in legs], executor=self._hedge_executor)
+        except Exception as e:
+            for leg in legs:
+                leg.error = str(e)
+            return
+        for leg, response in zip(legs, responses):
+            if 'orderId' in response:
+                leg.order = response
+            else:
+                leg.error = response.get('msg', str(response))
+                if self.recover and is_duplicate_order(leg.error):
+                    self.recover(leg)
+
+    def __cancel(self, symbol: str, stops: list[StopOrder]) -> list[int]:
+        cancelled = []
+        for chunk in chunked([stop.order_id for stop in stops], CancelConstants.FUTURES_BATCH_SIZE.value):
+            try:
+                responses = self.calls.call(
+                    'cancelBatchOrders', self.client.futures_cancel_orders, symbol=symbol,
+                    orderIdList='[' + ','.join(str(order_id) for order_id in chunk) + ']')
+            except Exception as e:
+                logger.error("Failed to cancel replaced stop losses %s for %s: %s", chunk, symbol, e)
+                continue
+            for order_id, response in zip(chunk, responses):
+                if 'orderId' in response:
+                    cancelled.append(response['orderId'])
+                elif response.get('code') == UNKNOWN_ORDER_CODE:
+                    # Already gone, e.g. a stop restored from the journal that filled while the bot was down.
+                    cancelled.append(order_id)
+        return cancelled
@@ -0,0 +1,195 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections.abc import Iterable
+from typing import Any
+
+from core_future.orders import OrderLeg
+from core_parsing.signal_parser import Signal
+from variables.constants import AccountConstants, EnvVariables, JournalConstants
+
+logger = logging.getLogger(__name__)
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS signals (
+    message_id INTEGER PRIMARY KEY,
+    channel_id INTEGER,
+    received_at REAL NOT NULL,
+    market TEXT NOT NULL,
+    command TEXT NOT NULL,
+    symbol TEXT,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS orders (
+    market TEXT NOT NULL,
+    order_id INTEGER NOT NULL,
+    symbol TEXT NOT NULL,
+    message_id INTEGER,
+    leg TEXT NOT NULL,
+    client_order_id TEXT,
+    status TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    account TEXT NOT NULL DEFAULT 'default',
+    stop_price TEXT,
+    PRIMARY KEY (market, order_id)
+);
+CREATE INDEX IF NOT EXISTS orders_open ON orders (status, market, symbol);
+"""
+
+RECEIVED, DONE, FAILED, INTERRUPTED = 'received', 'done', 'failed', 'interrupted'
+OPEN, CLOSED = 'open', 'closed'
+
+
+def get_journal_path() -> str:
+    return os.getenv(EnvVariables.SIGNAL_JOURNAL_PATH.value) or JournalConstants.DEFAULT_PATH.value
+
+
+def signal_payload(signal: Signal) -> str:
+    return json.dumps({
+        'market': signal.market.value, 'command': signal.command.value, 'symbol': signal.symbol,
+        'side': signal.side, 'entries': signal.entries, 'stop_loss': signal.stop_loss, 'target': signal.target,
+    })
+
+
+class SignalJournal:
+    """
+    Append-mostly SQLite (WAL) journal of handled signals and the orders they produced.
+
+    Message IDs seen within the dedup window and all open orders are loaded into memory when the
+    journal opens, so the duplicate check on the hot path is a set lookup and restart recovery
+    needs no REST calls. Every write is committed before it returns, so a signal that was claimed
+    is never executed again after a crash or a redelivery.
+    """
+
+    def __init__(self, path: str | None = None,
+                 dedup_window: float = JournalConstants.DEDUP_WINDOW_SECONDS.value, recover_interrupted: bool = True):
+        self.path = path or get_journal_path()
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('PRAGMA synchronous=NORMAL')
+        self._db.executescript(SCHEMA)
+        columns = {row[1] for row in self._db.execute('PRAGMA table_info(orders)')}
+        if 'account' not in columns:
+            # Journals written before orders were tagged with their account belong to the default one.
+            self._db.execute(f"ALTER TABLE orders ADD COLUMN account TEXT NOT NULL "
+                             f"DEFAULT '{AccountConstants.DEFAULT_NAME.value}'")
+        if 'stop_price' not in columns:
+            self._db.execute('ALTER TABLE orders ADD COLUMN stop_price TEXT')
+        self._seen: set[int] = set()
+        self._open_orders: dict[tuple[str, str], dict[int, dict[str, Any]]] = {}
+        self.interrupted: list[dict[str, Any]] = []
+        self.__recover(time.time() - dedup_window, recover_interrupted)
+
+    def __recover(self, since: float, recover_interrupted: bool) -> None:
+        started = time.perf_counter()
+        with self._lock:
+            self._seen = {row[0] for row in self._db.execute(
+                'SELECT message_id FROM signals WHERE received_at >= ?', (since,))}
+            for market, order_id, symbol, message_id, leg, client_order_id, account, stop_price in self._db.execute(
+                    'SELECT market, order_id, symbol, message_id, leg, client_order_id, account, stop_price '
+                    'FROM orders WHERE status = ?', (OPEN,)):
+                self._open_orders.setdefault((market, symbol), {})[order_id] = {
+                    'orderId': order_id, 'symbol': symbol, 'message_id': message_id, 'leg': leg,
+                    'clientOrderId': client_order_id, 'account': account, 'stopPrice': stop_price,
+                }
+            # Signals claimed but never finished were cut off by the restart; they are not replayed. A journal
+            # opened next to the process that claims signals leaves them alone: they may still be in flight.
+            if recover_interrupted:
+                self.interrupted = [
+                    {'message_id': message_id, 'symbol': symbol, 'command': command}
+                    for message_id, symbol, command in self._db.execute(
+                        'SELECT message_id, symbol, command FROM signals WHERE status = ?', (RECEIVED,))]
+            if self.interrupted:
+                self._db.execute('UPDATE signals SET status = ?, updated_at = ? WHERE status = ?',
+                                 (INTERRUPTED, time.time(), RECEIVED))
+        open_orders = sum(len(orders) for orders in self._open_orders.values())
+        logger.info("Journal recovered %s signals, %s open orders and %s interrupted signals in %.1fms",
+                    len(self._seen), open_orders, len(self.interrupted), (time.perf_counter() - started) * 1000)
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    def seen(self, message_id: int) -> bool:
+        return message_id in self._seen
+
+    def claim(self, message_id: int, channel_id: int | None, signal: Signal) -> bool:
+        """
+        Record a signal before it is executed. Returns False if this message was already handled.
+        """
+        if message_id in self._seen:
+            return False
+        now = time.time()
+        with self._lock:
+            self._seen.add(message_id)
+            cursor = self._db.execute(
+                'INSERT OR IGNORE INTO signals VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (message_id, channel_id, now, signal.market.value, signal.command.value, signal.symbol,
+                 signal_payload(signal), RECEIVED, now))
+        return cursor.rowcount == 1
+
+    def finish(self, message_id: int, ok: bool = True) -> None:
+        with self._lock:
+            self._db.execute('UPDATE signals SET status = ?, updated_at = ? WHERE message_id = ?',
+                             (DONE if ok else FAILED, time.time(), message_id))
+
+    def record_orders(self, message_id: int | None, market: str, symbol: str, legs: Iterable[OrderLeg],
+                      account: str = AccountConstants.DEFAULT_NAME.value) -> None:
+        """
+        Link the acknowledged legs of a signal on `account` to it. Market orders are recorded already
+        closed: futures acknowledge them as NEW, but they fill at once and never rest on the book.
+        """
+        now = time.time()
+        rows = []
+        with self._lock:
+            for leg in legs:
+                if not leg.ok or 'orderId' not in leg.order:
+                    continue
+                order = leg.order
+                closed = order.get('status') in ('FILLED', 'CANCELED', 'EXPIRED') or leg.params.get('type') == 'MARKET'
+                status = CLOSED if closed else OPEN
+                stop_price = leg.params.get('stopPrice')
+                rows.append((market, order['orderId'], symbol, message_id, leg.name, order.get('clientOrderId'),
+                             status, now, account, stop_price))
+                if status == OPEN:
+                    self._open_orders.setdefault((market, symbol), {})[order['orderId']] = {
+                        'orderId': order['orderId'], 'symbol': symbol, 'message_id': message_id, 'leg': leg.name,
+                        'clientOrderId': order.get('clientOrderId'), 'account': account, 'stopPrice': stop_price,
+                    }
+            self._db.executemany(
+                'INSERT OR REPLACE INTO orders (market, order_id, symbol, message_id, leg, client_order_id, status, '
+                'created_at, account, stop_price) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', rows)
+
+    def close_orders(self, market: str, symbol: str, order_ids: Iterable[int] | None = None,
+                     account: str | None = None) -> None:
+        """
+        Mark orders of a symbol as no longer open, all of them (on `account`, if given) when `order_ids` is None.
+        """
+        with self._lock:
+            open_orders = self._open_orders.get((market, symbol), {})
+            if order_ids is None:
+                order_ids = [order_id for order_id, order in open_orders.items()
+                             if account is None or order['account'] == account]
+            else:
+                order_ids = list(order_ids)
+            for order_id in order_ids:
+                open_orders.pop(order_id, None)
+            if not open_orders:
+                self._open_orders.pop((market, symbol), None)
+            self._db.executemany('UPDATE orders SET status = ? WHERE market = ? AND order_id = ?',
+                                 [(CLOSED, market, order_id) for order_id in order_ids])
+
+    def open_orders(self, market: str, symbol: str, leg: str | None = None,
+                    account: str | None = None) -> list[dict[str, Any]]:
+        with self._lock:
+            return [dict(order) for order in self._open_orders.get((market, symbol), {}).values()
+                    if (leg is None or order['leg'] == leg) and (account is None or order['account'] == account)]
+
+    def symbols_with_open_orders(self, market: str) -> list[str]:
+        with self._lock:
+            return sorted(symbol for order_market, symbol in self._open_orders if order_market == market)
@@ -0,0 +1,158 @@
+import atexit
+import contextvars
+import json
+import logging
+import os
+import queue
+import sys
+from collections.abc import Iterator
+from contextlib import contextmanager
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any
+
+from variables.constants import EnvVariables, LoggingConstants
+from variables.environment import load_environment
+
+LOG_CONTEXT: contextvars.ContextVar[dict[str, Any]] = contextvars.ContextVar('log_context', default={})
+
+# Attributes every LogRecord has; anything else on a record was passed through `extra`.
+_RECORD_ATTRIBUTES = frozenset(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {'message', 'asctime'}
+
+_listener: QueueListener | None = None
+
+
+@contextmanager
+def log_context(**fields: Any) -> Iterator[None]:
+    """
+    Attach `fields`, e.g. the signal ID and symbol, to every record logged inside the block,
+    including from tasks it starts and exchange calls it runs on the executor.
+    """
+    token = LOG_CONTEXT.set({**LOG_CONTEXT.get(), **fields})
+    try:
+        yield
+    finally:
+        LOG_CONTEXT.reset(token)
+
+
+class ContextFilter(logging.Filter):
+    """
+    Copies the current log context onto the record. It runs in the logging thread or task, before
+    the record is handed to the background writer, where the context is no longer known.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        for key, value in LOG_CONTEXT.get().items():
+            setattr(record, key, value)
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    One JSON object per line: time, level, logger, message, then the context and `extra` fields.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': round(record.created, 3),
+            'level': record.levelname,
+            'logger': record.name,
+            'process': record.processName,
+            'msg': record.getMessage(),
+        }
+        entry.update((key, value) for key, value in vars(record).items() if key not in _RECORD_ATTRIBUTES)
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry['exc'] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """
+    The classic one-line format, with the context fields appended as key=value pairs.
+    """
+
+    def __init__(self):
+        super().__init__('%(asctime)s - %(processName)s - %(name)s - %(levelname)s - %(message)s')
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        fields = ' '.join(f'{key}={value}' for key, value in vars(record).items() if key not in _RECORD_ATTRIBUTES)
+        return f'{line} [{fields}]' if fields else line
+
+
+class DeferredQueueHandler(QueueHandler):
+    """
+    QueueHandler that leaves formatting to the listener thread.
+
+    The stock handler formats every record before queueing it, so it can be pickled. This queue
+    never leaves the process, so the producer only pays for building the record.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if record.exc_info:
+            # Tracebacks hold frames that may change once the handler returns; render them now.
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def parse_levels(config: str) -> dict[str, str]:
+    """
+    Parse LOG_LEVELS, e.g. `core_future=DEBUG,discord=WARNING`, into logger names and levels.
+    """
+    levels = {}
+    for entry in config.split(','):
+        name, _, level = entry.partition('=')
+        if name.strip() and level.strip():
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+def configure_logging(level: str | None = None, levels: dict[str, str] | None = None,
+                      json_format: bool | None = None, stream: Any = None) -> QueueListener:
+    """
+    Route all logging through a queue to a background writer thread.
+
+    The root level comes from LOG_LEVEL, per-logger levels from LOG_LEVELS and the output format
+    (`json` or `text`) from LOG_FORMAT; arguments override the environment. Calling it again
+    replaces the previous configuration.
+    """
+    global _listener
+    load_environment()
+    level = level or os.getenv(EnvVariables.LOG_LEVEL.value) or LoggingConstants.LEVEL.value
+    if levels is None:
+        levels = parse_levels(os.getenv(EnvVariables.LOG_LEVELS.value) or '')
+    if json_format is None:
+        json_format = (os.getenv(EnvVariables.LOG_FORMAT.value) or LoggingConstants.FORMAT.value).lower() == 'json'
+
+    if _listener is not None:
+        _listener.stop()
+    writer = logging.StreamHandler(stream or sys.stderr)
+    writer.setFormatter(JsonFormatter() if json_format else TextFormatter())
+    records: queue.SimpleQueue = queue.SimpleQueue()
+    handler = DeferredQueueHandler(records)
+    handler.addFilter(ContextFilter())
+
+    root = logging.getLogger()
+    for existing in root.handlers[:]:
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(level.upper())
+    for name, logger_level in levels.items():
+        logging.getLogger(name).setLevel(logger_level)
+
+    _listener = QueueListener(records, writer)
+    _listener.start()
+    return _listener
+
+
+def stop_logging() -> None:
+    """Write out the records still queued and stop the writer thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(stop_logging)
@@ -0,0 +1,177 @@
+import bisect
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _format_labels(labelnames: tuple[str, ...], values: tuple[str, ...], extra: str = '') -> str:
+    pairs = [f'{name}="{value}"' for name, value in zip(labelnames, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class Metric(ABC):
+    kind = ''
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict[str, str]) -> tuple[str, ...]:
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def render(self) -> list[str]:
+        return [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.kind}', *self._samples()]
+
+    @abstractmethod
+    def _samples(self) -> list[str]:
+        """The sample lines of the metric in the Prometheus text format."""
+
+
+class Counter(Metric):
+    kind = 'counter'
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def _samples(self) -> list[str]:
+        with self._lock:
+            return [f'{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}'
+                    for key, value in self._values.items()]
+
+
+class Gauge(Counter):
+    kind = 'gauge'
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(Metric):
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = (),
+                 buckets: tuple[float, ...] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = buckets
+        self._counts: dict[tuple[str, ...], list[int]] = {}
+        self._sums: dict[tuple[str, ...], float] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            counts = self._counts.get(key)
+            if counts is None:
+                counts = self._counts[key] = [0] * (len(self.buckets) + 1)
+                self._sums[key] = 0.0
+            counts[bisect.bisect_left(self.buckets, value)] += 1
+            self._sums[key] += value
+
+    def count(self, **labels: str) -> int:
+        return sum(self._counts.get(self._key(labels), ()))
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def _samples(self) -> list[str]:
+        samples = []
+        with self._lock:
+            for key, counts in self._counts.items():
+                cumulative = 0
+                for bound, count in zip((*self.buckets, float('inf')), counts):
+                    cumulative += count
+                    le = 'le="+Inf"' if bound == float('inf') else f'le="{bound!r}"'
+                    samples.append(f'{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}')
+                labels = _format_labels(self.labelnames, key)
+                samples.append(f'{self.name}_sum{labels} {_format_value(self._sums[key])}')
+                samples.append(f'{self.name}_count{labels} {cumulative}')
+        return samples
+
+
+class MetricsRegistry:
+    """
+    Minimal Prometheus text-format registry. Collectors run before every scrape to refresh gauges.
+    """
+
+    def __init__(self):
+        self._metrics: list[Metric] = []
+        self._collectors: list[Callable[[], None]] = []
+
+    def register(self, metric: Metric) -> Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector: Callable[[], None]) -> None:
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        for collector in self._collectors:
+            collector()
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = MetricsRegistry()
+
+SIGNAL_STAGE_SECONDS = REGISTRY.register(Histogram(
+    'signal_stage_seconds', 'Time spent in each stage of signal handling.', ('stage',)))
+SIGNALS_TOTAL = REGISTRY.register(Counter(
+    'signals_total', 'Signals handled, by market, command and outcome.', ('market', 'command', 'outcome')))
+ORDER_LEGS_TOTAL = REGISTRY.register(Counter(
+    'order_legs_total', 'Order legs submitted, by leg and outcome.', ('leg', 'outcome')))
+SIGNAL_QUEUE = REGISTRY.register(Gauge(
+    'signal_queue', 'Signal dispatcher queue state.', ('field',)))
+RATE_LIMIT_UTILISATION = REGISTRY.register(Gauge(
+    'rate_limit_utilisation', 'Share of the Binance rate-limit budget in use.', ('account', 'market', 'budget')))
+ROUTED_MESSAGES_TOTAL = REGISTRY.register(Counter(
+    'routed_messages_total', 'Messages seen by the signal router, by parser and outcome.', ('parser', 'outcome')))
+STARTUP_PHASE_SECONDS = REGISTRY.register(Gauge(
+    'startup_phase_seconds', 'Duration of each startup phase of the bot.', ('phase',)))
+ACCOUNT_SIGNAL_SECONDS = REGISTRY.register(Histogram(
+    'account_signal_seconds', 'Time to execute a signal on each account.', ('account', 'market')))
+PRE_TRADE_REJECTIONS_TOTAL = REGISTRY.register(Counter(
+    'pre_trade_rejections_total', 'Orders not sent because they would break an exchange filter.',
+    ('market', 'filter')))
+EXCHANGE_RETRIES_TOTAL = REGISTRY.register(Counter(
+    'exchange_retries_total', 'Exchange calls retried, by endpoint and error kind.', ('endpoint', 'kind')))
+CIRCUIT_REJECTIONS_TOTAL = REGISTRY.register(Counter(
+    'circuit_rejections_total', 'Exchange calls failed fast by an open circuit breaker.', ('endpoint',)))
+HEDGED_REQUESTS_TOTAL = REGISTRY.register(Counter(
+    'hedged_requests_total', 'Hedged exchange requests, by endpoint and which attempt answered first.',
+    ('endpoint', 'winner')))
+
+
+def span(stage: str):
+    """
+    Time a block of signal handling into `signal_stage_seconds{stage=...}`.
+    """
+    return SIGNAL_STAGE_SECONDS.time(stage=stage)
@@ -0,0 +1,89 @@
+import logging
+import os
+import time
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import TypeVar
+
+from core_metrics.metrics import STARTUP_PHASE_SECONDS
+
+logger = logging.getLogger(__name__)
+T = TypeVar('T')
+
+
+def process_uptime() -> float | None:
+    """
+    Seconds since this process started, read from /proc; None where that is not available.
+    """
+    try:
+        with open('/proc/self/stat') as stat:
+            # starttime is the 22nd field; the command name before it may contain spaces.
+            started_ticks = int(stat.read().rsplit(')', 1)[1].split()[19])
+        with open('/proc/uptime') as uptime:
+            boot_seconds = float(uptime.read().split()[0])
+        return max(0.0, boot_seconds - started_ticks / os.sysconf('SC_CLK_TCK'))
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+@dataclass(slots=True)
+class Phase:
+    name: str
+    started_ms: float
+    duration_ms: float
+
+
+class StartupReport:
+    """
+    Timeline of the bot's startup phases, in milliseconds since the process started.
+
+    Phases may overlap; the report lists when each one started and how long it took, so it shows
+    both what ran in parallel and what the bot was waiting for.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter):
+        self._clock = clock
+        self.started_at = clock() - (process_uptime() or 0.0)
+        self.phases: list[Phase] = []
+        self.ready_ms: float | None = None
+
+    def elapsed_ms(self) -> float:
+        return (self._clock() - self.started_at) * 1000
+
+    def mark(self, name: str) -> None:
+        """Record a phase that ran from process start until now, e.g. module imports."""
+        self.__record(Phase(name, 0.0, self.elapsed_ms()))
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        started_ms = self.elapsed_ms()
+        try:
+            yield
+        finally:
+            self.__record(Phase(name, started_ms, self.elapsed_ms() - started_ms))
+
+    async def measure(self, name: str, awaitable: Awaitable[T]) -> T:
+        with self.phase(name):
+            return await awaitable
+
+    def __record(self, phase: Phase) -> None:
+        self.phases.append(phase)
+        STARTUP_PHASE_SECONDS.set(phase.duration_ms / 1000, phase=phase.name)
+
+    def finish(self) -> None:
+        """Mark the bot ready for signals and log the report, once."""
+        if self.ready_ms is None:
+            self.ready_ms = self.elapsed_ms()
+            STARTUP_PHASE_SECONDS.set(self.ready_ms / 1000, phase='ready')
+            logger.info(self.format())
+
+    def format(self) -> str:
+        lines = [f"Ready for signals {self.ready_ms:.0f} ms after process start" if self.ready_ms is not None
+                 else "Startup in progress"]
+        for phase in sorted(self.phases, key=lambda phase: phase.started_ms):
+            lines.append(f"  {phase.name:24} at {phase.started_ms:7.0f} ms  took {phase.duration_ms:7.0f} ms")
+        return '\n'.join(lines)
+
+    def as_dict(self) -> dict[str, float | None]:
+        return {'ready_ms': self.ready_ms, **{phase.name: round(phase.duration_ms, 1) for phase in self.phases}}
@@ -0,0 +1,123 @@
+import os
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+
+from core_parsing.signal_parser import Signal, parse_future_signal, parse_spot_signal
+from variables.constants import EnvVariables, RouterConstants
+
+
+@dataclass(slots=True)
+class SignalParser:
+    """
+    A signal format: the parser plus the cheap checks a message must pass before it is parsed.
+
+    A message is only handed to `parse` if it starts with one of `prefixes` and contains one of
+    `keywords`. An `exclusive` format owns every message carrying its keywords: no later parser is
+    tried and a failed parse is reported as a malformed signal rather than ignored.
+    """
+    name: str
+    parse: Callable[[str], Signal | None]
+    keywords: tuple[str, ...]
+    prefixes: tuple[str, ...] = ('$',)
+    exclusive: bool = False
+
+
+PARSERS: dict[str, SignalParser] = {}
+
+
+def register_parser(parser: SignalParser) -> SignalParser:
+    PARSERS[parser.name] = parser
+    return parser
+
+
+register_parser(SignalParser('futures', parse_future_signal, ('LONG', 'SHORT', 'Close Order', 'Change Stoploss'),
+                             exclusive=True))
+register_parser(SignalParser('spot', parse_spot_signal, ('Entry',)))
+
+
+@dataclass(slots=True)
+class RouteResult:
+    signal: Signal | None
+    parser: SignalParser
+
+    @property
+    def malformed(self) -> bool:
+        return self.signal is None
+
+
+class Route:
+    """
+    The parsers of one channel, behind a shared prefix check and per-parser keyword checks.
+    """
+
+    def __init__(self, parsers: list[SignalParser]):
+        self.parsers = parsers
+        self.prefixes = tuple(sorted({prefix for parser in parsers for prefix in parser.prefixes}))
+
+    def candidates(self, content: str) -> list[SignalParser]:
+        """
+        The parsers whose keywords occur in `content`, in registration order.
+        """
+        if not content.startswith(self.prefixes):
+            return []
+        # Plain substring tests run in C and beat a compiled alternation several times over on these
+        # few, short keywords.
+        return [parser for parser in self.parsers
+                if content.startswith(parser.prefixes) and any(keyword in content for keyword in parser.keywords)]
+
+    def parse(self, content: str) -> RouteResult | None:
+        """
+        Parse `content` with the first candidate that accepts it. None means the message is not a signal.
+        """
+        for parser in self.candidates(content):
+            signal = parser.parse(content)
+            if signal is not None or parser.exclusive:
+                return RouteResult(signal, parser)
+        return None
+
+
+class SignalRouter:
+    """
+    Maps channel IDs to the signal formats posted there.
+
+    Channels without a route of their own use the default route; with no default, their messages
+    are dropped with a single dict lookup.
+    """
+
+    def __init__(self, routes: dict[int, Sequence[str]] | None = None,
+                 default: Sequence[str] | None = RouterConstants.DEFAULT_PARSERS.value):
+        self.routes = {channel_id: self.__build(names) for channel_id, names in (routes or {}).items()}
+        self.default = self.__build(default) if default else None
+
+    @staticmethod
+    def __build(names: Sequence[str]) -> Route:
+        unknown = [name for name in names if name not in PARSERS]
+        if unknown:
+            raise ValueError(f"Unknown signal parsers: {', '.join(unknown)}")
+        return Route([PARSERS[name] for name in names])
+
+    def route(self, channel_id: int, content: str) -> RouteResult | None:
+        route = self.routes.get(channel_id, self.default)
+        return route.parse(content) if route else None
+
+
+def get_router() -> SignalRouter:
+    """
+    Build the router from SIGNAL_ROUTES, e.g. `1100000000000000001=futures;*=spot,futures`.
+    `*` sets the route of all other channels; without SIGNAL_ROUTES every channel uses the default.
+    """
+    config = os.getenv(EnvVariables.SIGNAL_ROUTES.value)
+    if not config:
+        return SignalRouter()
+    routes = {}
+    default = None
+    for entry in config.split(';'):
+        if not entry.strip():
+            continue
+        channel, _, names = entry.partition('=')
+        parsers = [name.strip() for name in names.split(',') if name.strip()]
+        if channel.strip() == '*':
+            default = parsers
+        else:
+            routes[int(channel)] = parsers
+    return SignalRouter(routes, default)
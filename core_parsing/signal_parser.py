@@ -0,0 +1,116 @@
+import re
+from dataclasses import dataclass, field
+
+from variables.constants import Market, OrderSide, SignalCommand
+
+# Each message is scanned once; every token kind is an alternative of one compiled pattern.
+# The leading lookahead lets the scanner skip positions that cannot start any token.
+FUTURE_TOKENS = re.compile(
+    r'(?=[$CELST])(?:'
+    r'(?P<close>Close\sOrder)'
+    r'|Change\sStoploss\s=\s\$(?P<change>[\d.]+)'
+    r'|Entry\s\d\s=\s\$(?P<entry>[\d.]+)'
+    r'|Stoploss:\s4H\sClose\s(?:Above|Below)\s\$(?P<stoploss>[\d.]+)'
+    r'|Target:\s\$(?P<target>[\d.]+)'
+    r'|\$(?P<symbol>\w+)'
+    r'|(?P<side>LONG|SHORT)'
+    r')'
+)
+
+SPOT_TOKENS = re.compile(
+    r'(?=[$EFS])(?:'
+    r'Entry \d+ = \$(?P<entry>[\d.]+)'
+    r'|Stoploss:[^\n]*Below \$(?P<stoploss>[\d.]+)'
+    r'|Final Target: \$(?P<target>[\d.]+)'
+    r'|\$(?P<symbol>\w+)'
+    r')'
+)
+
+
+@dataclass(slots=True)
+class Signal:
+    """
+    A parsed trading signal, shared by the futures and spot formats.
+    """
+    market: Market
+    command: SignalCommand
+    symbol: str | None
+    side: str | None = None
+    entries: list[float] = field(default_factory=list)
+    stop_loss: float | None = None
+    target: float | None = None
+
+    @property
+    def entry_price(self) -> float | None:
+        return self.entries[0] if self.entries else None
+
+
+def parse_future_signal(message: str) -> Signal | None:
+    """
+    Parse a futures signal in a single pass. Returns None if the message is not a complete signal.
+    """
+    symbol = side = stop_loss = target = change = None
+    close = False
+    entries = []
+    try:
+        for close_token, change_token, entry, stoploss, target_token, symbol_token, side_token \
+                in FUTURE_TOKENS.findall(message):
+            if entry:
+                entries.append(float(entry))
+            elif symbol_token:
+                if symbol is None:
+                    symbol = symbol_token.upper() + 'USDT'
+            elif side_token:
+                if side is None:
+                    side = OrderSide.BUY.value if side_token == 'LONG' else OrderSide.SELL.value
+            elif stoploss:
+                if stop_loss is None:
+                    stop_loss = float(stoploss)
+            elif target_token:
+                if target is None:
+                    target = float(target_token)
+            elif change_token:
+                if change is None:
+                    change = float(change_token)
+            elif close_token:
+                close = True
+    except ValueError:
+        return None
+
+    if close:
+        return Signal(Market.FUTURES, SignalCommand.CLOSE_ORDER, symbol)
+    if change is not None:
+        return Signal(Market.FUTURES, SignalCommand.CHANGE_STOPLOSS, symbol, stop_loss=change)
+    if not (symbol and side and entries and stop_loss is not None and target is not None):
+        return None
+    return Signal(Market.FUTURES, SignalCommand.TRADE_SIGNAL, symbol, side, entries, stop_loss, target)
+
+
+def parse_spot_signal(message: str) -> Signal | None:
+    """
+    Parse a spot signal in a single pass. Returns None if the message carries no symbol.
+    """
+    if '$' not in message:
+        return None
+
+    symbol = stop_loss = target = None
+    entries = []
+    try:
+        for entry, stoploss, target_token, symbol_token in SPOT_TOKENS.findall(message):
+            if entry:
+                entries.append(float(entry))
+            elif symbol_token:
+                if symbol is None:
+                    symbol = symbol_token + 'USDT'
+            elif stoploss:
+                if stop_loss is None:
+                    stop_loss = float(stoploss)
+            elif target_token:
+                if target is None:
+                    target = float(target_token)
+    except ValueError:
+        return None
+
+    if symbol is None:
+        return None
+    return Signal(Market.SPOT, SignalCommand.TRADE_SIGNAL, symbol, OrderSide.BUY.value, entries, stop_loss, target)
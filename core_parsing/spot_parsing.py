@@ -1,26 +1,19 @@
-import re
 from typing import Any
 
+from core_parsing.signal_parser import parse_spot_signal
+
 
 def parse_spot_message(message: str) -> dict[str, Any]:
     """
     Parse the Discord message to extract spot trading signals.
     """
-    try:
-        match = re.search(r'\$(\w+)', message)
-        symbol = match.group(1) + 'USDT' if match else None
-        entries = re.findall(r'Entry \d+ = \$([\d.]+)', message)
-        stop_loss_match = re.search(r'Stoploss:.*Below \$([\d.]+)', message)
-        stop_loss_price = float(stop_loss_match.group(1)) if stop_loss_match else None
-        final_target_match = re.search(r'Final Target: \$([\d.]+)', message)
-        final_target_price = float(final_target_match.group(1)) if final_target_match else None
-
-        return {
-            'symbol': symbol,
-            'entries': [float(entry) for entry in entries],
-            'stop_loss_price': stop_loss_price,
-            'final_target_price': final_target_price
-        }
+    signal = parse_spot_signal(message)
+    if signal is None:
+        return {'symbol': None, 'entries': [], 'stop_loss_price': None, 'final_target_price': None}
 
-    except Exception as e:
-        raise ValueError(f"Error parsing spot message: {e}")
+    return {
+        'symbol': signal.symbol,
+        'entries': signal.entries,
+        'stop_loss_price': signal.stop_loss,
+        'final_target_price': signal.target
+    }
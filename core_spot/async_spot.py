@@ -0,0 +1,44 @@
+from typing import Any
+
+from core_exchange.cancellation import CancelResult
+from core_exchange.executor import run_blocking
+from core_exchange.symbol_registry import SymbolFilters, SymbolRegistry
+from core_spot.ladder import LadderPlan, LadderResult
+from core_spot.spot import SpotClient
+from variables.constants import OrderType
+
+
+class AsyncSpotClient:
+    """Awaitable facade over SpotClient, running every call on the bounded exchange executor."""
+
+    def __init__(self, spot_client: SpotClient | None = None):
+        self.sync_client = spot_client or SpotClient()
+
+    @property
+    def symbols(self) -> SymbolRegistry:
+        return self.sync_client.symbols
+
+    async def get_symbol_filters(self, symbol: str) -> SymbolFilters | None:
+        return await run_blocking(self.sync_client.get_symbol_filters, symbol)
+
+    async def get_usdt_balance(self) -> float:
+        return await run_blocking(self.sync_client.get_usdt_balance)
+
+    async def place_spot_order(self, symbol: str, price: float, quantity: float,
+                               order_type: OrderType = OrderType.LIMIT) -> dict[str, Any] | None:
+        return await run_blocking(self.sync_client.place_spot_order, symbol, price, quantity, order_type)
+
+    async def calculate_quantity(self, symbol: str, price: float, leverage: int = 1) -> float:
+        return await run_blocking(self.sync_client.calculate_quantity, symbol, price, leverage)
+
+    async def size_ladder(self, symbol: str, entries: list[float], target: float | None = None) -> LadderPlan | None:
+        return await run_blocking(self.sync_client.size_ladder, symbol, entries, target)
+
+    async def place_ladder(self, plan: LadderPlan) -> LadderResult:
+        return await run_blocking(self.sync_client.place_ladder, plan)
+
+    async def cancel_open_orders(self, symbol: str) -> CancelResult:
+        return await run_blocking(self.sync_client.cancel_open_orders, symbol)
+
+    async def close_order_at_profit(self, symbol: str, quantity: float, price: float) -> dict[str, Any] | None:
+        return await run_blocking(self.sync_client.close_order_at_profit, symbol, quantity, price)
@@ -0,0 +1,102 @@
+import time
+from dataclasses import dataclass, field
+from decimal import ROUND_CEILING, Decimal
+
+from core_exchange.quantiser import to_decimal
+from core_exchange.symbol_registry import SymbolFilters
+from core_future.orders import OrderLeg
+from variables.constants import TradingConstants
+
+
+@dataclass(slots=True)
+class LadderLeg:
+    price: Decimal
+    quantity: Decimal
+
+    @property
+    def notional(self) -> Decimal:
+        return self.price * self.quantity
+
+
+@dataclass(slots=True)
+class LadderPlan:
+    """
+    Tick- and step-aligned limit buys for every entry of a spot signal, plus the take-profit sell.
+    """
+    symbol: str
+    balance: Decimal
+    entries: list[LadderLeg] = field(default_factory=list)
+    take_profit: LadderLeg | None = None
+
+    @property
+    def total_quantity(self) -> Decimal:
+        return sum((leg.quantity for leg in self.entries), Decimal(0))
+
+
+def size_leg(filters: SymbolFilters, budget: Decimal, price: Decimal) -> LadderLeg:
+    """
+    Size one limit order spending `budget` USDT at `price`, aligned to the symbol's filters.
+
+    The price is rounded to the nearest tick and the quantity floored to the step size. A quantity
+    under the minimum notional is raised to the smallest compliant one, and one over the maximum
+    notional is cut down to the largest.
+    """
+    quantiser = filters.quantiser
+    price = quantiser.round_price(price)
+    if not price:
+        return LadderLeg(price, Decimal(0))
+    quantity = quantiser.round_quantity(budget / price)
+    if quantity * price < filters.min_notional:
+        quantity = quantiser.round_quantity(filters.min_notional / price, ROUND_CEILING)
+    elif filters.max_notional is not None and quantity * price > filters.max_notional:
+        quantity = quantiser.round_quantity(filters.max_notional / price)
+    return LadderLeg(price, quantity)
+
+
+def size_ladder(filters: SymbolFilters, balance: Decimal, entries: list[float], target: float | None = None,
+                risk: Decimal = Decimal(str(TradingConstants.RISK_PERCENTAGE.value))) -> LadderPlan:
+    """
+    Size every entry of a ladder, and the take profit, from one balance and one set of filters.
+
+    Each entry commits `risk` of the balance, as `SpotClient.calculate_quantity` does for a single
+    price. The take profit sells what the entries buy, cut down only to the maximum notional.
+    """
+    budget = balance * risk
+    plan = LadderPlan(filters.symbol, balance,
+                      [size_leg(filters, budget, to_decimal(price)) for price in entries])
+    if target:
+        price = filters.quantiser.round_price(to_decimal(target))
+        quantity = plan.total_quantity
+        if filters.max_notional is not None and quantity * price > filters.max_notional:
+            quantity = filters.quantiser.round_quantity(filters.max_notional / price)
+        plan.take_profit = LadderLeg(price, quantity)
+    return plan
+
+
+@dataclass(slots=True)
+class LadderResult:
+    """
+    Per-leg outcome of a ladder submission.
+
+    `spread_ms` is the time between the first and the last acknowledged leg, i.e. how long the
+    later entries trailed the first one onto the book.
+    """
+    symbol: str
+    started_at: float = field(default_factory=time.perf_counter)
+    legs: dict[str, OrderLeg] = field(default_factory=dict)
+
+    @property
+    def placed(self) -> list[OrderLeg]:
+        return [leg for leg in self.legs.values() if leg.ok]
+
+    @property
+    def failed(self) -> list[OrderLeg]:
+        return [leg for leg in self.legs.values() if not leg.ok]
+
+    @property
+    def spread_ms(self) -> float:
+        acked = [leg.completed_at for leg in self.placed if leg.completed_at is not None]
+        return (max(acked) - min(acked)) * 1000 if acked else 0.0
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.started_at) * 1000
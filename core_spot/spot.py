@@ -1,111 +1,198 @@
 import logging
-import math
-import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
 from binance.client import Client
 from binance.exceptions import BinanceAPIException
-from dotenv import load_dotenv
 
-from variables.constants import EnvVariables, OrderType
+from core_exchange.cancellation import CancelResult, cancel_concurrently
+from core_exchange.quantiser import to_decimal
+from core_exchange.resilience import ResilientCaller, is_duplicate_order, new_client_order_id
+from core_exchange.symbol_registry import SymbolFilters, SymbolRegistry
+from core_exchange.transport import get_shared_client
+from core_exchange.validation import check_order
+from core_future.orders import OrderLeg
+from core_metrics.metrics import PRE_TRADE_REJECTIONS_TOTAL
+from core_spot.ladder import LadderPlan, LadderResult, size_ladder, size_leg
+from variables.constants import LadderConstants, OrderType, TradingConstants
 
-logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
 
 
 class SpotClient:
-    def __init__(self):
-        load_dotenv()
-        api_key = os.getenv(EnvVariables.BINANCE_API_KEY.value)
-        api_secret = os.getenv(EnvVariables.BINANCE_API_SECRET.value)
-        self.client = Client(api_key, api_secret)
+    def __init__(self, client: Client | None = None, symbol_registry: SymbolRegistry | None = None):
+        self.client = client or get_shared_client()
+        # An empty registry is falsy, so test for None rather than relying on `or`.
+        self.symbols = symbol_registry if symbol_registry is not None else SymbolRegistry(
+            self.client.get_exchange_info)
+        self._leg_executor = ThreadPoolExecutor(
+            max_workers=LadderConstants.MAX_CONCURRENT_LEGS.value, thread_name_prefix='spot-legs')
+        self.calls = ResilientCaller()
+
+    def get_symbol_filters(self, symbol: str) -> SymbolFilters | None:
+        """Get the cached exchange filters for a symbol."""
+        return self.symbols.get(symbol)
 
     def get_usdt_balance(self) -> float:
-        """Get the USDT balance of the account."""
-        try:
-            balance = self.client.get_asset_balance(asset='USDT')
-            return float(balance['free'])
-        except BinanceAPIException as e:
-            logging.error(f"Error retrieving USDT balance: {e}")
-            return 0.0
+        """
+        Get the free USDT balance of the account. Raises once retries are exhausted, rather than
+        reading as 0 and sizing orders off nothing.
+        """
+        balance = self.calls.call('account', self.client.get_asset_balance, asset='USDT')
+        return float(balance['free'])
 
     def place_spot_order(self, symbol: str, price: float, quantity: float, order_type: OrderType = OrderType.LIMIT) \
             -> dict[str, Any] | None:
-        """Place a spot order on Binance."""
+        """
+        Place a spot buy on Binance. The price is rounded to the tick and the quantity floored to the step
+        in Decimal, and the order is checked against the symbol filters before it is sent.
+        """
         try:
-            symbol_info = self.client.get_symbol_info(symbol)
-            price_filter = next((f for f in symbol_info['filters'] if f['filterType'] == 'PRICE_FILTER'), None)
-            if price_filter:
-                tick_size = float(price_filter['tickSize'])
-                adjusted_price = round(price / tick_size) * tick_size
-                decimal_places = int(abs(math.log10(tick_size)))
-                adjusted_price_str = "{:.{}f}".format(adjusted_price, decimal_places)
-
-                if order_type == OrderType.LIMIT:
-                    order = self.client.order_limit_buy(
-                        symbol=symbol,
-                        quantity=quantity,
-                        price=adjusted_price_str
-                    )
-                elif order_type == OrderType.MARKET:
-                    order = self.client.order_market_buy(
-                        symbol=symbol,
-                        quantity=quantity
-                    )
-                else:
-                    raise ValueError("Unsupported order type")
-
-                return order
-            else:
-                logging.error(f"No PRICE_FILTER found for symbol {symbol}")
+            if order_type not in (OrderType.LIMIT, OrderType.MARKET):
+                raise ValueError("Unsupported order type")
+            filters = self.get_symbol_filters(symbol)
+            if not filters or not filters.tick_size:
+                logger.error("No PRICE_FILTER found for symbol %s", symbol)
                 return None
+
+            market = order_type == OrderType.MARKET
+            quantiser = filters.quantiser
+            adjusted_price = quantiser.round_price(price)
+            adjusted_quantity = quantiser.round_quantity(quantity, market=market)
+            # A market order has no limit price; the given price only values it for the notional check.
+            violation = check_order(filters, 'BUY', adjusted_quantity, price=None if market else adjusted_price,
+                                    reference_price=adjusted_price if market else None, market=market)
+            if violation:
+                PRE_TRADE_REJECTIONS_TOTAL.inc(market='SPOT', filter=violation.filter)
+                logger.error("Spot order for %s not sent: %s", symbol, violation)
+                return None
+
+            quantity_str = quantiser.format_quantity(adjusted_quantity, market)
+            if market:
+                return self.calls.call('order', self.client.order_market_buy, symbol=symbol, quantity=quantity_str,
+                                       newClientOrderId=new_client_order_id())
+            return self.calls.call('order', self.client.order_limit_buy, symbol=symbol, quantity=quantity_str,
+                                   price=quantiser.format_price(adjusted_price),
+                                   newClientOrderId=new_client_order_id())
         except BinanceAPIException as e:
-            logging.error(f"Error placing spot order: {e}")
+            logger.error("Error placing spot order: %s", e)
             return None
 
     def calculate_quantity(self, symbol: str, price: float, leverage: int = 1) -> float:
         """Calculate the quantity to buy based on the USDT balance and price."""
+        filters = self.get_symbol_filters(symbol)
+        if not filters:
+            logger.error("Symbol info not found for %s", symbol)
+            return 0.0
+        budget = to_decimal(self.get_usdt_balance()) * to_decimal(TradingConstants.RISK_PERCENTAGE.value) * leverage
+        return float(size_leg(filters, budget, to_decimal(price)).quantity)
+
+    def size_ladder(self, symbol: str, entries: list[float], target: float | None = None) -> LadderPlan | None:
+        """
+        Size all entries of a spot signal and its take profit with one balance fetch and one filter lookup.
+        """
+        filters = self.get_symbol_filters(symbol)
+        if not filters:
+            logger.error("Symbol info not found for %s", symbol)
+            return None
+        return size_ladder(filters, to_decimal(self.get_usdt_balance()), entries, target)
+
+    def place_ladder(self, plan: LadderPlan) -> LadderResult:
+        """
+        Place every entry of a sized ladder, and its take profit, as concurrent limit orders.
+
+        Each leg is checked against the symbol filters first; a leg that would be rejected is not sent
+        and carries the reason instead. The rest go out together, each charged against the shared
+        rate-limit budget by the governed session.
+        """
+        result = LadderResult(plan.symbol)
+        filters = self.get_symbol_filters(plan.symbol)
+        format_quantity = filters.quantiser.format_quantity if filters else str
+        format_price = filters.quantiser.format_price if filters else str
+        legs = [(f'entry_{i}', 'BUY', leg) for i, leg in enumerate(plan.entries, 1)]
+        if plan.take_profit:
+            legs.append(('take_profit', 'SELL', plan.take_profit))
+
+        to_submit = []
+        for name, side, sized in legs:
+            leg = OrderLeg(name, {
+                'symbol': plan.symbol, 'side': side, 'type': 'LIMIT', 'timeInForce': 'GTC',
+                'quantity': format_quantity(sized.quantity), 'price': format_price(sized.price),
+            })
+            result.legs[name] = leg
+            violation = check_order(filters, side, sized.quantity, sized.price) if filters else None
+            if violation:
+                PRE_TRADE_REJECTIONS_TOTAL.inc(market='SPOT', filter=violation.filter)
+                leg.error = str(violation)
+            elif not filters:
+                leg.error = f"Symbol info not found for {plan.symbol}"
+            if leg.error:
+                logger.error("%s order for %s not sent: %s", name, plan.symbol, leg.error)
+            else:
+                to_submit.append(leg)
+
+        for future in [self._leg_executor.submit(self.__submit_leg, leg) for leg in to_submit]:
+            future.result()
+        logger.info("Placed %s of %s ladder orders for %s in %.1fms, spread %.1fms",
+                    len(result.placed), len(legs), plan.symbol, result.elapsed_ms(), result.spread_ms)
+        return result
+
+    def __submit_leg(self, leg: OrderLeg) -> OrderLeg:
+        started = time.perf_counter()
         try:
-            usdt_balance = self.get_usdt_balance()
-            amount_to_use = usdt_balance * 0.05
-            initial_quantity = (amount_to_use * leverage) / price
-            symbol_info = self.client.get_symbol_info(symbol)
-            lot_size_filter = next(f for f in symbol_info['filters'] if f['filterType'] == 'LOT_SIZE')
-            step_size = float(lot_size_filter['stepSize'])
-
-            notional_filter = next(f for f in symbol_info['filters'] if f['filterType'] == 'NOTIONAL')
-            min_notional = float(notional_filter['minNotional'])
-            max_notional = float(notional_filter['maxNotional']) if 'maxNotional' in notional_filter else float('inf')
-            quantity = math.floor(initial_quantity / step_size) * step_size
-            total_value = quantity * price
-            if total_value < min_notional:
-                quantity = math.ceil(min_notional / price / step_size) * step_size
-            elif total_value > max_notional:
-                quantity = math.floor(max_notional / price / step_size) * step_size
-
-            return round(quantity, 8)
+            leg.order = self.calls.call('order', self.client.create_order, **leg.params)
+        except Exception as e:
+            leg.error = str(e)
+            if is_duplicate_order(e):
+                self.__recover_leg(leg)
+        leg.completed_at = time.perf_counter()
+        leg.latency_ms = (leg.completed_at - started) * 1000
+        return leg
+
+    def __recover_leg(self, leg: OrderLeg) -> None:
+        """Look up a leg the exchange refused as a duplicate: an earlier attempt of it was placed."""
+        try:
+            leg.order = self.calls.call('getOrder', self.client.get_order, symbol=leg.params['symbol'],
+                                        origClientOrderId=leg.client_order_id)
+            leg.error = None
+        except Exception as e:
+            leg.error = f"{leg.error}; lookup of {leg.client_order_id} failed: {e}"
+
+    def cancel_open_orders(self, symbol: str) -> CancelResult:
+        """Cancel all open orders for a given symbol with a single cancel-all request."""
+        result = CancelResult(symbol)
+        try:
+            # python-binance has no wrapper for DELETE /api/v3/openOrders.
+            responses = self.calls.call('cancelOpenOrders', self.client._delete, 'openOrders', True,
+                                        data={'symbol': symbol})
+            result.requests += 1
+            for response in responses:
+                result.record(response)
+            logger.info("All open orders for %s have been canceled.", symbol)
+            return result
         except BinanceAPIException as e:
-            logging.error(f"Error calculating quantity: {e}")
-            return 0.0
+            result.requests += 1
+            if e.code == -2011:
+                # Unknown order sent: there was nothing open to cancel.
+                return result
+            logger.error("Cancel-all failed for %s, cancelling individually: %s", symbol, e)
 
-    def cancel_open_orders(self, symbol: str) -> None:
-        """Cancel all open orders for a given symbol."""
         try:
-            open_orders = self.client.get_open_orders(symbol=symbol)
-            for order in open_orders:
-                self.client.cancel_order(symbol=symbol, orderId=order['orderId'])
-            logging.info(f"All open orders for {symbol} have been canceled.")
+            open_orders = self.calls.call('openOrders', self.client.get_open_orders, symbol=symbol)
+            result.requests += 1
+            cancel_concurrently(lambda order_id: self.client.cancel_order(symbol=symbol, orderId=order_id),
+                                [order['orderId'] for order in open_orders], result)
         except BinanceAPIException as e:
-            logging.error(f"Error canceling orders: {e}")
+            result.error = str(e)
+            logger.error("Error canceling orders: %s", e)
+        return result
 
     def close_order_at_profit(self, symbol: str, quantity: float, price: float) -> dict[str, Any] | None:
         """Close an order at a specified profit price."""
         try:
-            order = self.client.order_limit_sell(
-                symbol=symbol,
-                quantity=quantity,
-                price=price
-            )
-            return order
+            return self.calls.call('order', self.client.order_limit_sell, symbol=symbol, quantity=quantity, price=price,
+                                   newClientOrderId=new_client_order_id())
         except BinanceAPIException as e:
-            logging.error(f"Error placing sell order: {e}")
+            logger.error("Error placing sell order: %s", e)
             return None
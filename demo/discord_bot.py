@@ -1,127 +1,199 @@
+import asyncio
+import functools
 import logging
 import os
+from typing import TYPE_CHECKING
 
 import discord
 from aiohttp import web
 from discord.ext import commands
-from dotenv import load_dotenv
 
-from core_future.future import FutureClient
-from core_parsing.future_parsing import parse_future_message
-from core_parsing.spot_parsing import parse_spot_message
-from core_spot.spot import SpotClient
-from variables.constants import EnvVariables, OrderType, TradingConstants
+from core_dispatch.dispatcher import SignalDispatcher, signal_priority
+from core_dispatch.execution import SignalExecutor
+from core_dispatch.replies import ReplyBuffer
+from core_dispatch.shards import ShardPool, get_shard_count
+from core_exchange.executor import shutdown_executor
+from core_journal.journal import SignalJournal
+from core_logging.logs import configure_logging
+from core_metrics.metrics import REGISTRY, ROUTED_MESSAGES_TOTAL, SIGNAL_QUEUE, SIGNAL_STAGE_SECONDS, span
+from core_metrics.startup import StartupReport
+from core_parsing.router import get_router
+from variables.constants import DispatcherConstants, EnvVariables
+from variables.environment import load_environment
 
-logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
+if TYPE_CHECKING:
+    from binance.client import Client
+
+    from core_accounts.accounts import AccountPool
+    from core_future.async_future import AsyncFutureClient
+    from core_spot.async_spot import AsyncSpotClient
+
+
+logger = logging.getLogger(__name__)
 
 
 class MyBot(commands.Bot):
-    def __init__(self, **kwargs):
+    """
+    Discord bot that parses trading signals and executes them on the configured Binance accounts.
+
+    By default signals are executed in this process by a SignalExecutor, which warms up the exchange
+    side while the gateway connects. With SIGNAL_EXECUTOR_PROCESSES set, the bot is only the gateway:
+    parsed signals are sharded by symbol across that many worker processes, which own the exchange
+    clients and send their replies back to be posted here.
+    """
+
+    def __init__(self, exchange_client: 'Client | None' = None, journal: SignalJournal | None = None,
+                 accounts: 'AccountPool | None' = None, processes: int | None = None, **kwargs):
+        self.startup = StartupReport()
+        self.startup.mark('imports')
         super().__init__(**kwargs)
-        self.future_client = FutureClient()
-        self.spot_client = SpotClient()
+        with self.startup.phase('journal_recovery'):
+            self.journal = journal or SignalJournal()
+        self.router = get_router()
+        self.dispatcher = SignalDispatcher()
+        self.replies = ReplyBuffer()
+        processes = get_shard_count() if processes is None else processes
+        self.shards = ShardPool(processes, self.replies, self.journal.path, on_ready=self.report_startup,
+                                journal=self.journal) if processes else None
+        self.executor = None if self.shards else SignalExecutor(
+            self.journal, self.replies, exchange_client, accounts, self.startup, on_ready=self.report_startup)
         self.app = web.Application()
         self.app.router.add_get('/health', self.health_check)
+        self.app.router.add_get('/metrics', self.metrics)
+        REGISTRY.add_collector(self.collect_gauges)
         self.runner = web.AppRunner(self.app)
 
+    @property
+    def accounts(self) -> 'AccountPool | None':
+        return self.executor.accounts if self.executor else None
+
+    @property
+    def exchange_ready(self) -> asyncio.Event:
+        return self.shards.ready if self.shards else self.executor.exchange_ready
+
+    @property
+    def exchange_client(self) -> 'Client':
+        return self.accounts.primary.client
+
+    @property
+    def future_client(self) -> 'AsyncFutureClient':
+        return self.accounts.primary.future_client
+
+    @property
+    def spot_client(self) -> 'AsyncSpotClient':
+        return self.accounts.primary.spot_client
+
     async def setup_hook(self):
+        self.startup.mark('discord_login')
+        for signal in self.journal.interrupted:
+            logger.warning("Signal %s (%s %s) was interrupted by a restart and will not be replayed",
+                           signal['message_id'], signal['command'], signal['symbol'])
+        # discord.py connects the gateway only once setup_hook returns, so the exchange side warms up alongside it.
+        if self.shards:
+            self.shards.start()
+        else:
+            self.dispatcher.start()
+            self.executor.start()
         await self.start_health_check_server()
 
+    def report_startup(self) -> None:
+        if self.exchange_ready.is_set() and self.is_ready():
+            self.startup.finish()
+
+    async def close(self):
+        try:
+            # Let queued and running signals finish, so the orders they place are journaled.
+            await asyncio.wait_for(self.dispatcher.join(), DispatcherConstants.DRAIN_TIMEOUT_SECONDS.value)
+        except TimeoutError:
+            logger.error("Signals still running after %ss are cancelled; they will show as interrupted",
+                         DispatcherConstants.DRAIN_TIMEOUT_SECONDS.value)
+        await self.dispatcher.stop()
+        if self.shards:
+            await self.shards.stop()
+        await self.replies.drain()
+        await self.replies.stop()
+        if self.executor:
+            await self.executor.close()
+        await super().close()
+        await self.runner.cleanup()
+        shutdown_executor()
+        self.journal.close()
+
     async def start_health_check_server(self):
         await self.runner.setup()
         site = web.TCPSite(self.runner, '0.0.0.0', 8080)
         await site.start()
 
     async def health_check(self, _):
-        return web.json_response({'status': 'ok'})
+        return web.json_response({
+            'status': 'ok' if self.exchange_ready.is_set() else 'starting',
+            'rate_limits': self.executor.rate_limits() if self.executor else {},
+            'signal_queue': self.shards.metrics() if self.shards else self.dispatcher.metrics(),
+            'startup': self.startup.as_dict(),
+        })
+
+    async def metrics(self, _):
+        return web.Response(text=REGISTRY.render(), content_type='text/plain')
+
+    def collect_gauges(self) -> None:
+        for field, value in (self.shards or self.dispatcher).metrics().items():
+            SIGNAL_QUEUE.set(value, field=field)
+        if self.executor:
+            self.executor.collect_gauges()
 
     async def on_ready(self):
-        logging.info(f'{self.user.name} has connected to Discord!')
+        logger.info("%s has connected to Discord!", self.user.name)
+        if self.startup.ready_ms is None:
+            self.startup.mark('gateway_ready')
+            self.report_startup()
 
     async def on_message(self, message: discord.Message):
         if message.author == self.user:
             return
 
-        if message.content.startswith('$'):
-            if 'LONG' in message.content or 'SHORT' in message.content:
-                await self.handle_future_message(message)
-            else:
-                await self.handle_spot_message(message)
+        await self.dispatch_signal(message)
 
         await self.process_commands(message)
 
-    async def handle_future_message(self, message: discord.Message):
-        try:
-            command, symbol, side, entry_price, stop_loss_price, target_price = parse_future_message(message.content)
-
-            if command == 'CLOSE_ORDER':
-                await message.channel.send(f"Closing all open positions for {symbol}")
-                self.future_client.close_order_in_profit(symbol)
-                await message.channel.send(f"Closed all open positions for {symbol}")
-
-            elif command == 'CHANGE_STOPLOSS':
-                await message.channel.send(f"Changing stop loss for {symbol} to {stop_loss_price}")
-                self.future_client.change_stop_loss(symbol, stop_loss_price)
-                await message.channel.send(f"Changed stop loss for {symbol} to {stop_loss_price}")
-
-            elif command == 'TRADE_SIGNAL':
-                await message.channel.send(f"Canceling open futures orders for {symbol}")
-                self.future_client.cancel_open_futures_orders(symbol)
-
-                leverage = TradingConstants.LEVERAGE.value
-                portfolio_percentage = TradingConstants.RISK_PERCENTAGE.value
-
-                total_balance = self.future_client.get_account_balance()
-                logging.info(f"Total balance: {total_balance}")
-                logging.info(f"Trade amount: {total_balance * portfolio_percentage}")
-
-                quantity = self.future_client.calculate_quantity(total_balance, entry_price, leverage, symbol)
-                logging.info(f"Calculated quantity: {quantity}")
-                logging.info(
-                    f"Entry price: {entry_price}, Stop loss price: {stop_loss_price}, Target price: {target_price}")
-
-                self.future_client.set_leverage(symbol, leverage)
-                self.future_client.place_order(symbol, side, quantity, entry_price, stop_loss_price, target_price)
-
-                await message.channel.send(f"Placed futures order for {symbol}")
-
-        except Exception as e:
-            logging.error(f"Error processing future message: {e}")
-            await message.channel.send(f"Error processing message: {str(e)}")
-
-    async def handle_spot_message(self, message: discord.Message):
-        try:
-            parsed_info = parse_spot_message(message.content)
-
-            if parsed_info['symbol']:
-                symbol = parsed_info['symbol']
-                entry_prices = parsed_info['entries']
-
-                await message.channel.send(f"Canceling open orders for {symbol}")
-                self.spot_client.cancel_open_orders(symbol)
-
-                for price in entry_prices:
-                    quantity = self.spot_client.calculate_quantity(symbol, price)
-                    order = self.spot_client.place_spot_order(symbol, price, quantity, order_type=OrderType.LIMIT)
-                    await message.channel.send(f"Placed order: {order}")
-
-                if parsed_info['final_target_price']:
-                    final_target_price = parsed_info['final_target_price']
-                    quantity_to_sell = self.spot_client.calculate_quantity(symbol, final_target_price)
-                    await message.channel.send(f"Calculated quantity to sell: {quantity_to_sell}")
-                    await message.channel.send(f"Intention to sell {quantity_to_sell} {symbol} at {final_target_price}")
-                    close_order = self.spot_client.close_order_at_profit(symbol, quantity_to_sell, final_target_price)
-                    await message.channel.send(f"Placed sell order: {close_order}")
-
-        except Exception as e:
-            logging.error(f"Error processing spot message: {e}")
-            await message.channel.send(f"Error processing message: {str(e)}")
+    async def dispatch_signal(self, message: discord.Message):
+        """
+        Route a message to the parsers of its channel and queue the signal's handler behind earlier
+        signals for the same symbol. Messages that are not signals are dropped before any parsing.
+        """
+        with span('parse'):
+            result = self.router.route(message.channel.id, message.content)
+        if result is None:
+            ROUTED_MESSAGES_TOTAL.inc(parser='', outcome='dropped')
+            return
+        SIGNAL_STAGE_SECONDS.observe((discord.utils.utcnow() - message.created_at).total_seconds(),
+                                     stage='discord_receive')
+        if result.malformed:
+            ROUTED_MESSAGES_TOTAL.inc(parser=result.parser.name, outcome='malformed')
+            logger.error("Error processing %s message: Message format is incorrect or missing information",
+                         result.parser.name)
+            self.replies.send(message.channel,
+                              "Error processing message: Message format is incorrect or missing information")
+            return
+        ROUTED_MESSAGES_TOTAL.inc(parser=result.parser.name, outcome='parsed')
+        signal = result.signal
+        if not self.journal.claim(message.id, message.channel.id, signal):
+            logger.info("Ignoring already handled message %s", message.id)
+            return
+        if self.shards:
+            # The worker owning the symbol keeps its signals in order, as a local lane would.
+            self.shards.submit(message, signal)
+            return
+        self.executor.track(signal)
+        self.dispatcher.submit(signal.symbol, signal_priority(signal),
+                               functools.partial(self.executor.handle, message, signal))
 
 
 if __name__ == "__main__":
-    load_dotenv()
+    load_environment()
+    configure_logging()
     token = os.getenv(EnvVariables.DISCORD_BOT_TOKEN.value)
     intents = discord.Intents.default()
     intents.message_content = True
     bot = MyBot(command_prefix='$', intents=intents)
-    bot.run(token)
+    # Logging is already set up; discord.py would otherwise add a synchronous handler of its own.
+    bot.run(token, log_handler=None)
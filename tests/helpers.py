@@ -0,0 +1,8 @@
+class FakeClock:
+    """A clock for time-driven code under test: it only moves when a test advances `now`."""
+
+    def __init__(self, now: float = 0.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
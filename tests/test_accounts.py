@@ -0,0 +1,60 @@
+import asyncio
+import os
+import unittest
+from unittest.mock import MagicMock, patch
+
+from core_accounts.accounts import Account, AccountConfig, AccountPool, load_accounts
+from core_exchange.transport import PooledClient
+
+
+class TestLoadAccounts(unittest.TestCase):
+
+    @patch.dict(os.environ, {'BINANCE_ACCOUNTS': 'main, sub', 'BINANCE_API_KEY_MAIN': 'k1',
+                             'BINANCE_API_SECRET_MAIN': 's1', 'BINANCE_API_KEY_SUB': 'k2',
+                             'BINANCE_API_SECRET_SUB': 's2'})
+    def test_named_accounts(self):
+        self.assertEqual(load_accounts(), [AccountConfig('main', 'k1', 's1'), AccountConfig('sub', 'k2', 's2')])
+
+    @patch.dict(os.environ, {'BINANCE_ACCOUNTS': '', 'BINANCE_API_KEY': 'key', 'BINANCE_API_SECRET': 'secret'})
+    def test_single_account_by_default(self):
+        self.assertEqual(load_accounts(), [AccountConfig('default', 'key', 'secret')])
+
+
+class TestAccountPool(unittest.IsolatedAsyncioTestCase):
+
+    @patch.object(PooledClient, 'ping')
+    def test_accounts_share_pool_registries_and_weight(self, _):
+        pool = AccountPool.from_configs([AccountConfig('main', 'k1', 's1'), AccountConfig('sub', 'k2', 's2')])
+        main, sub = pool
+
+        self.assertIs(main.client.session.get_adapter('https://fapi.binance.com'),
+                      sub.client.session.get_adapter('https://fapi.binance.com'))
+        self.assertEqual(sub.client.session.headers['X-MBX-APIKEY'], 'k2')
+        self.assertIs(main.future_client.symbols, sub.future_client.symbols)
+        self.assertEqual(len(pool.symbol_registries), 2)
+        self.assertIs(main.governor.weights, sub.governor.weights)
+        self.assertIsNot(main.governor.orders, sub.governor.orders)
+
+    async def test_fan_out_runs_accounts_concurrently(self):
+        pool = AccountPool([Account(name, MagicMock()) for name in ('main', 'sub', 'third')])
+        started = asyncio.Event()
+        running = []
+
+        async def action(account: Account) -> str:
+            running.append(account.name)
+            if len(running) == 3:
+                started.set()
+            await asyncio.wait_for(started.wait(), 1)
+            if account.name == 'sub':
+                raise ValueError('insufficient margin')
+            return account.name
+
+        outcomes = await pool.fan_out(action, market='FUTURES')
+
+        self.assertEqual([outcome.result for outcome in outcomes], ['main', None, 'third'])
+        self.assertEqual(str(outcomes[1].error), 'insufficient margin')
+        self.assertTrue(all(outcome.latency_ms > 0 for outcome in outcomes))
+
+
+if __name__ == '__main__':
+    unittest.main()
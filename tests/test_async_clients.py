@@ -0,0 +1,70 @@
+import asyncio
+import threading
+import unittest
+from unittest.mock import MagicMock
+
+from core_future.async_future import AsyncFutureClient
+from core_future.stops import StopChange
+from core_spot.async_spot import AsyncSpotClient
+
+
+class TestAsyncClients(unittest.IsolatedAsyncioTestCase):
+
+    async def test_future_calls_run_off_the_event_loop(self):
+        loop_thread = threading.get_ident()
+        sync_client = MagicMock()
+        sync_client.get_account_balance.side_effect = lambda: threading.get_ident()
+        client = AsyncFutureClient(sync_client)
+
+        self.assertNotEqual(await client.get_account_balance(), loop_thread)
+
+    async def test_blocking_calls_overlap(self):
+        barrier = threading.Barrier(2, timeout=2)
+        sync_client = MagicMock()
+        sync_client.cancel_open_orders.side_effect = lambda symbol: barrier.wait()
+        client = AsyncSpotClient(sync_client)
+
+        # Both calls must be in flight at once for the barrier to release.
+        await asyncio.gather(client.cancel_open_orders('BTCUSDT'), client.cancel_open_orders('ETHUSDT'))
+        self.assertEqual(sync_client.cancel_open_orders.call_count, 2)
+
+    async def test_concurrent_stop_changes_are_coalesced(self):
+        sync_client = MagicMock()
+        sync_client.change_stop_losses.side_effect = lambda new_stops: {
+            symbol: StopChange(symbol, price) for symbol, price in new_stops.items()}
+        client = AsyncFutureClient(sync_client)
+
+        btc, eth = await asyncio.gather(
+            client.change_stop_loss('BTCUSDT', 49000), client.change_stop_loss('ETHUSDT', 3000))
+
+        sync_client.change_stop_losses.assert_called_once_with({'BTCUSDT': 49000, 'ETHUSDT': 3000})
+        self.assertEqual((btc.symbol, eth.stop_price), ('BTCUSDT', 3000))
+
+    async def test_cancelled_stop_change_does_not_break_the_batch(self):
+        started, release = threading.Event(), threading.Event()
+
+        def change_stop_losses(new_stops):
+            started.set()
+            release.wait(2)
+            return {symbol: StopChange(symbol, price) for symbol, price in new_stops.items()}
+
+        sync_client = MagicMock()
+        sync_client.change_stop_losses.side_effect = change_stop_losses
+        client = AsyncFutureClient(sync_client)
+        btc = asyncio.create_task(client.change_stop_loss('BTCUSDT', 49000))
+        eth = asyncio.create_task(client.change_stop_loss('ETHUSDT', 3000))
+        await asyncio.sleep(0)
+        flush = client._stop_flush
+        await asyncio.to_thread(started.wait, 2)
+
+        btc.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await btc
+        release.set()
+
+        self.assertEqual((await asyncio.wait_for(eth, 2)).stop_price, 3000)
+        await flush
+
+
+if __name__ == '__main__':
+    unittest.main()
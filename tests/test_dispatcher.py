@@ -0,0 +1,102 @@
+import asyncio
+import unittest
+from unittest.mock import MagicMock
+
+import discord
+
+from core_dispatch.dispatcher import SignalDispatcher, SignalPriority, signal_priority
+from core_journal.journal import SignalJournal
+from core_parsing.signal_parser import parse_future_signal
+from demo.discord_bot import MyBot
+
+
+class TestSignalDispatcher(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.events = []
+
+    def job(self, name: str, delay: float = 0.0):
+        async def handler():
+            self.events.append(f'start {name}')
+            await asyncio.sleep(delay)
+            self.events.append(f'end {name}')
+        return handler
+
+    async def test_same_symbol_runs_in_order(self):
+        dispatcher = SignalDispatcher(workers=4)
+        dispatcher.start()
+        dispatcher.submit('BTCUSDT', SignalPriority.ENTRY, self.job('entry', 0.02))
+        dispatcher.submit('BTCUSDT', SignalPriority.PROTECTIVE, self.job('close'))
+        await asyncio.wait_for(dispatcher.join(), 2)
+        await dispatcher.stop()
+
+        self.assertEqual(self.events, ['start entry', 'end entry', 'start close', 'end close'])
+
+    async def test_different_symbols_run_in_parallel(self):
+        dispatcher = SignalDispatcher(workers=4)
+        dispatcher.start()
+        dispatcher.submit('BTCUSDT', SignalPriority.ENTRY, self.job('btc', 0.02))
+        dispatcher.submit('ETHUSDT', SignalPriority.ENTRY, self.job('eth', 0.02))
+        await asyncio.wait_for(dispatcher.join(), 2)
+        await dispatcher.stop()
+
+        self.assertEqual(self.events[:2], ['start btc', 'start eth'])
+
+    async def test_protective_signals_jump_the_queue(self):
+        dispatcher = SignalDispatcher(workers=1)
+        dispatcher.submit('BTCUSDT', SignalPriority.ENTRY, self.job('btc entry'))
+        dispatcher.submit('ETHUSDT', SignalPriority.ENTRY, self.job('eth entry'))
+        dispatcher.submit('SOLUSDT', SignalPriority.PROTECTIVE, self.job('sol close'))
+        self.assertEqual(dispatcher.depth, 3)
+        dispatcher.start()
+        await asyncio.wait_for(dispatcher.join(), 2)
+        await dispatcher.stop()
+
+        self.assertEqual(self.events[0], 'start sol close')
+        metrics = dispatcher.metrics()
+        self.assertEqual(metrics['completed'], 3)
+        self.assertEqual(metrics['depth'], 0)
+        self.assertGreater(metrics['wait_max_ms'], 0)
+
+    async def test_failed_handler_does_not_stop_the_lane(self):
+        async def broken():
+            raise RuntimeError('boom')
+
+        dispatcher = SignalDispatcher(workers=1)
+        dispatcher.start()
+        dispatcher.submit('BTCUSDT', SignalPriority.ENTRY, broken)
+        dispatcher.submit('BTCUSDT', SignalPriority.ENTRY, self.job('next'))
+        await asyncio.wait_for(dispatcher.join(), 2)
+        await dispatcher.stop()
+
+        self.assertEqual(dispatcher.failed, 1)
+        self.assertEqual(self.events, ['start next', 'end next'])
+
+    def test_signal_priority(self):
+        self.assertEqual(signal_priority(parse_future_signal('$BTC Close Order')), SignalPriority.PROTECTIVE)
+        self.assertEqual(signal_priority(parse_future_signal(
+            '$BTC LONG\nEntry 1 = $1\nStoploss: 4H Close Below $0.9\nTarget: $2')), SignalPriority.ENTRY)
+
+
+
+class TestBotShutdown(unittest.IsolatedAsyncioTestCase):
+
+    async def test_close_lets_running_signals_finish(self):
+        bot = MyBot(MagicMock(), journal=SignalJournal(':memory:'), processes=0, command_prefix='$',
+                    intents=discord.Intents.default())
+        bot.dispatcher.start()
+        events = []
+
+        async def handler():
+            await asyncio.sleep(0.05)
+            events.append('journaled')
+
+        bot.dispatcher.submit('BTCUSDT', SignalPriority.ENTRY, handler)
+        await asyncio.sleep(0)
+        await bot.close()
+
+        self.assertEqual(events, ['journaled'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+
+from core_accounts.accounts import AccountPool
+from core_dispatch.execution import SignalExecutor
+from core_dispatch.replies import ReplyBuffer
+from core_journal.journal import SignalJournal
+
+ACCOUNT = {
+    'assets': [{'asset': 'USDT', 'walletBalance': '1000', 'availableBalance': '800'}],
+    'positions': [{'symbol': 'BTCUSDT', 'positionAmt': '0.010', 'entryPrice': '64000', 'positionSide': 'BOTH'}],
+}
+
+OPEN_ORDERS = [{
+    'symbol': 'BTCUSDT', 'orderId': 11, 'clientOrderId': 'sl', 'side': 'SELL', 'type': 'STOP_MARKET',
+    'status': 'NEW', 'price': '0', 'stopPrice': '62900', 'origQty': '0.010',
+}]
+
+POSITION_CLOSED = {'e': 'ACCOUNT_UPDATE', 'a': {'B': [], 'P': [{'s': 'BTCUSDT', 'pa': '0', 'ep': '0', 'ps': 'BOTH'}]}}
+
+STOP_FILLED = {'e': 'ORDER_TRADE_UPDATE', 'o': {
+    's': 'BTCUSDT', 'i': 11, 'c': 'sl', 'S': 'SELL', 'o': 'STOP_MARKET', 'X': 'FILLED',
+    'p': '0', 'sp': '62900', 'q': '0.010'}}
+
+
+class TestPinnedSymbols(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.journal = SignalJournal(os.path.join(self.directory.name, 'journal.db'))
+        client = MagicMock()
+        client.futures_account.return_value = ACCOUNT
+        client.futures_get_open_orders.return_value = OPEN_ORDERS
+        self.executor = SignalExecutor(self.journal, ReplyBuffer(), accounts=AccountPool.single(client))
+        self.executor.restore_orders()
+        self.state = self.executor.accounts.primary.account_state
+        self.state.resync(client)
+        self.executor.price_stream.track('BTCUSDT', pin=True)
+
+    async def asyncTearDown(self):
+        self.journal.close()
+        self.directory.cleanup()
+
+    async def test_symbol_is_unpinned_when_its_last_order_closes(self):
+        self.state.apply(POSITION_CLOSED)
+        self.assertEqual(self.executor.price_stream.pinned, {'BTCUSDT'})
+
+        self.state.apply(STOP_FILLED)
+
+        self.assertEqual(self.executor.price_stream.pinned, set())
+        self.assertIn('BTCUSDT', self.executor.price_stream.symbols)
+
+    async def test_symbol_stays_pinned_while_a_position_is_open(self):
+        self.state.apply(STOP_FILLED)
+        self.assertEqual(self.executor.price_stream.pinned, {'BTCUSDT'})
+
+    async def test_nothing_is_unpinned_while_out_of_sync(self):
+        self.state.apply(POSITION_CLOSED)
+        self.state.apply(STOP_FILLED)
+        self.executor.price_stream.track('BTCUSDT', pin=True)
+        self.state.invalidate()
+
+        self.executor.release_if_idle('BTCUSDT')
+
+        self.assertEqual(self.executor.price_stream.pinned, {'BTCUSDT'})
+
+
+if __name__ == '__main__':
+    unittest.main()
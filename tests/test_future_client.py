@@ -0,0 +1,377 @@
+import threading
+import unittest
+from unittest.mock import ANY, MagicMock
+
+import requests
+
+from core_exchange.account_state import AccountState
+from core_exchange.symbol_registry import SymbolRegistry
+from core_future.future import FutureClient
+
+BTC_INFO = {
+    'symbol': 'BTCUSDT',
+    'filters': [
+        {'filterType': 'PRICE_FILTER', 'minPrice': '556.80', 'maxPrice': '4529764', 'tickSize': '0.10'},
+        {'filterType': 'LOT_SIZE', 'minQty': '0.001', 'maxQty': '1000', 'stepSize': '0.001'},
+        {'filterType': 'MIN_NOTIONAL', 'notional': '100'},
+    ],
+}
+
+ETH_INFO = {
+    'symbol': 'ETHUSDT',
+    'filters': [
+        {'filterType': 'PRICE_FILTER', 'minPrice': '39.86', 'maxPrice': '306177', 'tickSize': '0.01'},
+        {'filterType': 'LOT_SIZE', 'minQty': '0.001', 'maxQty': '10000', 'stepSize': '0.001'},
+        {'filterType': 'MIN_NOTIONAL', 'notional': '20'},
+    ],
+}
+
+
+def make_client() -> tuple[FutureClient, MagicMock]:
+    mock_client = MagicMock()
+    mock_client.futures_exchange_info.return_value = {'symbols': [BTC_INFO]}
+    mock_client.futures_account.return_value = {'availableBalance': '10000'}
+    mock_client.futures_create_order.return_value = {'orderId': 1}
+    future_client = FutureClient(mock_client, SymbolRegistry(mock_client.futures_exchange_info))
+    return future_client, mock_client
+
+
+class TestPlaceOrder(unittest.TestCase):
+
+    def test_bracket_uses_batch_endpoint(self):
+        future_client, mock_client = make_client()
+        mock_client.futures_place_batch_order.return_value = [{'orderId': 2}, {'orderId': 3}]
+
+        result = future_client.place_order('BTCUSDT', 'BUY', 0.01, 50000, 49000.05, 51000.07)
+
+        mock_client.futures_create_order.assert_called_once_with(
+            symbol='BTCUSDT', side='BUY', type='MARKET', quantity='0.01', newClientOrderId=ANY)
+        batch = mock_client.futures_place_batch_order.call_args.kwargs['batchOrders']
+        self.assertEqual(batch[0]['type'], 'STOP_MARKET')
+        self.assertEqual(batch[0]['stopPrice'], '49000')
+        self.assertEqual(batch[1]['price'], '51000')
+        self.assertEqual([order['reduceOnly'] for order in batch], ['true', 'true'])
+        self.assertTrue(result.is_protected)
+        self.assertEqual(result.take_profit.order, {'orderId': 3})
+        self.assertIsNotNone(result.protected_ms)
+
+    def test_rejected_leg_is_reported(self):
+        future_client, mock_client = make_client()
+        mock_client.futures_place_batch_order.return_value = [
+            {'code': -2021, 'msg': 'Order would immediately trigger.'}, {'orderId': 3}]
+
+        result = future_client.place_order('BTCUSDT', 'BUY', 0.01, 50000, 49000, 51000)
+
+        self.assertFalse(result.is_protected)
+        self.assertEqual(result.stop_loss.error, 'Order would immediately trigger.')
+
+    def test_failed_batch_falls_back_to_single_orders(self):
+        future_client, mock_client = make_client()
+        mock_client.futures_place_batch_order.side_effect = Exception('timeout')
+
+        result = future_client.place_order('BTCUSDT', 'SELL', 0.01, 50000, 51000, 49000)
+
+        self.assertEqual(mock_client.futures_create_order.call_count, 3)
+        self.assertTrue(result.is_protected)
+
+    def test_duplicate_leg_is_looked_up_by_client_order_id(self):
+        future_client, mock_client = make_client()
+        mock_client.futures_place_batch_order.return_value = [
+            {'code': -4116, 'msg': 'ClientOrderId is duplicated.'}, {'orderId': 3}]
+        mock_client.futures_get_order.return_value = {'orderId': 2}
+
+        result = future_client.place_order('BTCUSDT', 'BUY', 0.01, 50000, 49000, 51000)
+
+        mock_client.futures_get_order.assert_called_once_with(
+            symbol='BTCUSDT', origClientOrderId=result.stop_loss.client_order_id)
+        self.assertTrue(result.is_protected)
+
+    def test_transient_balance_failure_is_retried_then_raised(self):
+        future_client, mock_client = make_client()
+        future_client.calls._sleep = lambda _: None
+        mock_client.futures_account_balance.side_effect = requests.exceptions.ConnectTimeout()
+
+        with self.assertRaises(requests.exceptions.ConnectTimeout):
+            future_client.get_account_balance()
+        self.assertEqual(mock_client.futures_account_balance.call_count, future_client.calls.attempts)
+
+    def test_insufficient_margin_places_nothing(self):
+        future_client, mock_client = make_client()
+        mock_client.futures_account.return_value = {'availableBalance': '1'}
+
+        result = future_client.place_order('BTCUSDT', 'BUY', 0.01, 50000, 49000, 51000)
+
+        mock_client.futures_create_order.assert_not_called()
+        self.assertEqual(list(result.legs), ['entry'])
+        self.assertIn('(MARGIN)', result.entry.error)
+
+    def test_small_bracket_exits_are_not_held_to_min_notional(self):
+        future_client, mock_client = make_client()
+        mock_client.futures_place_batch_order.return_value = [{'orderId': 2}, {'orderId': 3}]
+
+        result = future_client.place_order('BTCUSDT', 'SELL', 0.002, 50000, 51000, 48000)
+
+        self.assertTrue(result.entry.ok)
+        self.assertTrue(result.is_protected)
+        self.assertTrue(result.take_profit.ok)
+
+    def test_unreadable_margin_fails_the_entry(self):
+        future_client, mock_client = make_client()
+        future_client.calls._sleep = lambda _: None
+        mock_client.futures_account.side_effect = requests.exceptions.ReadTimeout('read timed out')
+
+        result = future_client.place_order('BTCUSDT', 'BUY', 0.01, 50000, 49000, 51000)
+
+        mock_client.futures_create_order.assert_not_called()
+        self.assertFalse(result.entry.ok)
+        self.assertIn('read timed out', result.entry.error)
+
+    def test_unknown_symbol_fails_the_entry(self):
+        future_client, mock_client = make_client()
+
+        result = future_client.place_order('DOGEUSDT', 'BUY', 100, 0.1, 0.09, 0.11)
+
+        self.assertEqual(result.entry.error, 'Symbol info not found for DOGEUSDT')
+
+    def test_margin_is_leverage_adjusted(self):
+        future_client, mock_client = make_client()
+        mock_client.futures_account.return_value = {'availableBalance': '150'}
+        mock_client.futures_place_batch_order.return_value = [{'orderId': 2}, {'orderId': 3}]
+
+        result = future_client.place_order('BTCUSDT', 'BUY', 0.01, 50000, 49000, 51000, leverage=5)
+
+        self.assertTrue(result.entry.ok)
+        self.assertTrue(result.is_protected)
+
+    def test_invalid_stop_loss_places_nothing(self):
+        future_client, mock_client = make_client()
+
+        result = future_client.place_order('BTCUSDT', 'BUY', 0.01, 50000, 100, 51000)
+
+        mock_client.futures_create_order.assert_not_called()
+        self.assertIn('(PRICE_FILTER)', result.entry.error)
+
+    def test_take_profit_outside_percent_price_is_left_out(self):
+        future_client, mock_client = make_client()
+        mock_client.futures_exchange_info.return_value = {'symbols': [{**BTC_INFO, 'filters': [
+            *BTC_INFO['filters'],
+            {'filterType': 'PERCENT_PRICE', 'multiplierUp': '1.0500', 'multiplierDown': '0.9500'}]}]}
+        mock_client.futures_place_batch_order.return_value = [{'orderId': 2}]
+
+        result = future_client.place_order('BTCUSDT', 'BUY', 0.01, 50000, 49000, 60000)
+
+        batch = mock_client.futures_place_batch_order.call_args.kwargs['batchOrders']
+        self.assertEqual([order['type'] for order in batch], ['STOP_MARKET'])
+        self.assertTrue(result.is_protected)
+        self.assertIn('(PERCENT_PRICE)', result.take_profit.error)
+
+
+class TestCancelOpenFuturesOrders(unittest.TestCase):
+
+    def test_cancels_in_batches_of_ten(self):
+        future_client, mock_client = make_client()
+        mock_client.futures_get_open_orders.return_value = [{'orderId': i} for i in range(12)]
+        mock_client.futures_cancel_orders.side_effect = lambda symbol, orderIdList: [
+            {'orderId': int(order_id)} for order_id in orderIdList.strip('[]').split(',')]
+
+        result = future_client.cancel_open_futures_orders('BTCUSDT')
+
+        self.assertEqual(mock_client.futures_cancel_orders.call_count, 2)
+        mock_client.futures_cancel_order.assert_not_called()
+        self.assertEqual(sorted(result.cancelled), list(range(12)))
+        self.assertEqual(result.requests, 3)
+        self.assertTrue(result.ok)
+
+    def test_failed_batch_falls_back_to_single_cancels(self):
+        future_client, mock_client = make_client()
+        mock_client.futures_get_open_orders.return_value = [{'orderId': 1}, {'orderId': 2}]
+        mock_client.futures_cancel_orders.side_effect = Exception('timeout')
+        mock_client.futures_cancel_order.side_effect = lambda symbol, orderId: {'orderId': orderId}
+
+        result = future_client.cancel_open_futures_orders('BTCUSDT')
+
+        self.assertEqual(sorted(result.cancelled), [1, 2])
+
+
+class TestAccountStateReads(unittest.TestCase):
+
+    def test_synced_state_replaces_rest_calls(self):
+        future_client, mock_client = make_client()
+        future_client.account_state = AccountState()
+        mock_client.futures_account.return_value = {
+            'assets': [{'asset': 'USDT', 'walletBalance': '1000', 'availableBalance': '800'}],
+            'positions': [{'symbol': 'BTCUSDT', 'positionAmt': '0.010', 'entryPrice': '64000'}],
+        }
+        mock_client.futures_get_open_orders.return_value = []
+        future_client.account_state.resync(mock_client)
+        mock_client.reset_mock()
+
+        self.assertEqual(future_client.get_account_balance(), 1000.0)
+        self.assertEqual(future_client.get_available_margin(), 800.0)
+        future_client.close_order_in_profit('BTCUSDT')
+
+        mock_client.futures_account_balance.assert_not_called()
+        mock_client.futures_account.assert_not_called()
+        mock_client.futures_position_information.assert_not_called()
+        mock_client.futures_create_order.assert_called_once_with(
+            symbol='BTCUSDT', side='SELL', type='MARKET', quantity='0.01', reduceOnly='true', newClientOrderId=ANY)
+
+    def test_unknown_available_margin_is_read_from_rest(self):
+        future_client, mock_client = make_client()
+        future_client.account_state = AccountState()
+        mock_client.futures_account.return_value = {
+            'assets': [{'asset': 'USDT', 'walletBalance': '1000', 'availableBalance': '800'}], 'positions': []}
+        mock_client.futures_get_open_orders.return_value = []
+        future_client.account_state.resync(mock_client)
+        future_client.account_state.apply({'e': 'ACCOUNT_UPDATE', 'a': {'B': [{'a': 'USDT', 'wb': '1000'}]}})
+        mock_client.futures_account.return_value = {'availableBalance': '300'}
+
+        self.assertEqual(future_client.get_available_margin(), 300.0)
+
+    def test_close_quantity_is_on_the_step_grid(self):
+        future_client, mock_client = make_client()
+        mock_client.futures_position_information.return_value = [
+            {'symbol': 'BTCUSDT', 'positionAmt': '-0.30000000000000004', 'entryPrice': '64000'}]
+
+        future_client.close_order_in_profit('BTCUSDT')
+
+        mock_client.futures_create_order.assert_called_once_with(
+            symbol='BTCUSDT', side='BUY', type='MARKET', quantity='0.3', reduceOnly='true', newClientOrderId=ANY)
+
+    def test_failed_close_is_raised(self):
+        future_client, mock_client = make_client()
+        future_client.calls._sleep = lambda _: None
+        mock_client.futures_position_information.side_effect = requests.exceptions.ReadTimeout()
+
+        with self.assertRaises(requests.exceptions.ReadTimeout):
+            future_client.close_order_in_profit('BTCUSDT')
+        mock_client.futures_create_order.assert_not_called()
+
+    def test_failed_leverage_change_is_raised(self):
+        future_client, mock_client = make_client()
+        mock_client.futures_change_leverage.side_effect = ValueError('Leverage 125 is not valid')
+
+        with self.assertRaises(ValueError):
+            future_client.set_leverage('BTCUSDT', 125)
+
+
+class TestStopManager(unittest.TestCase):
+
+    def setUp(self):
+        self.future_client, self.mock_client = make_client()
+        self.mock_client.futures_exchange_info.return_value = {'symbols': [BTC_INFO, ETH_INFO]}
+        self.future_client.symbols.refresh()
+        self.mock_client.futures_position_information.side_effect = lambda symbol: [
+            {'symbol': symbol, 'positionAmt': '0.5', 'entryPrice': '100'}]
+        self.mock_client.futures_get_open_orders.side_effect = lambda symbol: [
+            {'orderId': 10 if symbol == 'BTCUSDT' else 20, 'type': 'STOP_MARKET', 'stopPrice': '49000'},
+            {'orderId': 11, 'type': 'LIMIT', 'stopPrice': '0'}]
+        self.mock_client.futures_place_batch_order.side_effect = lambda batchOrders: [
+            {'orderId': 100 + i, 'stopPrice': order['stopPrice']} for i, order in enumerate(batchOrders)]
+        self.mock_client.futures_cancel_orders.side_effect = lambda symbol, orderIdList: [
+            {'orderId': int(order_id)} for order_id in orderIdList.strip('[]').split(',')]
+
+    def test_stops_for_several_symbols_share_one_batch(self):
+        changes = self.future_client.change_stop_losses({'BTCUSDT': 49500.07, 'ETHUSDT': 3100.129})
+
+        self.mock_client.futures_place_batch_order.assert_called_once()
+        batch = self.mock_client.futures_place_batch_order.call_args.kwargs['batchOrders']
+        self.assertEqual([order['stopPrice'] for order in batch], ['49500', '3100.12'])
+        self.assertEqual(batch[0]['side'], 'SELL')
+        self.assertEqual([order['reduceOnly'] for order in batch], ['true', 'true'])
+        self.assertEqual(changes['BTCUSDT'].replaced, [10])
+        self.assertEqual(changes['ETHUSDT'].replaced, [20])
+        self.assertEqual([stop.order_id for stop in self.future_client.stops.active('BTCUSDT')], [100])
+
+    def test_old_stop_is_cancelled_after_the_new_one_is_placed(self):
+        calls = []
+        self.mock_client.futures_place_batch_order.side_effect = lambda batchOrders: calls.append('place') or [
+            {'orderId': 100}]
+        self.mock_client.futures_cancel_orders.side_effect = lambda symbol, orderIdList: calls.append('cancel') or [
+            {'orderId': 10}]
+
+        change = self.future_client.change_stop_loss('BTCUSDT', 49500)
+
+        self.assertTrue(change.ok)
+        self.assertEqual(calls, ['place', 'cancel'])
+
+    def test_hedge_mode_stop_names_the_position_side(self):
+        self.mock_client.futures_position_information.side_effect = lambda symbol: [
+            {'symbol': symbol, 'positionAmt': '-0.5', 'entryPrice': '100', 'positionSide': 'SHORT'}]
+
+        self.future_client.change_stop_loss('BTCUSDT', 49500)
+
+        order, = self.mock_client.futures_place_batch_order.call_args.kwargs['batchOrders']
+        self.assertEqual((order['side'], order['positionSide']), ('BUY', 'SHORT'))
+        self.assertNotIn('reduceOnly', order)
+
+    def test_stops_seeded_from_the_journal_need_no_open_orders_request(self):
+        self.future_client.stops.seed('BTCUSDT', [{'orderId': 10, 'stopPrice': '49000'}])
+        self.mock_client.futures_cancel_orders.side_effect = lambda symbol, orderIdList: [
+            {'code': -2011, 'msg': 'Unknown order sent.'}]
+
+        change = self.future_client.change_stop_loss('BTCUSDT', 49500)
+
+        self.mock_client.futures_get_open_orders.assert_not_called()
+        # The seeded stop had already filled; it counts as replaced rather than lingering.
+        self.assertEqual(change.replaced, [10])
+        self.assertEqual([stop.order_id for stop in self.future_client.stops.active('BTCUSDT')], [100])
+
+    def test_filled_stop_is_no_longer_tracked(self):
+        _, mock_client = make_client()
+        future_client = FutureClient(mock_client, self.future_client.symbols, AccountState())
+        future_client.stops.track('BTCUSDT', {'orderId': 10, 'stopPrice': '49000'})
+
+        future_client.account_state.apply({'e': 'ORDER_TRADE_UPDATE', 'o': {
+            's': 'BTCUSDT', 'i': 10, 'c': 'sl', 'S': 'SELL', 'o': 'STOP_MARKET', 'X': 'FILLED',
+            'p': '0', 'sp': '49000', 'q': '0.5'}})
+
+        self.assertEqual(future_client.stops.active('BTCUSDT'), [])
+
+    def test_unchanged_stop_is_left_alone(self):
+        change = self.future_client.change_stop_loss('BTCUSDT', 49000.04)
+
+        self.assertTrue(change.unchanged)
+        self.mock_client.futures_place_batch_order.assert_not_called()
+        self.mock_client.futures_cancel_orders.assert_not_called()
+
+    def test_rejected_stop_keeps_the_old_one(self):
+        self.mock_client.futures_place_batch_order.side_effect = lambda batchOrders: [
+            {'code': -2021, 'msg': 'Order would immediately trigger.'}]
+
+        change = self.future_client.change_stop_loss('BTCUSDT', 49500)
+
+        self.assertFalse(change.ok)
+        self.mock_client.futures_cancel_orders.assert_not_called()
+        self.assertEqual([stop.order_id for stop in self.future_client.stops.active('BTCUSDT')], [10])
+
+    def test_no_position_places_nothing(self):
+        self.mock_client.futures_position_information.side_effect = None
+        self.mock_client.futures_position_information.return_value = []
+
+        change = self.future_client.change_stop_loss('BTCUSDT', 49500)
+
+        self.assertIn('No open position', change.error)
+        self.mock_client.futures_place_batch_order.assert_not_called()
+
+    def test_batches_filling_the_leg_pool_do_not_deadlock(self):
+        symbols = [f'COIN{i}USDT' for i in range(20)]
+        self.mock_client.futures_exchange_info.return_value = {
+            'symbols': [{**BTC_INFO, 'symbol': symbol} for symbol in symbols]}
+        self.future_client.symbols.refresh()
+        # Start every leg pool worker, so each stop batch is picked up before the attempts it queues.
+        list(self.future_client._leg_executor.map(lambda _: None, range(8)))
+        done = threading.Event()
+
+        def change():
+            self.future_client.change_stop_losses({symbol: 49500 for symbol in symbols})
+            done.set()
+
+        threading.Thread(target=change, daemon=True).start()
+
+        self.assertTrue(done.wait(10))
+        self.assertEqual(self.mock_client.futures_place_batch_order.call_count, 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
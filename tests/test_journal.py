@@ -0,0 +1,120 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from core_future.orders import OrderLeg
+from core_journal.journal import SignalJournal
+from core_parsing.signal_parser import parse_future_signal
+
+SIGNAL = parse_future_signal("$BTC LONG\nEntry 1 = $64250.5\nStoploss: 4H Close Below $62900\nTarget: $67500")
+
+
+def leg(name: str, order_id: int, status: str = 'NEW') -> OrderLeg:
+    return OrderLeg(name, {}, order={'orderId': order_id, 'clientOrderId': f'c{order_id}', 'status': status})
+
+
+class TestSignalJournal(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'journal.db')
+        self.journal = SignalJournal(self.path)
+
+    def tearDown(self):
+        self.journal.close()
+        self.directory.cleanup()
+
+    def reopen(self) -> SignalJournal:
+        self.journal.close()
+        self.journal = SignalJournal(self.path)
+        return self.journal
+
+    def test_uses_wal(self):
+        mode = self.journal._db.execute('PRAGMA journal_mode').fetchone()[0]
+
+        self.assertEqual(mode, 'wal')
+
+    def test_duplicate_messages_are_rejected(self):
+        self.assertTrue(self.journal.claim(1, 10, SIGNAL))
+        self.assertFalse(self.journal.claim(1, 10, SIGNAL))
+
+    def test_duplicates_are_rejected_after_restart(self):
+        self.journal.claim(1, 10, SIGNAL)
+        self.journal.finish(1)
+
+        journal = self.reopen()
+
+        self.assertTrue(journal.seen(1))
+        self.assertFalse(journal.claim(1, 10, SIGNAL))
+        self.assertEqual(journal.interrupted, [])
+
+    def test_open_orders_are_rebuilt_on_restart(self):
+        self.journal.claim(1, 10, SIGNAL)
+        self.journal.record_orders(1, 'FUTURES', 'BTCUSDT', [
+            leg('entry', 100, 'FILLED'), leg('stop_loss', 101), leg('take_profit', 102),
+            OrderLeg('failed', {}, error='rejected'),
+        ])
+        self.journal.close_orders('FUTURES', 'BTCUSDT', [102])
+
+        journal = self.reopen()
+
+        self.assertEqual([order['orderId'] for order in journal.open_orders('FUTURES', 'BTCUSDT')], [101])
+        self.assertEqual(journal.open_orders('FUTURES', 'BTCUSDT', leg='stop_loss')[0]['message_id'], 1)
+        self.assertEqual(journal.symbols_with_open_orders('FUTURES'), ['BTCUSDT'])
+
+    def test_market_orders_are_recorded_closed(self):
+        entry = OrderLeg('entry', {'type': 'MARKET'}, order={'orderId': 100, 'status': 'NEW'})
+        stop = OrderLeg('stop_loss', {'type': 'STOP_MARKET', 'stopPrice': '62900'}, order={'orderId': 101})
+
+        self.journal.record_orders(1, 'FUTURES', 'BTCUSDT', [entry, stop])
+
+        orders = self.reopen().open_orders('FUTURES', 'BTCUSDT')
+        self.assertEqual([(order['orderId'], order['stopPrice']) for order in orders], [(101, '62900')])
+
+    def test_unfinished_signals_are_reported_once(self):
+        self.journal.claim(1, 10, SIGNAL)
+
+        journal = self.reopen()
+        self.assertEqual(journal.interrupted, [{'message_id': 1, 'symbol': 'BTCUSDT', 'command': 'TRADE_SIGNAL'}])
+
+        journal = self.reopen()
+        self.assertEqual(journal.interrupted, [])
+
+    def test_close_all_orders_of_a_symbol(self):
+        self.journal.record_orders(1, 'SPOT', 'OAXUSDT', [leg('entry_1', 1), leg('entry_2', 2)])
+
+        self.journal.close_orders('SPOT', 'OAXUSDT')
+
+        self.assertEqual(self.journal.open_orders('SPOT', 'OAXUSDT'), [])
+        self.assertEqual(self.reopen().symbols_with_open_orders('SPOT'), [])
+
+    def test_orders_are_tagged_with_their_account(self):
+        self.journal.record_orders(1, 'FUTURES', 'BTCUSDT', [leg('stop_loss', 1)], account='main')
+        self.journal.record_orders(1, 'FUTURES', 'BTCUSDT', [leg('stop_loss', 2)], account='sub')
+
+        self.journal.close_orders('FUTURES', 'BTCUSDT', account='main')
+
+        journal = self.reopen()
+        self.assertEqual(journal.open_orders('FUTURES', 'BTCUSDT')[0]['account'], 'sub')
+        self.assertEqual(journal.open_orders('FUTURES', 'BTCUSDT', account='main'), [])
+
+    def test_journal_without_account_column_is_migrated(self):
+        self.journal.close()
+        path = os.path.join(self.directory.name, 'old.db')
+        db = sqlite3.connect(path)
+        db.execute('CREATE TABLE orders (market TEXT NOT NULL, order_id INTEGER NOT NULL, symbol TEXT NOT NULL, '
+                   'message_id INTEGER, leg TEXT NOT NULL, client_order_id TEXT, status TEXT NOT NULL, '
+                   'created_at REAL NOT NULL, PRIMARY KEY (market, order_id))')
+        db.execute("INSERT INTO orders VALUES ('FUTURES', 1, 'BTCUSDT', 1, 'stop_loss', 'c1', 'open', 0)")
+        db.commit()
+        db.close()
+
+        self.journal = SignalJournal(path)
+
+        order, = self.journal.open_orders('FUTURES', 'BTCUSDT')
+        self.assertEqual((order['account'], order['stopPrice']), ('default', None))
+
+
+if __name__ == '__main__':
+    unittest.main()
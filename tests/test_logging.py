@@ -0,0 +1,74 @@
+import asyncio
+import io
+import json
+import logging
+import sys
+import unittest
+
+from core_exchange.executor import run_blocking
+from core_logging.logs import JsonFormatter, configure_logging, log_context, parse_levels, stop_logging
+
+logger = logging.getLogger('tests.logging')
+
+
+class TestLogging(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        root = logging.getLogger()
+        handlers, level = root.handlers[:], root.level
+
+        def restore():
+            stop_logging()
+            root.handlers[:] = handlers
+            root.setLevel(level)
+            logging.getLogger('tests.logging.quiet').setLevel(logging.NOTSET)
+        self.addCleanup(restore)
+        self.stream = io.StringIO()
+
+    def records(self) -> list[dict]:
+        stop_logging()
+        return [json.loads(line) for line in self.stream.getvalue().splitlines()]
+
+    async def test_records_carry_the_log_context(self):
+        configure_logging('INFO', {}, json_format=True, stream=self.stream)
+
+        with log_context(signal_id=42, symbol='BTCUSDT'):
+            logger.info("Placed %s orders", 3)
+        logger.info("Outside")
+
+        inside, outside = self.records()
+        self.assertEqual(inside['msg'], 'Placed 3 orders')
+        self.assertEqual((inside['signal_id'], inside['symbol']), (42, 'BTCUSDT'))
+        self.assertEqual(inside['logger'], 'tests.logging')
+        self.assertNotIn('signal_id', outside)
+
+    async def test_context_reaches_exchange_calls(self):
+        configure_logging('INFO', {}, json_format=True, stream=self.stream)
+
+        with log_context(signal_id=7):
+            await asyncio.gather(run_blocking(logger.info, "From the executor"))
+
+        self.assertEqual(self.records()[0]['signal_id'], 7)
+
+    async def test_per_logger_levels(self):
+        configure_logging('DEBUG', parse_levels('tests.logging.quiet=WARNING'), json_format=True, stream=self.stream)
+
+        logging.getLogger('tests.logging.quiet').info("Dropped")
+        logging.getLogger('tests.logging.quiet').warning("Kept")
+        logger.debug("Debug kept")
+
+        self.assertEqual([record['msg'] for record in self.records()], ['Kept', 'Debug kept'])
+
+    def test_exceptions_are_included(self):
+        try:
+            raise ValueError('boom')
+        except ValueError:
+            record = logging.LogRecord('x', logging.ERROR, __file__, 1, 'Failed', None, sys.exc_info())
+
+        entry = json.loads(JsonFormatter().format(record))
+
+        self.assertIn('ValueError: boom', entry['exc'])
+
+    def test_parse_levels(self):
+        self.assertEqual(parse_levels('core_future=debug, discord=WARNING,,bad'),
+                         {'core_future': 'DEBUG', 'discord': 'WARNING'})
@@ -0,0 +1,54 @@
+import unittest
+
+from core_metrics.metrics import Counter, Gauge, Histogram, MetricsRegistry
+
+
+class TestMetrics(unittest.TestCase):
+
+    def setUp(self):
+        self.registry = MetricsRegistry()
+
+    def test_counter_renders_labelled_samples(self):
+        counter = self.registry.register(Counter('signals_total', 'Signals.', ('market', 'outcome')))
+        counter.inc(market='FUTURES', outcome='ok')
+        counter.inc(market='FUTURES', outcome='ok')
+
+        text = self.registry.render()
+
+        self.assertIn('# TYPE signals_total counter', text)
+        self.assertIn('signals_total{market="FUTURES",outcome="ok"} 2', text)
+
+    def test_histogram_buckets_are_cumulative(self):
+        histogram = self.registry.register(Histogram('stage_seconds', 'Stages.', ('stage',), buckets=(0.01, 0.1)))
+        histogram.observe(0.005, stage='parse')
+        histogram.observe(0.05, stage='parse')
+        histogram.observe(1.0, stage='parse')
+
+        text = self.registry.render()
+
+        self.assertIn('stage_seconds_bucket{stage="parse",le="0.01"} 1', text)
+        self.assertIn('stage_seconds_bucket{stage="parse",le="0.1"} 2', text)
+        self.assertIn('stage_seconds_bucket{stage="parse",le="+Inf"} 3', text)
+        self.assertIn('stage_seconds_count{stage="parse"} 3', text)
+        self.assertEqual(histogram.count(stage='parse'), 3)
+
+    def test_time_observes_even_when_the_block_fails(self):
+        histogram = self.registry.register(Histogram('stage_seconds', 'Stages.', ('stage',)))
+
+        with self.assertRaises(ValueError):
+            with histogram.time(stage='order_entry'):
+                raise ValueError('rejected')
+
+        self.assertEqual(histogram.count(stage='order_entry'), 1)
+
+    def test_collectors_refresh_gauges_before_render(self):
+        gauge = self.registry.register(Gauge('signal_queue', 'Queue.', ('field',)))
+        depth = iter([3, 0])
+        self.registry.add_collector(lambda: gauge.set(next(depth), field='depth'))
+
+        self.assertIn('signal_queue{field="depth"} 3', self.registry.render())
+        self.assertIn('signal_queue{field="depth"} 0', self.registry.render())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+import asyncio
+import json
+import math
+import unittest
+
+import websockets
+
+from core_exchange.price_cache import PriceCache, PriceStream, bracket_violation
+from tests.helpers import FakeClock
+
+
+class TestPriceCache(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock(100.0)
+        self.cache = PriceCache(capacity=2, clock=self.clock)
+
+    def test_mark_price_wins_over_book_mid(self):
+        self.cache.update_book('BTCUSDT', 64000.0, 64002.0)
+        self.assertEqual(self.cache.price('BTCUSDT'), 64001.0)
+
+        self.cache.update_mark('BTCUSDT', 63990.5)
+        self.assertEqual(self.cache.price('BTCUSDT'), 63990.5)
+
+    def test_stale_prices_are_not_returned(self):
+        self.cache.update_mark('BTCUSDT', 64000.0)
+        self.clock.now += 10
+
+        self.assertIsNone(self.cache.price('BTCUSDT', max_age=5))
+        self.assertEqual(self.cache.quote('BTCUSDT').mark, 64000.0)
+
+    def test_slots_are_reused_after_removal(self):
+        self.cache.update_mark('BTCUSDT', 1.0)
+        self.cache.update_mark('ETHUSDT', 2.0)
+        self.cache.update_mark('SOLUSDT', 3.0)
+        self.assertNotIn('SOLUSDT', self.cache)
+
+        self.cache.remove('BTCUSDT')
+        self.cache.update_book('SOLUSDT', 3.0, 3.2)
+
+        quote = self.cache.quote('SOLUSDT')
+        self.assertTrue(math.isnan(quote.mark))
+        self.assertAlmostEqual(quote.mid, 3.1)
+        self.assertEqual(len(self.cache), 2)
+
+
+class TestBracketViolation(unittest.TestCase):
+
+    def test_long(self):
+        self.assertIsNone(bracket_violation('LONG', 100.0, 95.0, 110.0))
+        self.assertIn('stop loss', bracket_violation('LONG', 94.0, 95.0, 110.0))
+        self.assertIn('target', bracket_violation('LONG', 111.0, 95.0, 110.0))
+
+    def test_short(self):
+        self.assertIsNone(bracket_violation('SHORT', 100.0, 105.0, 90.0))
+        self.assertIn('stop loss', bracket_violation('SHORT', 106.0, 105.0, 90.0))
+        self.assertIn('target', bracket_violation('SHORT', 89.0, 105.0, 90.0))
+
+
+class TestPriceStream(unittest.IsolatedAsyncioTestCase):
+
+    async def test_recent_symbols_are_evicted_but_pinned_ones_stay(self):
+        cache = PriceCache()
+        stream = PriceStream(cache, max_recent=1)
+        stream.track('BTCUSDT', pin=True)
+        stream.track('ETHUSDT')
+        cache.update_mark('ETHUSDT', 1.0)
+
+        stream.track('SOLUSDT')
+
+        self.assertEqual(stream.symbols, {'BTCUSDT', 'SOLUSDT'})
+        self.assertNotIn('ETHUSDT', cache)
+
+        stream.release('BTCUSDT')
+        self.assertEqual(stream.symbols, {'BTCUSDT'})
+
+    async def test_symbols_beyond_the_pin_limit_are_only_tracked_as_recent(self):
+        stream = PriceStream(PriceCache(), max_recent=1, max_pinned=1)
+        stream.track('BTCUSDT', pin=True)
+
+        with self.assertLogs('core_exchange.price_cache', 'WARNING'):
+            stream.track('ETHUSDT', pin=True)
+
+        self.assertEqual(stream.pinned, {'BTCUSDT'})
+        self.assertEqual(stream.symbols, {'BTCUSDT', 'ETHUSDT'})
+
+    def test_pinned_and_recent_symbols_must_fit_in_the_cache(self):
+        with self.assertRaises(ValueError):
+            PriceStream(PriceCache(capacity=4), max_recent=2, max_pinned=3)
+
+    async def test_stream_against_local_websocket(self):
+        requests = []
+        subscribed = asyncio.Event()
+
+        async def handler(websocket):
+            async for raw in websocket:
+                request = json.loads(raw)
+                requests.append(request)
+                await websocket.send(json.dumps({'result': None, 'id': request['id']}))
+                for stream in request['params']:
+                    symbol = stream.split('@')[0].upper()
+                    if stream.endswith('@bookTicker'):
+                        data = {'e': 'bookTicker', 's': symbol, 'b': '64000.10', 'B': '1', 'a': '64000.30', 'A': '2'}
+                    else:
+                        data = {'e': 'markPriceUpdate', 's': symbol, 'p': '64000.25', 'i': '64001'}
+                    await websocket.send(json.dumps({'stream': stream, 'data': data}))
+                if request['method'] == 'SUBSCRIBE' and len(requests) == 2:
+                    subscribed.set()
+
+        async with websockets.serve(handler, '127.0.0.1', 0) as server:
+            port = server.sockets[0].getsockname()[1]
+            cache = PriceCache()
+            stream = PriceStream(cache, url=f'ws://127.0.0.1:{port}/stream', reconnect_delay=0.01)
+            stream.track('BTCUSDT', pin=True)
+            stream.start()
+            await asyncio.wait_for(stream.connected.wait(), 2)
+            stream.track('ETHUSDT')
+            await asyncio.wait_for(subscribed.wait(), 2)
+            for _ in range(100):
+                if cache.price('ETHUSDT') is not None:
+                    break
+                await asyncio.sleep(0.01)
+            await stream.stop()
+
+        self.assertEqual(requests[0]['params'], ['btcusdt@bookTicker', 'btcusdt@markPrice@1s'])
+        self.assertEqual(requests[1]['params'], ['ethusdt@bookTicker', 'ethusdt@markPrice@1s'])
+        self.assertEqual(cache.price('BTCUSDT'), 64000.25)
+        self.assertEqual(cache.quote('ETHUSDT').bid, 64000.10)
+
+
+if __name__ == '__main__':
+    unittest.main()
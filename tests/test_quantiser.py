@@ -0,0 +1,56 @@
+import unittest
+from decimal import ROUND_CEILING, ROUND_FLOOR, Decimal
+
+from core_exchange.quantiser import Grid, Quantiser, decimal_places, to_decimal
+
+
+class TestGrid(unittest.TestCase):
+
+    def test_power_of_ten_increment(self):
+        grid = Grid.of(Decimal('0.00100000'))
+
+        self.assertTrue(grid.power_of_ten)
+        self.assertEqual(grid.precision, 3)
+        self.assertEqual(str(grid.round(Decimal('1.23456'))), '1.234')
+        self.assertEqual(str(grid.round(Decimal('1.2341'), ROUND_CEILING)), '1.235')
+
+    def test_other_increments_round_through_the_quotient(self):
+        half = Grid.of(Decimal('0.50'))
+        ten = Grid.of(Decimal('10'))
+
+        self.assertFalse(half.power_of_ten)
+        self.assertEqual(half.round(Decimal('64250.74')), Decimal('64250.5'))
+        self.assertEqual(str(half.round(Decimal('64250.74'))), '64250.5')
+        self.assertEqual(ten.round(Decimal('1234')), Decimal('1230'))
+        self.assertEqual(Grid.format(ten.round(Decimal('1234'))), '1230')
+
+    def test_zero_increment_leaves_values_alone(self):
+        self.assertEqual(Grid.of(Decimal('0')).round(Decimal('1.23456')), Decimal('1.23456'))
+
+    def test_format_drops_trailing_zeros(self):
+        self.assertEqual(Grid.format(Decimal('49000.00')), '49000')
+        self.assertEqual(Grid.format(Decimal('0.00001000')), '0.00001')
+
+
+class TestQuantiser(unittest.TestCase):
+
+    def setUp(self):
+        self.quantiser = Quantiser.from_increments(Decimal('0.10'), Decimal('0.1'), Decimal('1'))
+
+    def test_floats_are_taken_at_their_repr(self):
+        # Decimal(0.7) is 0.6999..., which would floor to 0.6.
+        self.assertEqual(self.quantiser.round_quantity(0.7), Decimal('0.7'))
+        self.assertEqual(to_decimal(0.1), Decimal('0.1'))
+
+    def test_prices_round_half_up_by_default(self):
+        self.assertEqual(self.quantiser.round_price(2.15), Decimal('2.2'))
+        self.assertEqual(self.quantiser.round_price(2.15, ROUND_FLOOR), Decimal('2.1'))
+
+    def test_market_orders_use_the_market_step(self):
+        self.assertEqual(self.quantiser.round_quantity('12.34', market=True), Decimal('12'))
+        self.assertEqual(self.quantiser.format_quantity(Decimal('12.3')), '12.3')
+
+    def test_decimal_places(self):
+        self.assertEqual(decimal_places(Decimal('0.00010000')), 4)
+        self.assertEqual(decimal_places(Decimal('10')), 0)
+        self.assertEqual(decimal_places(Decimal('0')), 0)
@@ -0,0 +1,92 @@
+import threading
+import unittest
+
+from requests.structures import CaseInsensitiveDict
+
+from core_exchange.rate_limiter import Priority, RateLimitGovernor, TokenBucket
+from tests.helpers import FakeClock
+
+
+class TestTokenBucket(unittest.TestCase):
+
+    def test_refill_and_wait(self):
+        clock = FakeClock(1000.0)
+        bucket = TokenBucket(60, 60, clock)
+        bucket.take(60)
+        self.assertEqual(bucket.wait_time(5), 5.0)
+        clock.now += 5
+        self.assertEqual(bucket.wait_time(5), 0.0)
+        self.assertEqual(bucket.used, 55.0)
+
+
+class TestRateLimitGovernor(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock(1000.0)
+        self.governor = RateLimitGovernor(self.clock, info_headroom=0.8)
+
+    def test_classify(self):
+        classify = RateLimitGovernor.classify
+        self.assertEqual(classify('post', 'https://fapi.binance.com/fapi/v1/order'),
+                         ('futures', 1, Priority.ORDER, True))
+        self.assertEqual(classify('get', 'https://fapi.binance.com/fapi/v2/positionRisk'),
+                         ('futures', 5, Priority.INFO, False))
+        self.assertEqual(classify('get', 'https://api.binance.com/api/v3/openOrders', 'symbol=OAXUSDT'),
+                         ('spot', 6, Priority.INFO, False))
+        self.assertEqual(classify('get', 'https://api.binance.com/api/v3/openOrders'),
+                         ('spot', 80, Priority.INFO, False))
+        self.assertEqual(classify('delete', 'https://api.binance.com/api/v3/openOrders'),
+                         ('spot', 1, Priority.ORDER, False))
+
+    def test_info_calls_leave_headroom_for_orders(self):
+        self.governor.observe('futures', 200, CaseInsensitiveDict({'X-MBX-USED-WEIGHT-1M': '1950'}))
+
+        self.assertGreater(self.governor.wait_time('futures', 5, Priority.INFO), 0)
+        self.assertEqual(self.governor.wait_time('futures', 1, Priority.ORDER, True), 0)
+        self.assertAlmostEqual(self.governor.utilisation()['futures']['weight'], 1950 / 2400)
+
+    def test_ban_pauses_everything(self):
+        self.governor.observe('spot', 429, CaseInsensitiveDict({'Retry-After': '30'}))
+
+        self.assertEqual(self.governor.wait_time('spot', 1, Priority.ORDER, True), 30)
+        self.assertEqual(self.governor.utilisation()['spot']['banned_for'], 30)
+
+    def test_acquire_blocks_until_refilled(self):
+        governor = RateLimitGovernor()
+        governor.weights['futures'] = TokenBucket(10, 0.5)
+        governor.acquire('futures', 10, Priority.ORDER)
+
+        waited = []
+        thread = threading.Thread(target=lambda: waited.append(governor.acquire('futures', 5, Priority.ORDER)))
+        thread.start()
+        thread.join(timeout=2)
+
+        self.assertGreater(waited[0], 0.1)
+        self.assertGreater(governor.throttled_seconds, 0.1)
+
+    def test_accounts_share_weight_but_not_order_count(self):
+        account = self.governor.for_account()
+        self.governor.observe('spot', 200, CaseInsensitiveDict({'X-MBX-ORDER-COUNT-10S': '100'}))
+        account.observe('futures', 200, CaseInsensitiveDict({'X-MBX-USED-WEIGHT-1M': '1950'}))
+
+        self.assertGreater(self.governor.wait_time('spot', 1, Priority.ORDER, True), 0)
+        self.assertEqual(account.wait_time('spot', 1, Priority.ORDER, True), 0)
+        self.assertGreater(self.governor.wait_time('futures', 5, Priority.INFO), 0)
+
+        account.observe('futures', 418, CaseInsensitiveDict({'Retry-After': '30'}))
+        self.assertEqual(self.governor.wait_time('futures', 1, Priority.ORDER), 30)
+
+    def test_share_of_the_limits(self):
+        governor = RateLimitGovernor(self.clock, share=0.25)
+        account = governor.for_account()
+
+        self.assertEqual(governor.weights['futures'].capacity, 600)
+        self.assertEqual(account.orders['futures'].capacity, 300)
+        # 2000 of 2400 used across all processes leaves this one a quarter of the remaining 400.
+        governor.observe('futures', 200, CaseInsensitiveDict({'X-MBX-USED-WEIGHT-1M': '2000'}))
+        self.assertEqual(governor.wait_time('futures', 100, Priority.ORDER), 0)
+        self.assertGreater(governor.wait_time('futures', 101, Priority.ORDER), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+import unittest
+
+from benchmarks.replay import percentile, replay
+
+FUTURES_SIGNAL = "$BTC LONG\nEntry 1 = $64250.5\nStoploss: 4H Close Below $62900\nTarget: $67500"
+SPOT_SIGNAL = "$FET\nEntry 1 = $2.15\nEntry 2 = $2.05\nStoploss: Daily Close Below $1.88\nFinal Target: $2.95"
+
+
+class TestReplay(unittest.IsolatedAsyncioTestCase):
+
+    async def test_signals_reach_the_mock_exchange(self):
+        records = [
+            {'channel_id': 1, 'content': FUTURES_SIGNAL},
+            {'channel_id': 1, 'content': SPOT_SIGNAL},
+            {'channel_id': 1, 'content': 'gm everyone'},
+            {'channel_id': 1, 'content': '$BTC Close Order'},
+        ]
+
+        report = await replay(records)
+
+        self.assertEqual(report.messages, 4)
+        self.assertEqual(report.signals, 3)
+        self.assertEqual(sum(timing.order_ms is not None for timing in report.timings), 3)
+        self.assertEqual(report.calls[('futures', 'POST', 'batchOrders')], 1)
+        self.assertEqual(report.calls[('spot', 'POST', 'order')], 3)
+        self.assertGreater(report.calls_per_signal, 0)
+
+    async def test_injected_errors_do_not_stop_the_replay(self):
+        report = await replay([{'channel_id': 1, 'content': FUTURES_SIGNAL}], repeat=3, error_rate=0.5, seed=1)
+
+        self.assertEqual(report.signals, 3)
+        self.assertGreater(report.errors_injected, 0)
+
+
+class TestPercentile(unittest.TestCase):
+
+    def test_nearest_rank(self):
+        values = [float(value) for value in range(1, 101)]
+
+        self.assertEqual(percentile(values, 50), 50.0)
+        self.assertEqual(percentile(values, 99), 99.0)
+        self.assertEqual(percentile([], 99), 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import asyncio
+import unittest
+
+from core_dispatch.replies import ReplyBuffer
+from variables.constants import ReplyConstants
+
+
+class FakeMessage:
+
+    def __init__(self, channel, content):
+        self.channel = channel
+        self.content = content
+
+    async def edit(self, content=None):
+        await asyncio.sleep(self.channel.delay)
+        self.content = content
+        self.channel.edits.append(content)
+
+
+class FakeChannel:
+
+    def __init__(self, channel_id=1, delay=0.0, fail=False):
+        self.id = channel_id
+        self.delay = delay
+        self.fail = fail
+        self.sent = []
+        self.edits = []
+
+    async def send(self, content):
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError('429 Too Many Requests')
+        self.sent.append(content)
+        return FakeMessage(self, content)
+
+
+class TestReplyBuffer(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.replies = ReplyBuffer()
+
+    async def asyncTearDown(self):
+        await self.replies.stop()
+
+    async def test_flush_does_not_wait_for_discord(self):
+        channel = FakeChannel(delay=0.05)
+        reply = self.replies.open(channel)
+        reply.add('Canceling open orders for BTCUSDT')
+
+        self.replies.flush(reply)
+
+        self.assertEqual(channel.sent, [])
+        await asyncio.wait_for(self.replies.drain(), 1)
+        self.assertEqual(channel.sent, ['Canceling open orders for BTCUSDT'])
+
+    async def test_later_flushes_edit_the_same_message(self):
+        channel = FakeChannel(delay=0.02)
+        reply = self.replies.open(channel)
+        reply.add('Placed order: 1')
+        self.replies.flush(reply)
+        reply.add('Placed order: 2')
+        self.replies.flush(reply)
+        await asyncio.sleep(0.03)
+        reply.add('Placed sell order: 3')
+        self.replies.flush(reply)
+        await asyncio.wait_for(self.replies.drain(), 1)
+
+        self.assertEqual(len(channel.sent), 1)
+        self.assertEqual(channel.edits[-1], 'Placed order: 1\nPlaced order: 2\nPlaced sell order: 3')
+
+    async def test_failed_send_is_logged_not_raised(self):
+        channel = FakeChannel(fail=True)
+
+        with self.assertLogs(level='ERROR'):
+            self.replies.send(channel, 'Placed order')
+            await asyncio.wait_for(self.replies.drain(), 1)
+
+        self.assertEqual(channel.sent, [])
+
+    async def test_long_replies_keep_the_latest_lines(self):
+        reply = self.replies.open(FakeChannel())
+        for i in range(500):
+            reply.add(f'Placed order: {i}')
+
+        self.assertEqual(len(reply.text), ReplyConstants.MAX_MESSAGE_LENGTH.value)
+        self.assertTrue(reply.text.endswith('Placed order: 499'))
+
+
+if __name__ == '__main__':
+    unittest.main()
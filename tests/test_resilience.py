@@ -0,0 +1,129 @@
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock
+
+import requests
+from binance.exceptions import BinanceAPIException
+
+from core_exchange.resilience import CircuitBreaker, CircuitOpenError, ErrorKind, ResilientCaller, classify
+from tests.helpers import FakeClock
+
+
+def api_error(status: int, code: int, message: str = 'error') -> BinanceAPIException:
+    response = MagicMock(text=f'{{"code": {code}, "msg": "{message}"}}')
+    return BinanceAPIException(response, status, response.text)
+
+
+class TestClassify(unittest.TestCase):
+
+    def test_kinds(self):
+        self.assertIs(classify(api_error(503, -1001)), ErrorKind.UNKNOWN)
+        self.assertIs(classify(api_error(400, -1021)), ErrorKind.TRANSIENT)
+        self.assertIs(classify(api_error(429, -1003)), ErrorKind.RATE_LIMITED)
+        self.assertIs(classify(api_error(400, -2019, 'Margin is insufficient.')), ErrorKind.PERMANENT)
+        self.assertIs(classify(requests.exceptions.ConnectTimeout()), ErrorKind.TRANSIENT)
+        self.assertIs(classify(requests.exceptions.ReadTimeout()), ErrorKind.UNKNOWN)
+        self.assertIs(classify(ValueError()), ErrorKind.PERMANENT)
+
+
+class TestResilientCaller(unittest.TestCase):
+
+    def setUp(self):
+        self.sleeps = []
+        self.caller = ResilientCaller(attempts=3, sleep=self.sleeps.append)
+
+    def test_retries_transient_failures(self):
+        func = MagicMock(side_effect=[api_error(503, -1001), {'ok': True}])
+
+        self.assertEqual(self.caller.call('order', func, symbol='BTCUSDT'), {'ok': True})
+        self.assertEqual(func.call_count, 2)
+        self.assertEqual(len(self.sleeps), 1)
+
+    def test_unknown_outcome_is_retried(self):
+        func = MagicMock(side_effect=[requests.exceptions.ReadTimeout(), {'ok': True}])
+
+        self.assertEqual(self.caller.call('order', func, newClientOrderId='x'), {'ok': True})
+        self.assertEqual(func.call_count, 2)
+        func.assert_called_with(newClientOrderId='x')
+
+    def test_permanent_errors_are_raised_at_once(self):
+        func = MagicMock(side_effect=api_error(400, -2019))
+
+        with self.assertRaises(BinanceAPIException):
+            self.caller.call('order', func)
+        func.assert_called_once()
+        self.assertFalse(self.caller.breaker('order').is_open)
+
+    def test_backoff_is_bounded(self):
+        self.assertTrue(all(0 <= self.caller.delay(attempt) <= self.caller.max_delay for attempt in range(1, 20)))
+
+
+class TestCircuitBreaker(unittest.TestCase):
+
+    def test_opens_and_lets_one_trial_through(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker('account', threshold=2, reset_seconds=30, clock=clock)
+        breaker.record_failure()
+        breaker.allow()
+        breaker.record_failure()
+
+        with self.assertRaises(CircuitOpenError):
+            breaker.allow()
+
+        clock.now = 31
+        breaker.allow()
+        with self.assertRaises(CircuitOpenError):
+            breaker.allow()
+        breaker.record_success()
+        breaker.allow()
+        self.assertFalse(breaker.is_open)
+
+    def test_caller_fails_fast_while_open(self):
+        caller = ResilientCaller(attempts=10, sleep=lambda _: None)
+        func = MagicMock(side_effect=api_error(503, -1001))
+
+        with self.assertRaises(CircuitOpenError):
+            caller.call('account', func)
+        self.assertEqual(func.call_count, caller.breaker('account').threshold)
+
+
+class TestHedged(unittest.TestCase):
+
+    def test_slow_request_is_hedged(self):
+        release = threading.Event()
+        calls = []
+
+        def place(**params):
+            calls.append(params)
+            if len(calls) == 1:
+                release.wait(2)
+                return 'primary'
+            return 'hedge'
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            result = ResilientCaller().hedged('batchOrders', place, executor=executor, delay=0.01, batchOrders=[1])
+            release.set()
+
+        self.assertEqual(result, 'hedge')
+        self.assertEqual(calls, [{'batchOrders': [1]}, {'batchOrders': [1]}])
+
+    def test_stalled_attempts_time_out(self):
+        release = threading.Event()
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            with self.assertRaises(TimeoutError):
+                ResilientCaller().hedged('batchOrders', lambda: release.wait(5), executor=executor,
+                                         delay=0.01, timeout=0.05)
+            release.set()
+
+    def test_fast_request_is_not_hedged(self):
+        func = MagicMock(return_value='primary')
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            self.assertEqual(ResilientCaller().hedged('batchOrders', func, executor=executor, delay=1), 'primary')
+        func.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
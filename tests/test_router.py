@@ -0,0 +1,77 @@
+import unittest
+from unittest.mock import Mock, patch
+
+from core_parsing.router import PARSERS, SignalParser, SignalRouter, get_router, register_parser
+from core_parsing.signal_parser import Signal
+from variables.constants import Market, SignalCommand
+
+FUTURES_CHANNEL, SPOT_CHANNEL = 1, 2
+
+SPOT_MESSAGE = "$OAX\nEntry 1 = $0.2573\nStoploss: Daily Close Below $0.1585\nFinal Target: $0.9153"
+
+
+class TestSignalRouter(unittest.TestCase):
+
+    def setUp(self):
+        self.router = SignalRouter({FUTURES_CHANNEL: ['futures'], SPOT_CHANNEL: ['spot']}, default=None)
+
+    def test_channel_selects_parser(self):
+        result = self.router.route(FUTURES_CHANNEL, "$ETH Change Stoploss = $3410")
+        self.assertEqual(result.parser.name, 'futures')
+        self.assertEqual(result.signal.command, SignalCommand.CHANGE_STOPLOSS)
+
+        result = self.router.route(SPOT_CHANNEL, SPOT_MESSAGE)
+        self.assertEqual(result.signal.market, Market.SPOT)
+        self.assertIsNone(self.router.route(FUTURES_CHANNEL, SPOT_MESSAGE))
+
+    def test_chatter_never_reaches_a_parser(self):
+        parse = Mock(return_value=None)
+        router = SignalRouter({FUTURES_CHANNEL: ['futures']}, default=None)
+        router.routes[FUTURES_CHANNEL].parsers[0] = SignalParser('futures', parse, ('LONG', 'SHORT'))
+
+        for content in ('I closed my LONG too early again :(', '$10k account challenge update', 'gm'):
+            self.assertIsNone(router.route(FUTURES_CHANNEL, content))
+        self.assertIsNone(self.router.route(3, '$BTC LONG'))
+        parse.assert_not_called()
+
+    def test_malformed_exclusive_signal_is_reported(self):
+        router = SignalRouter()
+
+        result = router.route(FUTURES_CHANNEL, "$BTC LONG\nEntry 1 = $64250.5")
+
+        self.assertTrue(result.malformed)
+        self.assertEqual(result.parser.name, 'futures')
+
+    def test_default_route_tries_futures_before_spot(self):
+        router = SignalRouter()
+
+        self.assertEqual(router.route(9, "$BTC Close Order").parser.name, 'futures')
+        self.assertEqual(router.route(9, SPOT_MESSAGE).parser.name, 'spot')
+        self.assertIsNone(router.route(9, '$ price action is boring lol'))
+
+    def test_plugin_parser(self):
+        register_parser(SignalParser(
+            'alerts', lambda content: Signal(Market.FUTURES, SignalCommand.CLOSE_ORDER, content.split()[1] + 'USDT'),
+            ('EXIT',), prefixes=('!',)))
+        self.addCleanup(PARSERS.pop, 'alerts')
+
+        router = SignalRouter({FUTURES_CHANNEL: ['alerts', 'futures']})
+
+        self.assertEqual(router.route(FUTURES_CHANNEL, '!EXIT BTC').signal.symbol, 'BTCUSDT')
+        self.assertEqual(router.route(FUTURES_CHANNEL, '$BTC Close Order').parser.name, 'futures')
+
+    def test_unknown_parser_is_rejected(self):
+        with self.assertRaises(ValueError):
+            SignalRouter({FUTURES_CHANNEL: ['telegram']})
+
+    @patch.dict('os.environ', {'SIGNAL_ROUTES': '1=futures; 2=spot ;*=spot,futures'})
+    def test_routes_from_environment(self):
+        router = get_router()
+
+        self.assertEqual([parser.name for parser in router.routes[1].parsers], ['futures'])
+        self.assertEqual([parser.name for parser in router.routes[2].parsers], ['spot'])
+        self.assertEqual([parser.name for parser in router.default.parsers], ['spot', 'futures'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,172 @@
+import asyncio
+import os
+import tempfile
+import unittest
+from collections import Counter
+
+from core_dispatch.replies import Reply
+from core_dispatch.shards import AccountUpdate, HashRing, ShardPool
+from core_exchange.account_state import AccountState
+from core_journal.journal import SignalJournal
+from core_parsing.signal_parser import parse_future_signal
+
+SYMBOLS = [f'COIN{index}USDT' for index in range(2000)]
+
+
+def echo_shard(shard, inbox, outbox, journal_path, processes):
+    """Stands in for run_shard: replies with the shard that received each signal."""
+    outbox.put(('ready', shard))
+    while (job := inbox.get()) is not None:
+        outbox.put(('reply', shard, job.message_id, f'{job.signal.symbol} on {shard}'))
+        outbox.put(('done', shard, job.message_id))
+
+
+def crashing_shard(shard, inbox, outbox, journal_path, processes):
+    """Echoes like echo_shard, but its first process dies on the first BTC signal."""
+    outbox.put(('ready', shard))
+    while (job := inbox.get()) is not None:
+        if job.signal.symbol == 'BTCUSDT' and not os.path.exists(journal_path + '.crashed'):
+            open(journal_path + '.crashed', 'w').close()
+            os._exit(3)
+        outbox.put(('reply', shard, job.message_id, f'{job.signal.symbol} on {shard}'))
+        outbox.put(('done', shard, job.message_id))
+
+
+def mirroring_shard(shard, inbox, outbox, journal_path, processes):
+    """Shard 0 publishes an account snapshot; every shard replies with the USDT balance it holds."""
+    state = AccountState()
+    if shard == 0:
+        state.on_update(lambda update: outbox.put(('account', shard, 'default', update)))
+        state.load({'assets': [{'asset': 'USDT', 'walletBalance': '1000', 'availableBalance': '800'}],
+                    'positions': []}, [])
+    outbox.put(('ready', shard))
+    while (job := inbox.get()) is not None:
+        if isinstance(job, AccountUpdate):
+            state.replay(job.update)
+            continue
+        balance = state.get_balance('USDT')
+        outbox.put(('reply', shard, job.message_id, f'{balance.available if balance else None} on {shard}'))
+        outbox.put(('done', shard, job.message_id))
+
+
+class FakeChannel:
+    def __init__(self, channel_id: int):
+        self.id = channel_id
+
+
+class FakeMessage:
+    def __init__(self, message_id: int, channel: FakeChannel):
+        self.id = message_id
+        self.channel = channel
+
+
+class FakeReplies:
+    def __init__(self):
+        self.sent = []
+
+    def open(self, channel):
+        return Reply(channel)
+
+    def flush(self, reply):
+        self.sent.append((reply.channel.id, reply.text))
+
+
+BTC_SIGNAL = '$BTC LONG\nEntry 1 = $64250.5\nStoploss: 4H Close Below $62900\nTarget: $67500'
+ETH_SIGNAL = '$ETH SHORT\nEntry 1 = $3000\nStoploss: 4H Close Above $3100\nTarget: $2800'
+
+
+class TestHashRing(unittest.TestCase):
+
+    def test_keys_spread_over_all_nodes(self):
+        counts = Counter(HashRing(range(4)).node_for(symbol) for symbol in SYMBOLS)
+
+        self.assertEqual(set(counts), {0, 1, 2, 3})
+        self.assertLess(max(counts.values()) / min(counts.values()), 1.5)
+
+    def test_placement_is_stable_across_rings(self):
+        self.assertEqual([HashRing(range(4)).node_for(symbol) for symbol in SYMBOLS[:50]],
+                         [HashRing(range(4)).node_for(symbol) for symbol in SYMBOLS[:50]])
+
+    def test_adding_a_node_only_moves_keys_to_it(self):
+        before, after = HashRing(range(4)), HashRing(range(5))
+
+        moved = [symbol for symbol in SYMBOLS if before.node_for(symbol) != after.node_for(symbol)]
+
+        self.assertTrue(all(after.node_for(symbol) == 4 for symbol in moved))
+        self.assertLess(len(moved) / len(SYMBOLS), 0.3)
+
+
+class TestShardPool(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.journal_path = os.path.join(directory.name, 'journal.db')
+
+    def test_rejects_in_memory_journal(self):
+        with self.assertRaises(ValueError):
+            ShardPool(2, FakeReplies(), ':memory:')
+
+    async def test_signals_of_one_symbol_go_to_one_worker(self):
+        replies = FakeReplies()
+        ready = []
+        pool = ShardPool(2, replies, self.journal_path, on_ready=lambda: ready.append(True), target=echo_shard)
+        pool.start()
+        channel = FakeChannel(7)
+        signals = [BTC_SIGNAL, ETH_SIGNAL, '$BTC Close Order']
+        shards = [pool.submit(FakeMessage(index, channel), parse_future_signal(text))
+                  for index, text in enumerate(signals)]
+
+        await asyncio.wait_for(pool.join(), 10)
+        await asyncio.wait_for(pool.ready.wait(), 10)
+        await pool.stop()
+
+        self.assertEqual(shards[0], shards[2])
+        self.assertEqual(sorted(replies.sent), sorted([
+            (7, f'BTCUSDT on {shards[0]}'), (7, f'ETHUSDT on {shards[1]}'), (7, f'BTCUSDT on {shards[2]}')]))
+        self.assertEqual(ready, [True])
+        self.assertEqual(pool.metrics()['completed'], 3)
+        self.assertEqual(pool.metrics()['alive'], 0)
+
+    async def test_account_state_is_relayed_from_the_streaming_worker(self):
+        replies = FakeReplies()
+        pool = ShardPool(2, replies, self.journal_path, target=mirroring_shard)
+        pool.start()
+        await asyncio.wait_for(pool.ready.wait(), 10)
+        channel = FakeChannel(7)
+        follower = next(symbol for symbol in SYMBOLS if pool.shard_for(symbol) == 1)
+        for index, text in enumerate([BTC_SIGNAL, f'${follower.removesuffix("USDT")} Close Order']):
+            pool.submit(FakeMessage(index, channel), parse_future_signal(text))
+
+        await asyncio.wait_for(pool.join(), 10)
+        await pool.stop()
+
+        self.assertEqual(sorted(text for _, text in replies.sent), ['800.0 on 0', '800.0 on 1'])
+
+    async def test_dead_worker_fails_its_signals_and_is_restarted(self):
+        replies = FakeReplies()
+        journal = SignalJournal(self.journal_path)
+        self.addCleanup(journal.close)
+        pool = ShardPool(1, replies, self.journal_path, target=crashing_shard, journal=journal)
+        pool.start()
+        channel = FakeChannel(7)
+        btc, eth = parse_future_signal(BTC_SIGNAL), parse_future_signal(ETH_SIGNAL)
+        journal.claim(1, 7, btc)
+        journal.claim(2, 7, eth)
+        pool.submit(FakeMessage(1, channel), btc)
+        pool.submit(FakeMessage(2, channel), eth)
+
+        await asyncio.wait_for(pool.join(), 10)
+        pool.submit(FakeMessage(3, channel), eth)
+        await asyncio.wait_for(pool.join(), 10)
+        await pool.stop()
+
+        self.assertEqual(len(replies.sent), 3)
+        self.assertIn('Signal for BTCUSDT failed: signal-shard-0 exited with code 3', replies.sent[0][1])
+        self.assertIn('Signal for ETHUSDT failed', replies.sent[1][1])
+        self.assertEqual(replies.sent[2], (7, 'ETHUSDT on 0'))
+        statuses = dict(journal._db.execute('SELECT message_id, status FROM signals'))
+        self.assertEqual(statuses, {1: 'failed', 2: 'failed'})
+        metrics = pool.metrics()
+        self.assertEqual((metrics['restarts'], metrics['failed'], metrics['completed']), (1, 2, 1))
+        self.assertEqual(metrics['in_flight'], 0)
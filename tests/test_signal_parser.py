@@ -0,0 +1,81 @@
+import unittest
+
+from benchmarks.bench_parsing import legacy_parse_spot, load_corpus
+from core_parsing.future_parsing import parse_future_message
+from core_parsing.signal_parser import parse_future_signal, parse_spot_signal
+from core_parsing.spot_parsing import parse_spot_message
+from variables.constants import Market, SignalCommand
+
+FUTURE_MESSAGE = """$btc LONG
+Entry 1 = $64250.5
+Entry 2 = $63800
+Stoploss: 4H Close Below $62900
+Target: $67500"""
+
+SPOT_MESSAGE = """$OAX
+Entry 1 = $0.2573
+Entry 2 = $0.1946
+Stoploss: Daily Close Below $0.1585
+Final Target: $0.9153"""
+
+
+class TestParseFutureSignal(unittest.TestCase):
+
+    def test_trade_signal(self):
+        signal = parse_future_signal(FUTURE_MESSAGE)
+        self.assertEqual(signal.market, Market.FUTURES)
+        self.assertEqual(signal.command, SignalCommand.TRADE_SIGNAL)
+        self.assertEqual(signal.symbol, 'BTCUSDT')
+        self.assertEqual(signal.side, 'BUY')
+        self.assertEqual(signal.entries, [64250.5, 63800.0])
+        self.assertEqual(signal.entry_price, 64250.5)
+        self.assertEqual(signal.stop_loss, 62900.0)
+        self.assertEqual(signal.target, 67500.0)
+
+    def test_close_order_keeps_symbol(self):
+        signal = parse_future_signal('$ETH Close Order')
+        self.assertEqual(signal.command, SignalCommand.CLOSE_ORDER)
+        self.assertEqual(signal.symbol, 'ETHUSDT')
+
+    def test_change_stoploss(self):
+        signal = parse_future_signal('$ETH Change Stoploss = $3410')
+        self.assertEqual(signal.command, SignalCommand.CHANGE_STOPLOSS)
+        self.assertEqual(signal.symbol, 'ETHUSDT')
+        self.assertEqual(signal.stop_loss, 3410.0)
+
+    def test_incomplete_signal(self):
+        self.assertIsNone(parse_future_signal('$BTC LONG\nEntry 1 = $64250.5'))
+        self.assertIsNone(parse_future_signal(''))
+
+    def test_legacy_wrapper(self):
+        self.assertEqual(parse_future_message(FUTURE_MESSAGE),
+                         ('TRADE_SIGNAL', 'BTCUSDT', 'BUY', 64250.5, 62900.0, 67500.0))
+        with self.assertRaises(ValueError):
+            parse_future_message('$BTC')
+
+
+class TestParseSpotSignal(unittest.TestCase):
+
+    def test_spot_signal(self):
+        signal = parse_spot_signal(SPOT_MESSAGE)
+        self.assertEqual(signal.market, Market.SPOT)
+        self.assertEqual(signal.symbol, 'OAXUSDT')
+        self.assertEqual(signal.entries, [0.2573, 0.1946])
+        self.assertEqual(signal.stop_loss, 0.1585)
+        self.assertEqual(signal.target, 0.9153)
+
+    def test_chatter(self):
+        self.assertIsNone(parse_spot_signal('gm everyone'))
+
+    def test_matches_legacy_parser_on_corpus(self):
+        for record in load_corpus():
+            with self.subTest(message_id=record['message_id']):
+                expected = legacy_parse_spot(record['content'])
+                if expected['symbol'] is None:
+                    self.assertIsNone(parse_spot_signal(record['content']))
+                else:
+                    self.assertEqual(parse_spot_message(record['content']), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
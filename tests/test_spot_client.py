@@ -0,0 +1,171 @@
+import threading
+import unittest
+from decimal import Decimal
+from unittest.mock import ANY, MagicMock
+
+from binance.exceptions import BinanceAPIException
+
+from core_exchange.symbol_registry import SymbolRegistry
+from core_spot.spot import SpotClient
+
+OAX_INFO = {
+    'symbol': 'OAXUSDT',
+    'filters': [
+        {'filterType': 'PRICE_FILTER', 'minPrice': '0.00010000', 'maxPrice': '1000.00000000',
+         'tickSize': '0.00010000'},
+        {'filterType': 'LOT_SIZE', 'minQty': '0.10000000', 'maxQty': '92141578.00000000', 'stepSize': '0.10000000'},
+        {'filterType': 'NOTIONAL', 'minNotional': '5.00000000', 'maxNotional': '9000000.00000000'},
+    ],
+}
+
+
+def make_client() -> tuple[SpotClient, MagicMock]:
+    mock_client = MagicMock()
+    mock_client.get_exchange_info.return_value = {'symbols': [OAX_INFO]}
+    mock_client.get_asset_balance.return_value = {'free': '1000'}
+    spot_client = SpotClient(mock_client, SymbolRegistry(mock_client.get_exchange_info))
+    return spot_client, mock_client
+
+
+def api_error(code: int, message: str) -> BinanceAPIException:
+    response = MagicMock(text=f'{{"code": {code}, "msg": "{message}"}}')
+    return BinanceAPIException(response, 400, response.text)
+
+
+class TestCancelOpenOrders(unittest.TestCase):
+
+    def test_uses_cancel_all_endpoint(self):
+        spot_client, mock_client = make_client()
+        mock_client._delete.return_value = [
+            {'orderId': 1},
+            {'orderListId': 7, 'orderReports': [{'orderId': 2}, {'orderId': 3}]},
+        ]
+
+        result = spot_client.cancel_open_orders('OAXUSDT')
+
+        mock_client._delete.assert_called_once_with('openOrders', True, data={'symbol': 'OAXUSDT'})
+        mock_client.cancel_order.assert_not_called()
+        self.assertEqual(result.cancelled, [1, 2, 3])
+        self.assertEqual(result.requests, 1)
+
+    def test_nothing_open(self):
+        spot_client, mock_client = make_client()
+        mock_client._delete.side_effect = api_error(-2011, 'Unknown order sent.')
+
+        result = spot_client.cancel_open_orders('OAXUSDT')
+
+        self.assertTrue(result.ok)
+        self.assertEqual(result.cancelled, [])
+        mock_client.get_open_orders.assert_not_called()
+
+    def test_falls_back_to_concurrent_cancels(self):
+        spot_client, mock_client = make_client()
+        mock_client._delete.side_effect = api_error(-1003, 'Too many requests.')
+        mock_client.get_open_orders.return_value = [{'orderId': 1}, {'orderId': 2}]
+        mock_client.cancel_order.side_effect = lambda symbol, orderId: {'orderId': orderId}
+
+        result = spot_client.cancel_open_orders('OAXUSDT')
+
+        self.assertEqual(sorted(result.cancelled), [1, 2])
+        self.assertEqual(result.requests, 4)
+
+
+class TestSizeLadder(unittest.TestCase):
+
+    def test_one_balance_and_filter_fetch_for_the_whole_ladder(self):
+        spot_client, mock_client = make_client()
+
+        plan = spot_client.size_ladder('OAXUSDT', [0.21537, 0.2049, 0.19], 0.31)
+
+        mock_client.get_asset_balance.assert_called_once()
+        mock_client.get_exchange_info.assert_called_once()
+        self.assertEqual([leg.price for leg in plan.entries], [Decimal('0.2154'), Decimal('0.2049'), Decimal('0.1900')])
+        # 5% of 1000 USDT, floored to the 0.1 step.
+        self.assertEqual([leg.quantity for leg in plan.entries], [Decimal('232.1'), Decimal('244.0'), Decimal('263.1')])
+        # The take profit sells everything the ladder buys.
+        self.assertEqual(plan.take_profit.quantity, Decimal('739.2'))
+        self.assertEqual(plan.take_profit.price, Decimal('0.3100'))
+
+    def test_small_balance_is_raised_to_min_notional(self):
+        spot_client, mock_client = make_client()
+        mock_client.get_asset_balance.return_value = {'free': '10'}
+
+        plan = spot_client.size_ladder('OAXUSDT', [0.2049])
+
+        self.assertEqual(plan.entries[0].quantity, Decimal('24.5'))
+        self.assertGreaterEqual(plan.entries[0].notional, Decimal('5'))
+        self.assertIsNone(plan.take_profit)
+
+    def test_calculate_quantity_is_exact(self):
+        spot_client, _ = make_client()
+
+        self.assertEqual(spot_client.calculate_quantity('OAXUSDT', 0.3), 166.6)
+
+    def test_unknown_symbol(self):
+        spot_client, _ = make_client()
+
+        self.assertIsNone(spot_client.size_ladder('NOPEUSDT', [1.0]))
+
+
+class TestPlaceSpotOrder(unittest.TestCase):
+
+    def test_price_and_quantity_are_aligned_exactly(self):
+        spot_client, mock_client = make_client()
+
+        spot_client.place_spot_order('OAXUSDT', 0.21544, 100.05)
+
+        mock_client.order_limit_buy.assert_called_once_with(symbol='OAXUSDT', quantity='100', price='0.2154',
+                                                         newClientOrderId=ANY)
+
+    def test_order_below_min_notional_is_not_sent(self):
+        spot_client, mock_client = make_client()
+
+        self.assertIsNone(spot_client.place_spot_order('OAXUSDT', 0.2154, 10))
+        mock_client.order_limit_buy.assert_not_called()
+
+
+class TestPlaceLadder(unittest.TestCase):
+
+    def test_legs_are_submitted_concurrently_with_exact_strings(self):
+        spot_client, mock_client = make_client()
+        barrier = threading.Barrier(3, timeout=2)
+
+        def create_order(**params):
+            barrier.wait()
+            return {'orderId': params['price']}
+
+        mock_client.create_order.side_effect = create_order
+        plan = spot_client.size_ladder('OAXUSDT', [0.2154, 0.2049], 0.31)
+
+        result = spot_client.place_ladder(plan)
+
+        self.assertEqual(list(result.legs), ['entry_1', 'entry_2', 'take_profit'])
+        self.assertEqual(len(result.placed), 3)
+        self.assertEqual(result.legs['entry_1'].params['quantity'], '232.1')
+        self.assertEqual(result.legs['entry_1'].params['price'], '0.2154')
+        self.assertEqual(result.legs['take_profit'].params['side'], 'SELL')
+
+    def test_invalid_legs_are_not_sent(self):
+        spot_client, mock_client = make_client()
+        mock_client.create_order.return_value = {'orderId': 1}
+        plan = spot_client.size_ladder('OAXUSDT', [0.2154, 5000])
+
+        result = spot_client.place_ladder(plan)
+
+        self.assertEqual(mock_client.create_order.call_count, 1)
+        self.assertIn('price', result.legs['entry_2'].error)
+        self.assertEqual([leg.name for leg in result.failed], ['entry_2'])
+
+    def test_exchange_rejection_is_reported_per_leg(self):
+        spot_client, mock_client = make_client()
+        mock_client.create_order.side_effect = [{'orderId': 1}, api_error(-2010, 'Insufficient balance.')]
+        plan = spot_client.size_ladder('OAXUSDT', [0.2154], 0.31)
+
+        result = spot_client.place_ladder(plan)
+
+        self.assertEqual(len(result.placed), 1)
+        self.assertEqual(len(result.failed), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
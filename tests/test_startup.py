@@ -0,0 +1,62 @@
+import asyncio
+import subprocess
+import sys
+import unittest
+
+from core_metrics.startup import StartupReport, process_uptime
+from tests.helpers import FakeClock
+
+
+class TestStartupReport(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.clock = FakeClock(10.0)
+        self.report = StartupReport(self.clock)
+        self.report.started_at = 9.0
+
+    async def test_parallel_phases_are_timed_separately(self):
+        async def download(seconds: float) -> str:
+            await asyncio.sleep(0)
+            self.clock.now += seconds
+            return 'done'
+
+        self.report.mark('imports')
+        results = await asyncio.gather(self.report.measure('futures_exchange_info', download(0.2)),
+                                       self.report.measure('connections', download(0.1)))
+
+        self.assertEqual(results, ['done', 'done'])
+        phases = {phase.name: phase for phase in self.report.phases}
+        self.assertAlmostEqual(phases['imports'].duration_ms, 1000)
+        self.assertAlmostEqual(phases['futures_exchange_info'].started_ms, 1000)
+        self.assertAlmostEqual(phases['connections'].started_ms, 1000)
+
+    def test_finish_reports_once(self):
+        with self.report.phase('journal_recovery'):
+            self.clock.now += 0.05
+        self.report.finish()
+        self.clock.now += 1
+        self.report.finish()
+
+        self.assertAlmostEqual(self.report.ready_ms, 1050)
+        self.assertIn('Ready for signals 1050 ms', self.report.format())
+        self.assertAlmostEqual(self.report.as_dict()['journal_recovery'], 50)
+
+    def test_process_uptime(self):
+        uptime = process_uptime()
+        if uptime is None:
+            self.skipTest('/proc is not available')
+        self.assertGreaterEqual(uptime, 0)
+
+
+class TestDeferredImports(unittest.TestCase):
+
+    def test_bot_module_does_not_import_python_binance(self):
+        # A fresh interpreter: this test process may already have loaded python-binance.
+        probe = "import sys, demo.discord_bot; print('binance.client' in sys.modules)"
+        output = subprocess.run([sys.executable, '-c', probe], capture_output=True, text=True, check=True).stdout
+
+        self.assertEqual(output.strip(), 'False')
+
+
+if __name__ == '__main__':
+    unittest.main()
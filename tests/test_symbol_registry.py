@@ -0,0 +1,83 @@
+import unittest
+from decimal import Decimal
+from unittest.mock import MagicMock
+
+from core_exchange.symbol_registry import SymbolFilters, SymbolRegistry
+
+FUTURES_SYMBOL = {
+    'symbol': 'BTCUSDT',
+    'filters': [
+        {'filterType': 'PRICE_FILTER', 'minPrice': '556.80', 'maxPrice': '4529764', 'tickSize': '0.10'},
+        {'filterType': 'LOT_SIZE', 'minQty': '0.001', 'maxQty': '1000', 'stepSize': '0.001'},
+        {'filterType': 'MARKET_LOT_SIZE', 'minQty': '0.001', 'maxQty': '120', 'stepSize': '0.001'},
+        {'filterType': 'MIN_NOTIONAL', 'notional': '100'},
+    ],
+}
+
+SPOT_SYMBOL = {
+    'symbol': 'OAXUSDT',
+    'filters': [
+        {'filterType': 'PRICE_FILTER', 'minPrice': '0.00010000', 'maxPrice': '1000.00000000',
+         'tickSize': '0.00010000'},
+        {'filterType': 'LOT_SIZE', 'minQty': '0.10000000', 'maxQty': '92141578.00000000', 'stepSize': '0.10000000'},
+        {'filterType': 'NOTIONAL', 'minNotional': '5.00000000', 'maxNotional': '9000000.00000000'},
+    ],
+}
+
+
+class TestSymbolFilters(unittest.TestCase):
+
+    def test_futures_filters(self):
+        filters = SymbolFilters.from_symbol_info(FUTURES_SYMBOL)
+        self.assertEqual(filters.tick_size, Decimal('0.10'))
+        self.assertEqual(filters.step_size, Decimal('0.001'))
+        self.assertEqual(filters.market_max_qty, Decimal('120'))
+        self.assertEqual(filters.min_notional, Decimal('100'))
+        self.assertIsNone(filters.max_notional)
+        self.assertEqual(filters.price_precision, 1)
+        self.assertEqual(filters.quantity_precision, 3)
+
+    def test_spot_filters(self):
+        filters = SymbolFilters.from_symbol_info(SPOT_SYMBOL)
+        self.assertEqual(filters.min_notional, Decimal('5'))
+        self.assertEqual(filters.max_notional, Decimal('9000000'))
+        self.assertEqual(filters.market_step_size, Decimal('0.1'))
+        self.assertEqual(filters.price_precision, 4)
+        self.assertEqual(filters.quantity_precision, 1)
+
+
+class TestSymbolRegistry(unittest.TestCase):
+
+    def setUp(self):
+        self.loader = MagicMock(return_value={'symbols': [FUTURES_SYMBOL, SPOT_SYMBOL]})
+
+    def test_loads_once(self):
+        registry = SymbolRegistry(self.loader)
+        self.assertEqual(registry.get('BTCUSDT').symbol, 'BTCUSDT')
+        self.assertEqual(registry.get('OAXUSDT').symbol, 'OAXUSDT')
+        self.assertEqual(registry.get_symbol_info('BTCUSDT'), FUTURES_SYMBOL)
+        self.loader.assert_called_once()
+
+    def test_unknown_symbol_does_not_reload_fresh_index(self):
+        registry = SymbolRegistry(self.loader)
+        registry.refresh()
+        self.assertIsNone(registry.get('NOPEUSDT'))
+        self.loader.assert_called_once()
+
+    def test_stale_index_refreshes(self):
+        registry = SymbolRegistry(self.loader, ttl=0)
+        registry.refresh()
+        registry.get('BTCUSDT')
+        registry._refresh_thread.join(timeout=1)
+        self.assertEqual(self.loader.call_count, 2)
+
+    def test_failed_refresh_keeps_index(self):
+        registry = SymbolRegistry(self.loader)
+        registry.refresh()
+        self.loader.side_effect = Exception('timeout')
+        self.assertFalse(registry.refresh())
+        self.assertIn('BTCUSDT', registry)
+
+
+if __name__ == '__main__':
+    unittest.main()
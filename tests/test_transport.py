@@ -0,0 +1,43 @@
+import unittest
+from unittest.mock import patch
+
+from core_exchange import transport
+from core_exchange.transport import KeepAliveAdapter, PooledClient, build_session, get_shared_client
+from variables.constants import TransportConstants
+
+
+class TestTransport(unittest.TestCase):
+
+    def test_session_pool(self):
+        session = build_session(32, {'X-MBX-APIKEY': 'key'})
+        adapter = session.get_adapter('https://fapi.binance.com')
+        self.assertIsInstance(adapter, KeepAliveAdapter)
+        self.assertEqual(adapter._pool_maxsize, 32)
+        self.assertEqual(session.headers['X-MBX-APIKEY'], 'key')
+        self.assertEqual(session.headers['Connection'], 'keep-alive')
+
+    @patch.object(PooledClient, 'ping')
+    def test_shared_client_is_built_once(self, _):
+        with patch.object(transport, '_shared_client', None):
+            client = get_shared_client()
+            self.assertIs(get_shared_client(), client)
+            self.assertIsInstance(client.session.get_adapter('https://api.binance.com'), KeepAliveAdapter)
+
+    @patch.object(PooledClient, 'ping')
+    def test_construction_without_ping(self, ping):
+        client = PooledClient('key', 'secret', ping=False)
+
+        ping.assert_not_called()
+        self.assertEqual(client.session.headers['X-MBX-APIKEY'], 'key')
+        self.assertEqual(client.FUTURES_URL, 'https://fapi.binance.com/fapi')
+
+    def test_requests_have_connect_and_read_timeouts(self):
+        client = PooledClient('key', 'secret', ping=False)
+
+        connect, read = client._get_request_kwargs('get', False)['timeout']
+        self.assertEqual((connect, read), (TransportConstants.CONNECT_TIMEOUT_SECONDS.value,
+                                           TransportConstants.READ_TIMEOUT_SECONDS.value))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import unittest
+from decimal import Decimal
+
+from core_exchange.symbol_registry import SymbolFilters
+from core_exchange.validation import check_margin, check_order, check_price
+
+BTC_FILTERS = SymbolFilters.from_symbol_info({
+    'symbol': 'BTCUSDT',
+    'filters': [
+        {'filterType': 'PRICE_FILTER', 'minPrice': '556.80', 'maxPrice': '4529764', 'tickSize': '0.10'},
+        {'filterType': 'LOT_SIZE', 'minQty': '0.001', 'maxQty': '1000', 'stepSize': '0.001'},
+        {'filterType': 'MARKET_LOT_SIZE', 'minQty': '0.001', 'maxQty': '120', 'stepSize': '0.001'},
+        {'filterType': 'MIN_NOTIONAL', 'notional': '100'},
+        {'filterType': 'PERCENT_PRICE', 'multiplierUp': '1.0500', 'multiplierDown': '0.9500',
+         'multiplierDecimal': '4'},
+    ],
+})
+
+SPOT_FILTERS = SymbolFilters.from_symbol_info({
+    'symbol': 'OAXUSDT',
+    'filters': [
+        {'filterType': 'PRICE_FILTER', 'minPrice': '0.00010000', 'maxPrice': '1000.00000000',
+         'tickSize': '0.00010000'},
+        {'filterType': 'LOT_SIZE', 'minQty': '0.10000000', 'maxQty': '92141578.00000000', 'stepSize': '0.10000000'},
+        {'filterType': 'NOTIONAL', 'minNotional': '5.00000000', 'maxNotional': '9000000.00000000'},
+        {'filterType': 'PERCENT_PRICE_BY_SIDE', 'bidMultiplierUp': '5', 'bidMultiplierDown': '0.2',
+         'askMultiplierUp': '5', 'askMultiplierDown': '0.8', 'avgPriceMins': 5},
+    ],
+})
+
+
+class TestCheckOrder(unittest.TestCase):
+
+    def test_valid_limit_order(self):
+        self.assertIsNone(check_order(BTC_FILTERS, 'SELL', Decimal('0.01'), Decimal('51000.0'),
+                                      reference_price=Decimal('50000')))
+
+    def test_tick_grid_is_exact(self):
+        # 0.3 / 0.1 is not whole in binary floating point, but it is on the tick grid.
+        self.assertIsNone(check_price(SPOT_FILTERS, Decimal('0.3')))
+        self.assertEqual(check_price(BTC_FILTERS, Decimal('50000.05')).filter, 'PRICE_FILTER')
+
+    def test_market_orders_use_market_lot_size(self):
+        self.assertIsNone(check_order(BTC_FILTERS, 'BUY', Decimal('500'), Decimal('50000')))
+        violation = check_order(BTC_FILTERS, 'BUY', Decimal('500'), reference_price=Decimal('50000'), market=True)
+        self.assertEqual(violation.filter, 'MARKET_LOT_SIZE')
+
+    def test_market_order_notional_uses_reference_price(self):
+        violation = check_order(BTC_FILTERS, 'BUY', Decimal('0.001'), reference_price=Decimal('50000'), market=True)
+        self.assertEqual(violation.filter, 'MIN_NOTIONAL')
+        self.assertIsNone(check_order(BTC_FILTERS, 'BUY', Decimal('0.001'), market=True))
+
+    def test_reduce_only_orders_skip_the_notional_check(self):
+        violation = check_order(BTC_FILTERS, 'SELL', Decimal('0.002'), stop_price=Decimal('48000'))
+        self.assertEqual(violation.filter, 'MIN_NOTIONAL')
+        self.assertIsNone(check_order(BTC_FILTERS, 'SELL', Decimal('0.002'), stop_price=Decimal('48000'),
+                                      reduce_only=True))
+        self.assertEqual(check_order(BTC_FILTERS, 'SELL', Decimal('0.0025'), stop_price=Decimal('48000'),
+                                     reduce_only=True).filter, 'LOT_SIZE')
+
+    def test_percent_price_by_side(self):
+        self.assertEqual(check_order(BTC_FILTERS, 'SELL', Decimal('0.01'), Decimal('53000'),
+                                     reference_price=Decimal('50000')).filter, 'PERCENT_PRICE')
+        self.assertIsNone(check_order(SPOT_FILTERS, 'BUY', Decimal('100'), Decimal('0.1'),
+                                      reference_price=Decimal('0.2')))
+        self.assertEqual(check_order(SPOT_FILTERS, 'SELL', Decimal('100'), Decimal('0.1'),
+                                     reference_price=Decimal('0.2')).filter, 'PERCENT_PRICE')
+
+    def test_margin_is_leverage_adjusted(self):
+        self.assertIsNone(check_margin(Decimal('0.01'), Decimal('50000'), 5, Decimal('100')))
+        self.assertEqual(check_margin(Decimal('0.01'), Decimal('50000'), 4, Decimal('100')).filter, 'MARGIN')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -5,6 +5,15 @@ class EnvVariables(Enum):
     DISCORD_BOT_TOKEN = 'DISCORD_BOT_TOKEN'
     BINANCE_API_KEY = 'BINANCE_API_KEY'
     BINANCE_API_SECRET = 'BINANCE_API_SECRET'
+    EXCHANGE_MAX_WORKERS = 'EXCHANGE_MAX_WORKERS'
+    BINANCE_HTTP_POOL_SIZE = 'BINANCE_HTTP_POOL_SIZE'
+    SIGNAL_JOURNAL_PATH = 'SIGNAL_JOURNAL_PATH'
+    BINANCE_ACCOUNTS = 'BINANCE_ACCOUNTS'
+    SIGNAL_ROUTES = 'SIGNAL_ROUTES'
+    SIGNAL_EXECUTOR_PROCESSES = 'SIGNAL_EXECUTOR_PROCESSES'
+    LOG_LEVEL = 'LOG_LEVEL'
+    LOG_LEVELS = 'LOG_LEVELS'
+    LOG_FORMAT = 'LOG_FORMAT'
 
 
 class OrderType(Enum):
@@ -12,6 +21,130 @@ class OrderType(Enum):
     LIMIT = 'LIMIT'
 
 
+class OrderSide(Enum):
+    BUY = 'BUY'
+    SELL = 'SELL'
+
+
 class TradingConstants(Enum):
     LEVERAGE = 5
     RISK_PERCENTAGE = 0.05
+
+
+class SymbolRegistryConstants(Enum):
+    TTL_SECONDS = 3600
+    MISSING_SYMBOL_REFRESH_SECONDS = 60
+
+
+class ExecutorConstants(Enum):
+    MAX_WORKERS = 8
+    THREAD_NAME_PREFIX = 'exchange'
+
+
+class BracketOrderConstants(Enum):
+    MAX_CONCURRENT_LEGS = 4
+
+
+class StopConstants(Enum):
+    BATCH_SIZE = 5
+    BATCH_WINDOW_SECONDS = 0
+
+
+class LadderConstants(Enum):
+    MAX_CONCURRENT_LEGS = 5
+
+
+class CancelConstants(Enum):
+    FUTURES_BATCH_SIZE = 10
+    MAX_CONCURRENT_CANCELS = 5
+
+
+class SignalCommand(Enum):
+    TRADE_SIGNAL = 'TRADE_SIGNAL'
+    CLOSE_ORDER = 'CLOSE_ORDER'
+    CHANGE_STOPLOSS = 'CHANGE_STOPLOSS'
+
+
+class Market(Enum):
+    FUTURES = 'FUTURES'
+    SPOT = 'SPOT'
+
+
+class StreamConstants(Enum):
+    FUTURES_WS_URL = 'wss://fstream.binance.com/ws'
+    FUTURES_COMBINED_WS_URL = 'wss://fstream.binance.com/stream'
+    LISTEN_KEY_KEEPALIVE_SECONDS = 1800
+    RECONNECT_DELAY_SECONDS = 5
+
+
+class TransportConstants(Enum):
+    POOL_SIZE = 20
+    HOST_POOLS = 4
+    WARM_CONNECTIONS = 4
+    KEEP_WARM_SECONDS = 60
+    CONNECT_TIMEOUT_SECONDS = 3.05
+    READ_TIMEOUT_SECONDS = 10
+
+
+class RateLimitConstants(Enum):
+    FUTURES_WEIGHT_PER_MINUTE = 2400
+    SPOT_WEIGHT_PER_MINUTE = 6000
+    FUTURES_ORDERS_PER_MINUTE = 1200
+    SPOT_ORDERS_PER_10S = 100
+    INFO_HEADROOM = 0.8
+    DEFAULT_RETRY_AFTER_SECONDS = 60
+
+
+class ResilienceConstants(Enum):
+    RETRY_ATTEMPTS = 3
+    RETRY_BASE_DELAY_SECONDS = 0.05
+    RETRY_MAX_DELAY_SECONDS = 1.0
+    BREAKER_THRESHOLD = 5
+    BREAKER_RESET_SECONDS = 30
+    HEDGE_DELAY_SECONDS = 0.25
+    HEDGE_MAX_WORKERS = 8
+    HEDGE_TIMEOUT_SECONDS = 15
+
+
+class DispatcherConstants(Enum):
+    WORKERS = 4
+    DRAIN_TIMEOUT_SECONDS = 30
+
+
+class ShardConstants(Enum):
+    VIRTUAL_NODES = 64
+    STOP_TIMEOUT_SECONDS = 30
+    LIVENESS_CHECK_SECONDS = 1
+    # The worker that runs the accounts' user-data streams; the gateway relays its account state to the others.
+    USER_DATA_SHARD = 0
+
+
+class ReplyConstants(Enum):
+    MAX_MESSAGE_LENGTH = 2000
+
+
+class JournalConstants(Enum):
+    DEFAULT_PATH = 'signal_journal.db'
+    DEDUP_WINDOW_SECONDS = 7 * 24 * 3600
+
+
+class PriceCacheConstants(Enum):
+    CAPACITY = 128
+    MAX_RECENT_SYMBOLS = 32
+    # Pinned plus recent symbols must fit in the cache: 96 symbols are 192 streams, well within one connection.
+    MAX_PINNED_SYMBOLS = 64
+    MAX_AGE_SECONDS = 5
+    UNPIN_SWEEP_SECONDS = 60
+
+
+class AccountConstants(Enum):
+    DEFAULT_NAME = 'default'
+
+
+class RouterConstants(Enum):
+    DEFAULT_PARSERS = ('futures', 'spot')
+
+
+class LoggingConstants(Enum):
+    LEVEL = 'INFO'
+    FORMAT = 'json'
@@ -0,0 +1,13 @@
+from dotenv import load_dotenv
+
+_environment_loaded = False
+
+
+def load_environment() -> None:
+    """
+    Load the .env file once per process.
+    """
+    global _environment_loaded
+    if not _environment_loaded:
+        load_dotenv()
+        _environment_loaded = True